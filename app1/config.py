@@ -3,12 +3,65 @@ Application configuration module
 
 This module contains constants used throughout the application.
 """
+import math
+import sys
+
+
+def _max_serializable_n(max_digits: int) -> int:
+    """
+    Largest index n whose sequence F(0)..F(n - 1) can be converted to str.
+
+    Python refuses int/str conversions of more than max_digits decimal
+    digits (sys.get_int_max_str_digits(), 4300 by default, 0 for no limit),
+    so JSON serialization of larger terms fails. F(k) has
+    floor(k * log10(phi) - log10(sqrt(5))) + 1 digits; one index of margin
+    absorbs floating-point error.
+    """
+    if max_digits <= 0:
+        return sys.maxsize
+    phi = (1 + math.sqrt(5)) / 2
+    return int((max_digits + math.log10(math.sqrt(5))) / math.log10(phi))
+
+
+# Largest 'n' any endpoint may serve under the interpreter's int/str
+# conversion limit (about 20.5k with the default of 4300 digits). Workers
+# inherit the limit through PYTHONINTMAXSTRDIGITS, so it is read once here.
+MAX_SERIALIZABLE_N: int = _max_serializable_n(sys.get_int_max_str_digits())
 
 # Maximum allowed value for 'n' parameter to prevent excessive computation
-MAX_N: int = 10000
+MAX_N: int = min(10000, MAX_SERIALIZABLE_N)
 
 # Default error message when 'n' exceeds MAX_N
 DEFAULT_MAX_N_MESSAGE: str = (
     f"Requested value exceeds maximum allowed limit of {MAX_N}. "
     "Please provide a smaller value."
-)
\ No newline at end of file
+)
+
+# Number of serialized Fibonacci responses kept in the LRU cache
+RESPONSE_CACHE_SIZE: int = 256
+
+# Maximum 'n' for the streaming and paginated endpoints
+MAX_STREAM_N: int = min(20000, MAX_SERIALIZABLE_N)
+
+# Number of terms serialized per chunk of a streamed response
+STREAM_CHUNK_TERMS: int = 256
+
+# Maximum page size for the paginated endpoint
+MAX_PAGE_COUNT: int = 1000
+
+# Error message when a streaming or paginated request exceeds MAX_STREAM_N
+DEFAULT_MAX_STREAM_N_MESSAGE: str = (
+    f"Requested range exceeds maximum allowed index of {MAX_STREAM_N}. "
+    "Please provide a smaller value."
+)
+
+# Requests with n at or above this value are computed in a worker process
+OFFLOAD_THRESHOLD: int = 2000
+
+# Maximum number of offloaded computations in flight before returning 503
+MAX_PENDING_COMPUTATIONS: int = 32
+
+# Error message when the compute queue is full
+DEFAULT_OVERLOADED_MESSAGE: str = (
+    "Server is busy computing other requests. Please retry shortly."
+)
@@ -1,3 +1,7 @@
+from typing import Iterator
+from fib_engine import fibonacci_sequence, iter_fibonacci
+
+
 def calculate_fibonacci_sequence(n: int) -> list[int]:
     """
     Generate the Fibonacci sequence with the specified number of terms.
@@ -25,12 +29,53 @@ def calculate_fibonacci_sequence(n: int) -> list[int]:
         raise ValueError("n must be a non-negative integer")
     if n == 0:
         return [0]
-    
-    fib_sequence = [0]
-    a, b = 0, 1
-    
-    for i in range(1, n):
-        fib_sequence.append(b)
-        a, b = b, a + b
-    
-    return fib_sequence
\ No newline at end of file
+
+    return fibonacci_sequence(n)
+
+
+def iter_fibonacci_sequence(n: int) -> Iterator[int]:
+    """
+    Lazily yield the same terms as calculate_fibonacci_sequence(n).
+
+    Parameters:
+        n (int): The number of terms to generate. Must be a non-negative integer.
+
+    Returns:
+        Iterator[int]: Consecutive terms of the Fibonacci sequence.
+
+    Raises:
+        ValueError: If n is negative.
+    """
+    if n < 0:
+        raise ValueError("n must be a non-negative integer")
+    if n == 0:
+        return iter([0])
+
+    return iter_fibonacci(0, n)
+
+
+def calculate_fibonacci_page(start: int, count: int) -> list[int]:
+    """
+    Return count terms of the Fibonacci sequence beginning at index start.
+
+    Pages are computed from the seeded pair (F(start), F(start + 1)) rather
+    than by walking the sequence from zero.
+
+    Parameters:
+        start (int): Index of the first term. Must be a non-negative integer.
+        count (int): Number of terms in the page. Must be a non-negative integer.
+
+    Returns:
+        list[int]: The terms F(start) through F(start + count - 1).
+
+    Raises:
+        ValueError: If start or count is negative.
+
+    Examples:
+        >>> calculate_fibonacci_page(5, 3)
+        [5, 8, 13]
+    """
+    if start < 0 or count < 0:
+        raise ValueError("start and count must be non-negative integers")
+
+    return fibonacci_sequence(count, start=start)
\ No newline at end of file
@@ -1,24 +1,86 @@
-from fastapi import FastAPI, HTTPException, status
+import json
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Iterator
+from fastapi import FastAPI, HTTPException, Query, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from .fibonacci import calculate_fibonacci_sequence
-from .schemas import FibonacciResponse
-from .config import MAX_N, DEFAULT_MAX_N_MESSAGE
+from fastapi.responses import StreamingResponse
+from fib_engine import ResponseCache
+from fib_executor import ComputeExecutor, ExecutorOverloadedError
+from .fibonacci import (
+    calculate_fibonacci_page,
+    calculate_fibonacci_sequence,
+    iter_fibonacci_sequence,
+)
+from .schemas import FibonacciPage, FibonacciResponse
+from .config import (
+    MAX_N,
+    DEFAULT_MAX_N_MESSAGE,
+    RESPONSE_CACHE_SIZE,
+    MAX_STREAM_N,
+    STREAM_CHUNK_TERMS,
+    MAX_PAGE_COUNT,
+    DEFAULT_MAX_STREAM_N_MESSAGE,
+    OFFLOAD_THRESHOLD,
+    MAX_PENDING_COMPUTATIONS,
+    DEFAULT_OVERLOADED_MESSAGE,
+)
 from .errors import http_error_handler
 
+
+def _render_sequence(n: int) -> bytes:
+    """Serialize the Fibonacci response body for n elements."""
+    sequence = calculate_fibonacci_sequence(n)
+    return json.dumps({"sequence": sequence}, separators=(",", ":")).encode()
+
+
+def _stream_sequence(n: int) -> Iterator[bytes]:
+    """
+    Serialize the Fibonacci response body for n elements incrementally.
+
+    Produces the same JSON document as _render_sequence, emitted in chunks of
+    STREAM_CHUNK_TERMS terms so only one chunk is held in memory at a time.
+    """
+    yield b'{"sequence":['
+    separator = ""
+    chunk = []
+    for term in iter_fibonacci_sequence(n):
+        chunk.append(str(term))
+        if len(chunk) == STREAM_CHUNK_TERMS:
+            yield (separator + ",".join(chunk)).encode()
+            separator = ","
+            chunk = []
+    if chunk:
+        yield (separator + ",".join(chunk)).encode()
+    yield b"]}"
+
+
 def create_app() -> FastAPI:
     """
     Initialize and configure the FastAPI application.
     
     This function:
-    1. Creates a FastAPI instance
-    2. Sets up CORS middleware
-    3. Registers custom error handlers
-    4. Defines application routes
+    1. Creates the compute executor, shut down with the app's lifespan
+    2. Creates a FastAPI instance
+    3. Sets up CORS middleware
+    4. Registers custom error handlers
+    5. Creates the serialized response cache
+    6. Defines application routes
     
     Returns:
         FastAPI: Configured application instance
     """
-    app = FastAPI()
+    # Large computations run in worker processes, off the event loop
+    executor = ComputeExecutor(
+        threshold=OFFLOAD_THRESHOLD,
+        max_pending=MAX_PENDING_COMPUTATIONS
+    )
+    
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        yield
+        executor.shutdown()
+    
+    app = FastAPI(lifespan=lifespan)
     
     # Configure CORS
     app.add_middleware(
@@ -32,8 +94,11 @@ def create_app() -> FastAPI:
     # Register error handlers
     app.add_exception_handler(HTTPException, http_error_handler)
     
+    # Serialized bodies for hot values of n
+    responses = ResponseCache(maxsize=RESPONSE_CACHE_SIZE)
+    
     @app.get("/fibonacci/{n}", response_model=FibonacciResponse)
-    async def get_fibonacci(n: int) -> FibonacciResponse:
+    async def get_fibonacci(n: int) -> Response:
         """
         Calculate Fibonacci sequence up to n elements.
         
@@ -41,10 +106,12 @@ def create_app() -> FastAPI:
             n: Number of Fibonacci sequence elements to calculate (0-indexed)
         
         Returns:
-            FibonacciResponse: Object containing the sequence and parameters
+            Response: JSON body matching FibonacciResponse, served from the
+            response cache when n was requested recently
             
         Raises:
             HTTPException: 400 if n is outside allowed range [0, MAX_N]
+            HTTPException: 503 if too many computations are already queued
         """
         if n < 0 or n > MAX_N:
             raise HTTPException(
@@ -52,7 +119,72 @@ def create_app() -> FastAPI:
                 detail=DEFAULT_MAX_N_MESSAGE.format(max_n=MAX_N)
             )
         
-        sequence = calculate_fibonacci_sequence(n)
-        return FibonacciResponse(sequence=sequence, parameters={"n": n})
+        body = responses.get(n)
+        if body is None:
+            try:
+                body = await executor.run(n, n, _render_sequence, n)
+            except ExecutorOverloadedError:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail=DEFAULT_OVERLOADED_MESSAGE
+                )
+            responses.put(n, body)
+        return Response(content=body, media_type="application/json")
+    
+    @app.get("/fibonacci/{n}/stream", response_model=FibonacciResponse)
+    async def stream_fibonacci(n: int) -> StreamingResponse:
+        """
+        Stream the Fibonacci sequence of n elements as a chunked JSON body.
+        
+        Terms are generated lazily, so memory stays flat regardless of n.
+        
+        Args:
+            n: Number of Fibonacci sequence elements to stream
+        
+        Returns:
+            StreamingResponse: JSON body matching FibonacciResponse
+            
+        Raises:
+            HTTPException: 400 if n is outside allowed range [0, MAX_STREAM_N]
+        """
+        if n < 0 or n > MAX_STREAM_N:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=DEFAULT_MAX_STREAM_N_MESSAGE
+            )
+        
+        return StreamingResponse(_stream_sequence(n), media_type="application/json")
+    
+    @app.get("/fibonacci", response_model=FibonacciPage)
+    async def get_fibonacci_page(
+        start: int = Query(0, ge=0),
+        count: int = Query(100, ge=0, le=MAX_PAGE_COUNT),
+    ) -> FibonacciPage:
+        """
+        Return one page of the Fibonacci sequence.
+        
+        Args:
+            start: Index of the first term in the page
+            count: Number of terms in the page (at most MAX_PAGE_COUNT)
+        
+        Returns:
+            FibonacciPage: The requested terms and the cursor for the next page
+            
+        Raises:
+            HTTPException: 400 if start + count exceeds MAX_STREAM_N
+        """
+        if start + count > MAX_STREAM_N:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=DEFAULT_MAX_STREAM_N_MESSAGE
+            )
+        
+        sequence = calculate_fibonacci_page(start, count)
+        return FibonacciPage(
+            start=start,
+            count=count,
+            sequence=sequence,
+            next_start=start + count
+        )
     
     return app
\ No newline at end of file
@@ -16,4 +16,30 @@ class FibonacciResponse(BaseModel):
             "example": {
                 "sequence": [0, 1, 1, 2, 3, 5, 8]
             }
-        }
\ No newline at end of file
+        }
+
+
+class FibonacciPage(BaseModel):
+    """
+    Response model for the paginated Fibonacci endpoint.
+
+    Attributes:
+        start: Index of the first term in the page.
+        count: Number of terms in the page.
+        sequence: The terms F(start) through F(start + count - 1).
+        next_start: Index to pass as 'start' to fetch the following page.
+    """
+    start: int
+    count: int
+    sequence: List[int]
+    next_start: int
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "start": 5,
+                "count": 3,
+                "sequence": [5, 8, 13],
+                "next_start": 8
+            }
+        }
@@ -52,4 +52,100 @@ def test_fibonacci_endpoint():
     origin = "http://testorigin.com"
     headers = {"Origin": origin}
     response = client.get("/fibonacci/3", headers=headers)
-    assert response.headers["access-control-allow-origin"] == origin
\ No newline at end of file
+    assert response.headers["access-control-allow-origin"] == origin
+
+def test_fibonacci_stream_and_pages():
+    """
+    Test the streaming and paginated Fibonacci endpoints:
+    1. Streamed body matches the buffered endpoint
+    2. Streaming past MAX_STREAM_N returns 400
+    3. Pages are contiguous slices of the sequence
+    4. Pages past MAX_STREAM_N return 400
+    """
+    from app.config import MAX_STREAM_N
+
+    app = create_app()
+    client = TestClient(app)
+
+    # Streamed and buffered bodies agree
+    response = client.get("/fibonacci/1000/stream")
+    assert response.status_code == 200
+    assert response.json() == client.get("/fibonacci/1000").json()
+
+    response = client.get(f"/fibonacci/{MAX_STREAM_N + 1}/stream")
+    assert response.status_code == 400
+
+    # Consecutive pages join into the full sequence
+    first = client.get("/fibonacci", params={"start": 0, "count": 5}).json()
+    assert first["sequence"] == [0, 1, 1, 2, 3]
+    second = client.get(
+        "/fibonacci", params={"start": first["next_start"], "count": 5}
+    ).json()
+    assert second["sequence"] == [5, 8, 13, 21, 34]
+
+    response = client.get(
+        "/fibonacci", params={"start": MAX_STREAM_N, "count": 1}
+    )
+    assert response.status_code == 400
+
+def test_app_lifespan():
+    """
+    Test that the app starts and shuts down through its lifespan:
+    1. create_app() builds the application
+    2. An offloaded computation succeeds inside the lifespan
+    3. Leaving the lifespan shuts the compute executor down
+    """
+    from app.config import OFFLOAD_THRESHOLD
+
+    app = create_app()
+    with TestClient(app) as client:
+        response = client.get(f"/fibonacci/{OFFLOAD_THRESHOLD}")
+        assert response.status_code == 200
+        assert len(response.json()["sequence"]) == OFFLOAD_THRESHOLD
+
+def test_serializable_limits():
+    """
+    Test that endpoint limits stay within the int/str conversion limit:
+    1. The largest allowed page serializes
+    2. The computed bound is tight for the minimum and default digit limits
+    """
+    import sys
+    from fib_engine import fib_pair
+    from app.config import MAX_STREAM_N, _max_serializable_n
+
+    client = TestClient(create_app())
+    response = client.get(
+        "/fibonacci", params={"start": MAX_STREAM_N - 1, "count": 1}
+    )
+    assert response.status_code == 200
+    assert response.json()["sequence"] == [fib_pair(MAX_STREAM_N - 1)[0]]
+
+    previous = sys.get_int_max_str_digits()
+    try:
+        for max_digits in (640, 4300):
+            sys.set_int_max_str_digits(max_digits)
+            n = _max_serializable_n(max_digits)
+            str(fib_pair(n - 1)[0])
+            with pytest.raises(ValueError):
+                str(fib_pair(n + 1)[0])
+    finally:
+        sys.set_int_max_str_digits(previous)
+    assert _max_serializable_n(0) > MAX_STREAM_N
+
+def test_overloaded_executor(monkeypatch):
+    """
+    Test the compute queue bound:
+    1. Offloaded requests return 503 when the queue is full
+    2. Requests below OFFLOAD_THRESHOLD are computed inline and still served
+    """
+    import app.main
+    from app.config import OFFLOAD_THRESHOLD
+
+    monkeypatch.setattr(app.main, "MAX_PENDING_COMPUTATIONS", 0)
+    with TestClient(create_app()) as client:
+        response = client.get(f"/fibonacci/{OFFLOAD_THRESHOLD}")
+        assert response.status_code == 503
+
+        response = client.get(f"/fibonacci/{OFFLOAD_THRESHOLD - 1}")
+        assert response.status_code == 200
+        assert len(response.json()["sequence"]) == OFFLOAD_THRESHOLD - 1
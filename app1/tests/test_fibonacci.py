@@ -23,4 +23,74 @@ def test_calculate_fibonacci_sequence():
     
     # Test negative input: should raise ValueError
     with pytest.raises(ValueError):
-        calculate_fibonacci_sequence(-1)
\ No newline at end of file
+        calculate_fibonacci_sequence(-1)
+
+def test_fib_engine():
+    """
+    Test cases for the shared Fibonacci engine.
+    Verifies fast doubling against the prefix table, slicing past the table
+    limit, and LRU eviction of serialized responses.
+    """
+    from fib_engine import (
+        PREFIX_TABLE_LIMIT,
+        ResponseCache,
+        fib_pair,
+        fibonacci_number,
+        fibonacci_sequence,
+    )
+
+    # Fast doubling matches the iterative definition
+    expected = [0, 1]
+    for _ in range(498):
+        expected.append(expected[-1] + expected[-2])
+    assert [fib_pair(i)[0] for i in range(500)] == expected
+    assert fibonacci_sequence(500) == expected
+    assert fibonacci_sequence(10, start=100) == expected[100:110]
+    assert fibonacci_number(499) == expected[499]
+
+    # Terms past the prefix table are walked from a seeded pair
+    tail = fibonacci_sequence(3, start=PREFIX_TABLE_LIMIT - 1)
+    assert tail[2] == tail[1] + tail[0]
+    assert tail[0] == fib_pair(PREFIX_TABLE_LIMIT - 1)[0]
+
+    with pytest.raises(ValueError):
+        fib_pair(-1)
+
+    # Least recently used body is evicted first
+    cache = ResponseCache(maxsize=2)
+    cache.get_or_build(1, lambda: b"1")
+    cache.get_or_build(2, lambda: b"2")
+    cache.get_or_build(1, lambda: b"stale")
+    cache.get_or_build(3, lambda: b"3")
+    assert cache.get_or_build(1, lambda: b"rebuilt") == b"1"
+    assert cache.get_or_build(2, lambda: b"rebuilt") == b"rebuilt"
+    assert cache.hits == 2
+
+def test_fibonacci_many():
+    """
+    Test cases for batch evaluation in the shared Fibonacci engine.
+    Verifies table reads, short walks and addition-formula jumps between
+    sparse indices against fast doubling.
+    """
+    from fib_engine import BATCH_WALK_LIMIT, PREFIX_TABLE_LIMIT, fib_pair, fibonacci_many
+
+    indices = [
+        3,
+        BATCH_WALK_LIMIT + 1,
+        PREFIX_TABLE_LIMIT - 1,
+        # Short gap from the last table term: walked
+        PREFIX_TABLE_LIMIT + 10,
+        # Gaps above BATCH_WALK_LIMIT: jumped
+        PREFIX_TABLE_LIMIT + 10 + BATCH_WALK_LIMIT + 1,
+        PREFIX_TABLE_LIMIT + 5000,
+        3 * PREFIX_TABLE_LIMIT,
+        3 * PREFIX_TABLE_LIMIT + 1,
+    ]
+    results = fibonacci_many(indices + [3, PREFIX_TABLE_LIMIT + 5000])
+    assert sorted(results) == sorted(indices)
+    for n in indices:
+        assert results[n] == fib_pair(n)[0]
+
+    assert fibonacci_many([]) == {}
+    with pytest.raises(ValueError):
+        fibonacci_many([5, -1])
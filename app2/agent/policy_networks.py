@@ -1,3 +1,5 @@
+from typing import Optional, Union
+import numpy as np
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
@@ -47,4 +49,69 @@ class DQN(nn.Module):
         """
         for layer in self.layers:
             x = layer(x)
-        return self.output_layer(x)
\ No newline at end of file
+        return self.output_layer(x)
+
+class DQNInferencePolicy:
+    """
+    Batched, inference-only action selection for a DQN.
+
+    Builds a dropout-free view of the network's Linear/ReLU stack that shares
+    the DQN's parameters, so weight updates made by the learner are seen
+    immediately and the training model's train/eval mode is left untouched.
+    All forward passes run under torch.inference_mode.
+
+    Args:
+        model (DQN): Network whose parameters are used for acting
+        fuse (str | None): "script" to compile the stack with TorchScript,
+            "compile" to use torch.compile, or None for eager execution
+        seed (int | None): Seed for epsilon-greedy exploration
+    """
+
+    def __init__(self, model: DQN, fuse: Optional[str] = None, seed: Optional[int] = None):
+        layers = [layer for layer in model.layers if not isinstance(layer, nn.Dropout)]
+        # No .eval(): it would flip the DQN's shared modules, and nothing mode-dependent remains
+        net = nn.Sequential(*layers, model.output_layer)
+        if fuse == "script":
+            net = torch.jit.script(net)
+        elif fuse == "compile":
+            net = torch.compile(net)
+        elif fuse is not None:
+            raise ValueError(f"Unknown fuse mode '{fuse}', expected 'script', 'compile' or None")
+        self.net = net
+        self.num_actions = model.output_layer.out_features
+        self.device = model.output_layer.weight.device
+        self.generator = torch.Generator(device=self.device)
+        if seed is not None:
+            self.generator.manual_seed(seed)
+
+    def _as_batch(self, observations: Union[np.ndarray, torch.Tensor]) -> torch.Tensor:
+        if isinstance(observations, np.ndarray):
+            observations = torch.from_numpy(observations)
+        observations = observations.to(self.device, torch.float32)
+        return observations if observations.dim() > 1 else observations.unsqueeze(0)
+
+    def q_values(self, observations: Union[np.ndarray, torch.Tensor]) -> torch.Tensor:
+        """Compute Q-values of shape (batch_size, num_actions) for a batch of observations."""
+        with torch.inference_mode():
+            return self.net(self._as_batch(observations))
+
+    def act(self, observations: Union[np.ndarray, torch.Tensor], epsilon: float = 0.0) -> np.ndarray:
+        """Select epsilon-greedy actions for a batch of observations.
+
+        Args:
+            observations: Array of shape (batch_size, input_dim) or a single
+                observation of shape (input_dim,)
+            epsilon: Probability of taking a uniformly random action per row
+
+        Returns:
+            np.ndarray: Integer actions of shape (batch_size,)
+        """
+        with torch.inference_mode():
+            batch = self._as_batch(observations)
+            actions = self.net(batch).argmax(dim=1)
+            if epsilon > 0.0:
+                size = (batch.shape[0],)
+                explore = torch.rand(size, generator=self.generator, device=self.device) < epsilon
+                random_actions = torch.randint(self.num_actions, size, generator=self.generator, device=self.device)
+                actions = torch.where(explore, random_actions, actions)
+            return actions.cpu().numpy()
@@ -0,0 +1,135 @@
+import queue
+import threading
+from typing import Any, List, Optional, Tuple
+import torch
+
+class BatchPrefetcher:
+    def __init__(self, buffer: Any, num_batches: int = 2, pin_memory: Optional[bool] = None,
+                 device: Optional[torch.device] = None, retry_interval: float = 0.01) -> None:
+        """
+        Background stage that keeps sampled replay batches ready for the learner.
+
+        A worker thread calls buffer.sample() and copies each batch into one of
+        num_batches preallocated (optionally pinned) tensor slots, overlapping
+        sampling with the learner's optimizer step. Iterating yields ready
+        batches; a slot is recycled when the next batch is requested, so the
+        learner must finish with a batch before asking for the following one.
+
+        Args:
+            buffer: Any replay buffer exposing sample(), batch_size and
+                __len__; non-tensor fields of the sampled tuple (e.g.
+                prioritized indices) are passed through
+            num_batches: Number of batches kept in flight (K)
+            pin_memory: Allocate page-locked slots (default: when CUDA is available)
+            device: If given, batches are moved there with non_blocking copies
+            retry_interval: Seconds to wait when the buffer is not yet full enough
+        """
+        self.buffer = buffer
+        self.num_batches = num_batches
+        self.pin_memory = torch.cuda.is_available() if pin_memory is None else pin_memory
+        self.device = device
+        self.retry_interval = retry_interval
+        self._free: "queue.Queue[Optional[List[Optional[torch.Tensor]]]]" = queue.Queue()
+        self._ready: "queue.Queue[Any]" = queue.Queue()
+        self._in_use: Optional[List[Optional[torch.Tensor]]] = None
+        self._copy_done: Optional[torch.cuda.Event] = None
+        self._error: Optional[Exception] = None
+        self._stop = threading.Event()
+        # None marks a slot whose tensors are allocated from the first batch
+        for _ in range(num_batches):
+            self._free.put(None)
+        self._thread = threading.Thread(target=self._worker, name="replay-prefetch", daemon=True)
+        self._thread.start()
+
+    def _allocate(self, batch: Tuple[Any, ...]) -> List[Optional[torch.Tensor]]:
+        slot: List[Optional[torch.Tensor]] = []
+        for field in batch:
+            if isinstance(field, torch.Tensor):
+                tensor = torch.empty_like(field)
+                slot.append(tensor.pin_memory() if self.pin_memory else tensor)
+            else:
+                slot.append(None)
+        return slot
+
+    def _worker(self) -> None:
+        while not self._stop.is_set():
+            try:
+                slot = self._free.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if len(self.buffer) < self.buffer.batch_size:
+                # Not enough transitions yet
+                self._free.put(slot)
+                self._stop.wait(self.retry_interval)
+                continue
+            try:
+                batch = self.buffer.sample()
+            except Exception as exc:
+                self._ready.put(exc)
+                return
+
+            if slot is None:
+                slot = self._allocate(batch)
+            extras = []
+            for dst, field in zip(slot, batch):
+                if dst is not None:
+                    dst.copy_(field)
+                extras.append(None if dst is not None else field)
+            self._ready.put((slot, extras))
+
+    def __iter__(self) -> "BatchPrefetcher":
+        return self
+
+    def __next__(self) -> Tuple[Any, ...]:
+        """
+        Return the next ready batch, releasing the previously returned one.
+
+        Raises:
+            Exception: The error that stopped the worker, on this and every later call
+            StopIteration: If the prefetcher was closed and no batch is left
+        """
+        if self._error is not None:
+            raise self._error
+        if self._in_use is not None:
+            # The slot may only be overwritten once its device copy has finished
+            if self._copy_done is not None:
+                self._copy_done.synchronize()
+            self._free.put(self._in_use)
+            self._in_use = None
+        while True:
+            alive = self._thread.is_alive()
+            try:
+                item = self._ready.get(timeout=0.1)
+                break
+            except queue.Empty:
+                # Checked before the get, so nothing the worker put can be missed
+                if not alive:
+                    raise StopIteration
+        if isinstance(item, Exception):
+            self._error = item
+            raise item
+        slot, extras = item
+        self._in_use = slot
+        batch = []
+        for tensor, extra in zip(slot, extras):
+            if tensor is None:
+                batch.append(extra)
+            elif self.device is not None:
+                batch.append(tensor.to(self.device, non_blocking=True))
+            else:
+                batch.append(tensor)
+        if self.device is not None and torch.device(self.device).type == "cuda":
+            self._copy_done = torch.cuda.Event()
+            self._copy_done.record()
+        return tuple(batch)
+
+    def close(self) -> None:
+        """Stop the worker thread."""
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self) -> "BatchPrefetcher":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
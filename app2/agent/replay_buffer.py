@@ -1,28 +1,86 @@
-import random
-from collections import deque
+import json
+import os
 import threading
-from typing import Deque, List, Tuple, Any, Optional
+from typing import Tuple, Any, Optional
 import numpy as np
 import torch
+from .segment_tree import MinSegmentTree, SumSegmentTree
+
+_FIELDS = ("states", "actions", "rewards", "next_states", "dones")
+_METADATA_FILE = "metadata.json"
+# Constructor arguments that would allocate new arrays instead of mapping stored ones
+_SHAPE_KWARGS = {"state_shape", "action_shape", "action_dtype"}
 
 class ReplayBuffer:
-    def __init__(self, capacity: int, batch_size: int) -> None:
+    def __init__(self, capacity: int, batch_size: int,
+                 state_shape: Optional[Tuple[int, ...]] = None,
+                 action_shape: Optional[Tuple[int, ...]] = None,
+                 action_dtype: Any = np.float32,
+                 seed: Optional[int] = None,
+                 storage_dir: Optional[str] = None) -> None:
         """
         Experience replay buffer for storing and sampling transitions.
-        
+
+        Transitions are stored in a structure-of-arrays ring buffer: one
+        preallocated contiguous array per field, overwritten in place once
+        the buffer is full. If state_shape is not given, the arrays are
+        allocated from the shapes and action dtype of the first transition.
+
+        With storage_dir set, each array is a memory-mapped .npy file in that
+        directory, so checkpoint() only has to flush dirty pages and record
+        the write cursor, and restore() reopens a warm buffer after a restart.
+
         Args:
             capacity: Maximum number of transitions stored in the buffer
             batch_size: Number of transitions to sample in each batch
+            state_shape: Shape of a single state observation
+            action_shape: Shape of a single action (default=() for scalar actions)
+            action_dtype: NumPy dtype used to store actions
+            seed: Seed for the sampling random generator
+            storage_dir: Directory for memory-mapped array files (default: in memory)
         """
         self.capacity = capacity
         self.batch_size = batch_size
-        self.buffer: Deque[Tuple[Any, ...]] = deque(maxlen=capacity)
+        self.storage_dir = storage_dir
+        self.read_only = False
         self.lock = threading.Lock()
+        self._rng = np.random.default_rng(seed)
+        self._pos = 0
+        self._size = 0
+        self._allocated = False
+        if state_shape is not None:
+            self._allocate(tuple(state_shape), tuple(action_shape or ()), np.dtype(action_dtype))
+
+    def _allocate(self, state_shape: Tuple[int, ...], action_shape: Tuple[int, ...],
+                  action_dtype: np.dtype) -> None:
+        """Preallocate the per-field storage arrays."""
+        self.states = self._new_array("states", (self.capacity, *state_shape), np.float32)
+        self.actions = self._new_array("actions", (self.capacity, *action_shape), action_dtype)
+        self.rewards = self._new_array("rewards", (self.capacity, 1), np.float32)
+        self.next_states = self._new_array("next_states", (self.capacity, *state_shape), np.float32)
+        self.dones = self._new_array("dones", (self.capacity, 1), np.float32)
+        self._allocated = True
+
+    def _new_array(self, name: str, shape: Tuple[int, ...], dtype: Any) -> np.ndarray:
+        """
+        Create one zeroed field array, file-backed when storage_dir is set.
+
+        Raises:
+            FileExistsError: If storage_dir already holds this field's file;
+                use restore() to reopen an existing buffer
+        """
+        if self.storage_dir is None:
+            return np.zeros(shape, dtype=dtype)
+        os.makedirs(self.storage_dir, exist_ok=True)
+        path = os.path.join(self.storage_dir, f"{name}.npy")
+        if os.path.exists(path):
+            raise FileExistsError(f"{path} already exists; use ReplayBuffer.restore() to reopen it")
+        return np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
 
     def add(self, state: np.ndarray, action: np.ndarray, reward: float, next_state: np.ndarray, done: bool) -> None:
         """
         Add a new experience to the buffer.
-        
+
         Args:
             state: Current state observation
             action: Action taken
@@ -31,12 +89,68 @@ class ReplayBuffer:
             done: Terminal state flag
         """
         with self.lock:
-            self.buffer.append((state, action, reward, next_state, done))
+            self._store(state, action, reward, next_state, done)
+
+    def _store(self, state: np.ndarray, action: np.ndarray, reward: float, next_state: np.ndarray,
+               done: bool) -> int:
+        """Write one transition at the cursor and return its slot. Caller holds the lock."""
+        if not self._allocated:
+            action = np.asarray(action)
+            self._allocate(np.shape(state), action.shape, action.dtype)
+        i = self._pos
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+        self._pos = (i + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        return i
+
+    def add_many(self, states: np.ndarray, actions: np.ndarray, rewards: np.ndarray,
+                 next_states: np.ndarray, dones: np.ndarray) -> None:
+        """
+        Add a batch of experiences with one vectorized write per field.
+
+        Args:
+            states: Array of shape (n, *state_shape)
+            actions: Array of shape (n, *action_shape)
+            rewards: Array of shape (n,)
+            next_states: Array of shape (n, *state_shape)
+            dones: Array of shape (n,)
+        """
+        if len(states) == 0:
+            return
+        with self.lock:
+            self._store_many(np.asarray(states), np.asarray(actions), np.asarray(rewards),
+                             np.asarray(next_states), np.asarray(dones))
+
+    def _store_many(self, states: np.ndarray, actions: np.ndarray, rewards: np.ndarray,
+                    next_states: np.ndarray, dones: np.ndarray) -> np.ndarray:
+        """Write a batch at the cursor and return the slots used. Caller holds the lock."""
+        if not self._allocated:
+            self._allocate(states.shape[1:], actions.shape[1:], actions.dtype)
+        n = len(states)
+        # Only the newest `capacity` transitions of an oversized batch survive
+        skip = max(n - self.capacity, 0)
+        idx = (self._pos + skip + np.arange(n - skip)) % self.capacity
+        self.states[idx] = states[skip:]
+        self.actions[idx] = actions[skip:]
+        self.rewards[idx] = np.reshape(rewards[skip:], (-1, 1))
+        self.next_states[idx] = next_states[skip:]
+        self.dones[idx] = np.reshape(dones[skip:], (-1, 1))
+        self._pos = (self._pos + n) % self.capacity
+        self._size = min(self._size + n, self.capacity)
+        return idx
 
     def sample(self) -> Tuple[torch.Tensor, ...]:
         """
         Sample a batch of experiences from the buffer.
-        
+
+        Each field is gathered with a single vectorized index into its array,
+        and the gathered arrays are wrapped with torch.from_numpy without a
+        further copy, so the cost depends on batch_size rather than capacity.
+
         Returns:
             Tuple containing:
                 states: Tensor of shape (batch_size, *state_shape)
@@ -44,26 +158,217 @@ class ReplayBuffer:
                 rewards: Tensor of shape (batch_size, 1)
                 next_states: Tensor of shape (batch_size, *state_shape)
                 dones: Tensor of shape (batch_size, 1)
-        
+
         Raises:
             ValueError: If not enough samples are available in the buffer
         """
         with self.lock:
-            if len(self.buffer) < self.batch_size:
-                raise ValueError(f"Not enough samples in buffer ({len(self.buffer)} available, {self.batch_size} needed)")
-            
-            batch = random.sample(self.buffer, self.batch_size)
-            states, actions, rewards, next_states, dones = zip(*batch)
+            if self._size < self.batch_size:
+                raise ValueError(f"Not enough samples in buffer ({self._size} available, {self.batch_size} needed)")
 
-            states_tensor = torch.tensor(np.array(states), dtype=torch.float32)
-            actions_tensor = torch.tensor(np.array(actions))
-            rewards_tensor = torch.tensor(np.array(rewards), dtype=torch.float32).unsqueeze(-1)
-            next_states_tensor = torch.tensor(np.array(next_states), dtype=torch.float32)
-            dones_tensor = torch.tensor(np.array(dones, dtype=np.float32), dtype=torch.float32).unsqueeze(-1)
+            idx = self._rng.choice(self._size, self.batch_size, replace=False)
+            return self._gather(idx)
 
-            return (states_tensor, actions_tensor, rewards_tensor, next_states_tensor, dones_tensor)
+    def _gather(self, idx: np.ndarray) -> Tuple[torch.Tensor, ...]:
+        """Gather the transitions at idx into tensors. Caller holds the lock."""
+        return (
+            torch.from_numpy(self.states[idx]),
+            torch.from_numpy(self.actions[idx]),
+            torch.from_numpy(self.rewards[idx]),
+            torch.from_numpy(self.next_states[idx]),
+            torch.from_numpy(self.dones[idx]),
+        )
 
     def __len__(self) -> int:
         """Return the current number of stored transitions."""
+        # A single int read is atomic, so no lock is needed
+        return self._size
+
+    def checkpoint(self) -> None:
+        """
+        Flush memory-mapped arrays and record the write cursor and metadata.
+
+        The metadata file is replaced atomically, so a crash mid-checkpoint
+        leaves the previous checkpoint usable.
+
+        Raises:
+            ValueError: If the buffer is not backed by storage_dir or is read-only
+        """
+        if self.storage_dir is None or self.read_only:
+            raise ValueError("checkpoint() requires a writable buffer created with storage_dir")
+        with self.lock:
+            if not self._allocated:
+                return
+            for field in _FIELDS:
+                getattr(self, field).flush()
+            metadata = {
+                "capacity": self.capacity,
+                "batch_size": self.batch_size,
+                "pos": self._pos,
+                "size": self._size,
+            }
+        path = os.path.join(self.storage_dir, _METADATA_FILE)
+        with open(path + ".tmp", "w") as f:
+            json.dump(metadata, f)
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def restore(cls, storage_dir: str, batch_size: Optional[int] = None, read_only: bool = False,
+                **kwargs: Any) -> "ReplayBuffer":
+        """
+        Reopen a checkpointed buffer from its memory-mapped files.
+
+        Arrays are mapped rather than read, so restoring costs only the pages
+        later touched. Read-only buffers can be opened by evaluation processes
+        alongside a writer; call refresh() to pick up newer checkpoints.
+
+        Args:
+            storage_dir: Directory passed to the original buffer
+            batch_size: Sampling batch size (default: the checkpointed value)
+            read_only: Map the arrays read-only; add() will then fail
+            **kwargs: Extra constructor arguments (e.g. seed, alpha)
+
+        Returns:
+            ReplayBuffer: Buffer with the checkpointed contents and cursor
+
+        Raises:
+            TypeError: If shape or dtype arguments are given; they are read
+                from the existing files
+        """
+        shape_kwargs = sorted(_SHAPE_KWARGS.intersection(kwargs))
+        if shape_kwargs:
+            raise TypeError(f"restore() takes shapes from the stored arrays, got {', '.join(shape_kwargs)}")
+        with open(os.path.join(storage_dir, _METADATA_FILE)) as f:
+            metadata = json.load(f)
+        buffer = cls(metadata["capacity"], batch_size or metadata["batch_size"],
+                     storage_dir=storage_dir, **kwargs)
+        buffer.read_only = read_only
+        mode = "r" if read_only else "r+"
+        for field in _FIELDS:
+            setattr(buffer, field, np.load(os.path.join(storage_dir, f"{field}.npy"), mmap_mode=mode))
+        buffer._allocated = True
+        buffer._pos = metadata["pos"]
+        buffer._size = metadata["size"]
+        buffer._restored()
+        return buffer
+
+    def refresh(self) -> None:
+        """Re-read the write cursor from the latest checkpoint (for read-only sharing)."""
+        with open(os.path.join(self.storage_dir, _METADATA_FILE)) as f:
+            metadata = json.load(f)
+        with self.lock:
+            self._pos = metadata["pos"]
+            self._size = metadata["size"]
+            self._restored()
+
+    def _restored(self) -> None:
+        """Hook run after the cursor is loaded from a checkpoint. Caller holds the lock."""
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    def __init__(self, capacity: int, batch_size: int, alpha: float = 0.6, beta: float = 0.4,
+                 eps: float = 1e-6, **kwargs: Any) -> None:
+        """
+        Replay buffer with proportional prioritized sampling.
+
+        Transition i is sampled with probability p_i^alpha / sum_k p_k^alpha,
+        where p_i = |td_error_i| + eps. Priorities live in a sum-tree for
+        O(log n) sampling and updates and a min-tree for the largest
+        importance-sampling weight. New transitions get the maximum priority
+        seen so far so each one is replayed at least once.
+
+        Args:
+            capacity: Maximum number of transitions stored in the buffer
+            batch_size: Number of transitions to sample in each batch
+            alpha: Prioritization exponent (0 gives uniform sampling)
+            beta: Default importance-sampling correction exponent
+            eps: Constant added to |td_error| so no priority is zero
+            **kwargs: Storage options forwarded to ReplayBuffer
+        """
+        super().__init__(capacity, batch_size, **kwargs)
+        self.alpha = alpha
+        self.beta = beta
+        self.eps = eps
+        tree_capacity = 1 << max(capacity - 1, 0).bit_length()
+        self._sum_tree = SumSegmentTree(tree_capacity)
+        self._min_tree = MinSegmentTree(tree_capacity)
+        self._max_priority = 1.0
+
+    def _store(self, state: np.ndarray, action: np.ndarray, reward: float, next_state: np.ndarray,
+               done: bool) -> int:
+        i = super()._store(state, action, reward, next_state, done)
+        priority = self._max_priority ** self.alpha
+        self._sum_tree[i] = priority
+        self._min_tree[i] = priority
+        return i
+
+    def _store_many(self, states: np.ndarray, actions: np.ndarray, rewards: np.ndarray,
+                    next_states: np.ndarray, dones: np.ndarray) -> np.ndarray:
+        idx = super()._store_many(states, actions, rewards, next_states, dones)
+        priority = self._max_priority ** self.alpha
+        self._sum_tree[idx] = priority
+        self._min_tree[idx] = priority
+        return idx
+
+    def _restored(self) -> None:
+        # Priorities are not checkpointed; restored transitions restart at max priority
+        size = self._size
+        if size:
+            priority = self._max_priority ** self.alpha
+            self._sum_tree[np.arange(size)] = priority
+            self._min_tree[np.arange(size)] = priority
+
+    def sample(self, beta: Optional[float] = None) -> Tuple[Any, ...]:
+        """
+        Sample a prioritized batch with importance-sampling weights.
+
+        The total priority mass is split into batch_size equal segments and
+        one transition is drawn from each, all in one vectorized tree descent.
+
+        Args:
+            beta: Importance-sampling exponent (defaults to self.beta)
+
+        Returns:
+            Tuple containing:
+                states, actions, rewards, next_states, dones: As in ReplayBuffer.sample
+                weights: Tensor of shape (batch_size, 1), normalized so the max is 1
+                indices: np.ndarray of buffer slots, for update_priorities
+
+        Raises:
+            ValueError: If not enough samples are available in the buffer
+        """
+        beta = self.beta if beta is None else beta
+        with self.lock:
+            if self._size < self.batch_size:
+                raise ValueError(f"Not enough samples in buffer ({self._size} available, {self.batch_size} needed)")
+
+            total = self._sum_tree.reduce()
+            segment = total / self.batch_size
+            mass = (np.arange(self.batch_size) + self._rng.random(self.batch_size)) * segment
+            idx = np.minimum(self._sum_tree.find_prefixsum_idx(mass), self._size - 1)
+
+            probs = self._sum_tree[idx] / total
+            min_prob = self._min_tree.reduce() / total
+            weights = (probs / min_prob) ** (-beta)
+            batch = self._gather(idx)
+
+        weights_tensor = torch.from_numpy(weights.astype(np.float32)).unsqueeze(-1)
+        return (*batch, weights_tensor, idx)
+
+    def update_priorities(self, indices: np.ndarray, td_errors: Any) -> None:
+        """
+        Set new priorities for previously sampled transitions.
+
+        Args:
+            indices: Buffer slots returned by sample()
+            td_errors: TD errors for those slots (array or tensor)
+        """
+        if isinstance(td_errors, torch.Tensor):
+            td_errors = td_errors.detach().cpu().numpy()
+        priorities = np.abs(np.asarray(td_errors, dtype=np.float64)).reshape(-1) + self.eps
+        indices = np.asarray(indices, dtype=np.int64).reshape(-1)
         with self.lock:
-            return len(self.buffer)
\ No newline at end of file
+            scaled = priorities ** self.alpha
+            self._sum_tree[indices] = scaled
+            self._min_tree[indices] = scaled
+            self._max_priority = max(self._max_priority, float(priorities.max()))
@@ -0,0 +1,84 @@
+import numpy as np
+from typing import Callable, Union
+
+ArrayLike = Union[int, float, np.ndarray]
+
+class SegmentTree:
+    """
+    Array-based binary segment tree with vectorized batch operations.
+
+    Leaves live at positions [capacity, 2 * capacity) of a flat array and
+    node i holds operation(node 2i, node 2i + 1), so the root (node 1) is the
+    reduction over every leaf. Updating k leaves touches O(k log n) nodes,
+    one NumPy operation per tree level.
+
+    Args:
+        capacity: Number of leaves (must be a positive power of two)
+        operation: Element-wise binary NumPy ufunc combining two children
+        neutral: Identity element of operation, used for empty leaves
+    """
+
+    def __init__(self, capacity: int, operation: Callable[[np.ndarray, np.ndarray], np.ndarray],
+                 neutral: float) -> None:
+        if capacity < 1 or capacity & (capacity - 1):
+            raise ValueError(f"capacity must be a positive power of two, got {capacity}")
+        self.capacity = capacity
+        self._operation = operation
+        self._tree = np.full(2 * capacity, neutral, dtype=np.float64)
+
+    def __setitem__(self, idx: ArrayLike, value: ArrayLike) -> None:
+        """Set one or more leaves and refresh their ancestors level by level."""
+        nodes = np.atleast_1d(np.asarray(idx, dtype=np.int64)) + self.capacity
+        self._tree[nodes] = value
+        # All leaves share a depth, so each pass refreshes one whole level
+        nodes = np.unique(nodes // 2)
+        while nodes[0] >= 1:
+            self._tree[nodes] = self._operation(self._tree[2 * nodes], self._tree[2 * nodes + 1])
+            if nodes[0] == 1:
+                break
+            nodes = np.unique(nodes // 2)
+
+    def __getitem__(self, idx: ArrayLike) -> np.ndarray:
+        """Return the value of one or more leaves."""
+        return self._tree[np.asarray(idx, dtype=np.int64) + self.capacity]
+
+    def reduce(self) -> float:
+        """Return the reduction over all leaves."""
+        return float(self._tree[1])
+
+
+class SumSegmentTree(SegmentTree):
+    """Segment tree of sums supporting proportional (prefix-sum) lookups."""
+
+    def __init__(self, capacity: int) -> None:
+        super().__init__(capacity, np.add, 0.0)
+        self._depth = capacity.bit_length() - 1
+
+    def find_prefixsum_idx(self, prefixsum: np.ndarray) -> np.ndarray:
+        """
+        Find, for each value p, the highest leaf i with sum(leaves[:i]) <= p.
+
+        The whole batch descends the tree together, one level per step.
+
+        Args:
+            prefixsum: Array of target cumulative masses in [0, reduce())
+
+        Returns:
+            np.ndarray: Leaf indices, one per target mass
+        """
+        mass = np.array(prefixsum, dtype=np.float64, copy=True)
+        nodes = np.ones(mass.shape, dtype=np.int64)
+        for _ in range(self._depth):
+            left = 2 * nodes
+            left_sum = self._tree[left]
+            go_right = mass > left_sum
+            mass = np.where(go_right, mass - left_sum, mass)
+            nodes = np.where(go_right, left + 1, left)
+        return nodes - self.capacity
+
+
+class MinSegmentTree(SegmentTree):
+    """Segment tree of minima, used to bound importance-sampling weights."""
+
+    def __init__(self, capacity: int) -> None:
+        super().__init__(capacity, np.minimum, float("inf"))
@@ -0,0 +1,227 @@
+from multiprocessing import shared_memory
+from typing import Any, List, Optional, Tuple
+import numpy as np
+import torch
+
+# Header slots (int64) at the start of each shard's shared memory block
+_RESERVED = 0  # Total transitions the writer has started writing
+_WRITTEN = 1   # Total transitions fully written and visible to readers
+_HEADER_BYTES = 64
+_ALIGN = 64
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class ReplayShard:
+    def __init__(self, capacity: int, state_shape: Tuple[int, ...],
+                 action_shape: Tuple[int, ...] = (), action_dtype: Any = np.float32,
+                 name: Optional[str] = None) -> None:
+        """
+        Single-writer ring buffer of transitions stored in shared memory.
+
+        Each shard is written by exactly one actor and read by the learner
+        without locks. The writer bumps a reserved counter, writes its batch,
+        then publishes the written counter; readers sample only published
+        transitions and discard any slot the writer may have reused while it
+        was being gathered (a seqlock on the write cursor).
+
+        Shards pickle by segment name, so passing one to a
+        multiprocessing.Process attaches the child to the same memory.
+
+        Args:
+            capacity: Maximum number of transitions stored in the shard
+            state_shape: Shape of a single state observation
+            action_shape: Shape of a single action (default=() for scalar actions)
+            action_dtype: NumPy dtype used to store actions
+            name: Name of an existing segment to attach to instead of creating one
+        """
+        self.capacity = capacity
+        self.state_shape = tuple(state_shape)
+        self.action_shape = tuple(action_shape)
+        self.action_dtype = np.dtype(action_dtype)
+
+        fields = [
+            ("states", (capacity, *self.state_shape), np.dtype(np.float32)),
+            ("actions", (capacity, *self.action_shape), self.action_dtype),
+            ("rewards", (capacity, 1), np.dtype(np.float32)),
+            ("next_states", (capacity, *self.state_shape), np.dtype(np.float32)),
+            ("dones", (capacity, 1), np.dtype(np.float32)),
+        ]
+        layout = []
+        offset = _HEADER_BYTES
+        for field, shape, dtype in fields:
+            layout.append((field, shape, dtype, offset))
+            offset = _aligned(offset + int(np.prod(shape)) * dtype.itemsize)
+
+        self._owner = name is None
+        self._shm = shared_memory.SharedMemory(name=name, create=self._owner, size=offset)
+        self._header = np.ndarray((2,), dtype=np.int64, buffer=self._shm.buf)
+        for field, shape, dtype, field_offset in layout:
+            setattr(self, field, np.ndarray(shape, dtype=dtype, buffer=self._shm.buf, offset=field_offset))
+        if self._owner:
+            self._header[:] = 0
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory segment backing this shard."""
+        return self._shm.name
+
+    def __reduce__(self):
+        return (ReplayShard, (self.capacity, self.state_shape, self.action_shape,
+                              self.action_dtype.str, self.name))
+
+    def __len__(self) -> int:
+        """Return the number of published transitions held by the shard."""
+        return int(min(self._header[_WRITTEN], self.capacity))
+
+    def add(self, state: np.ndarray, action: np.ndarray, reward: float, next_state: np.ndarray, done: bool) -> None:
+        """Add a single transition. Only the shard's own actor may call this."""
+        self.add_many(np.asarray(state)[None], np.asarray(action)[None], np.asarray([reward]),
+                      np.asarray(next_state)[None], np.asarray([done]))
+
+    def add_many(self, states: np.ndarray, actions: np.ndarray, rewards: np.ndarray,
+                 next_states: np.ndarray, dones: np.ndarray) -> None:
+        """
+        Add a batch of transitions. Only the shard's own actor may call this.
+
+        Args:
+            states: Array of shape (n, *state_shape)
+            actions: Array of shape (n, *action_shape)
+            rewards: Array of shape (n,)
+            next_states: Array of shape (n, *state_shape)
+            dones: Array of shape (n,)
+        """
+        n = len(states)
+        if n == 0:
+            return
+        skip = max(n - self.capacity, 0)
+        written = int(self._header[_WRITTEN])
+        self._header[_RESERVED] = written + n
+        idx = (written + skip + np.arange(n - skip)) % self.capacity
+        self.states[idx] = np.asarray(states)[skip:]
+        self.actions[idx] = np.asarray(actions)[skip:]
+        self.rewards[idx] = np.reshape(rewards, (-1, 1))[skip:]
+        self.next_states[idx] = np.asarray(next_states)[skip:]
+        self.dones[idx] = np.reshape(dones, (-1, 1))[skip:]
+        self._header[_WRITTEN] = written + n
+
+    def gather(self, count: int, rng: np.random.Generator) -> Tuple[np.ndarray, ...]:
+        """
+        Sample up to count published transitions uniformly, without locking.
+
+        Args:
+            count: Number of transitions to draw (with replacement)
+            rng: Random generator used for the draw
+
+        Returns:
+            Tuple of (states, actions, rewards, next_states, dones) arrays.
+            Transitions overwritten while being read are dropped, so fewer
+            than count rows may be returned.
+        """
+        written = int(self._header[_WRITTEN])
+        size = min(written, self.capacity)
+        if size == 0 or count == 0:
+            return tuple(a[:0] for a in (self.states, self.actions, self.rewards, self.next_states, self.dones))
+
+        logical = written - size + rng.integers(0, size, count)
+        idx = logical % self.capacity
+        batch = (self.states[idx], self.actions[idx], self.rewards[idx],
+                 self.next_states[idx], self.dones[idx])
+        # Any slot whose next write had started by now may be torn
+        reserved = int(self._header[_RESERVED])
+        valid = logical >= reserved - self.capacity
+        if valid.all():
+            return batch
+        return tuple(a[valid] for a in batch)
+
+    def close(self) -> None:
+        """Detach from the shared memory, unlinking it if this shard created it."""
+        del self._header
+        for field in ("states", "actions", "rewards", "next_states", "dones"):
+            delattr(self, field)
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+class ShardedReplayBuffer:
+    def __init__(self, num_shards: int, capacity: int, batch_size: int,
+                 state_shape: Tuple[int, ...], action_shape: Tuple[int, ...] = (),
+                 action_dtype: Any = np.float32, seed: Optional[int] = None) -> None:
+        """
+        Replay buffer split into per-actor shared memory shards.
+
+        Each actor writes only to its own shard, so producers never contend
+        with each other, and the learner samples across shards without
+        blocking any writer. Hand shard(i) to actor i (it can be passed to
+        another process directly) and call sample() from the learner.
+
+        Args:
+            num_shards: Number of shards, normally one per actor
+            capacity: Total number of transitions across all shards
+            batch_size: Number of transitions to sample in each batch
+            state_shape: Shape of a single state observation
+            action_shape: Shape of a single action (default=() for scalar actions)
+            action_dtype: NumPy dtype used to store actions
+            seed: Seed for the sampling random generator
+        """
+        self.capacity = capacity
+        self.batch_size = batch_size
+        shard_capacity = -(-capacity // num_shards)
+        self.shards: List[ReplayShard] = [
+            ReplayShard(shard_capacity, state_shape, action_shape, action_dtype)
+            for _ in range(num_shards)
+        ]
+        self._rng = np.random.default_rng(seed)
+
+    def shard(self, actor_id: int) -> ReplayShard:
+        """Return the shard owned by the given actor."""
+        return self.shards[actor_id]
+
+    def __len__(self) -> int:
+        """Return the total number of published transitions across shards."""
+        return sum(len(shard) for shard in self.shards)
+
+    def sample(self) -> Tuple[torch.Tensor, ...]:
+        """
+        Sample a batch uniformly over all published transitions.
+
+        The batch is split across shards in proportion to their sizes and
+        each shard is gathered lock-free; rows dropped because a writer
+        overwrote them mid-read are redrawn.
+
+        Returns:
+            Tuple containing:
+                states: Tensor of shape (batch_size, *state_shape)
+                actions: Tensor of shape (batch_size, *action_shape)
+                rewards: Tensor of shape (batch_size, 1)
+                next_states: Tensor of shape (batch_size, *state_shape)
+                dones: Tensor of shape (batch_size, 1)
+
+        Raises:
+            ValueError: If not enough samples are available in the buffer
+        """
+        sizes = np.array([len(shard) for shard in self.shards], dtype=np.float64)
+        total = int(sizes.sum())
+        if total < self.batch_size:
+            raise ValueError(f"Not enough samples in buffer ({total} available, {self.batch_size} needed)")
+
+        parts: List[Tuple[np.ndarray, ...]] = []
+        needed = self.batch_size
+        while needed > 0:
+            counts = self._rng.multinomial(needed, sizes / sizes.sum())
+            for shard, count in zip(self.shards, counts):
+                if count:
+                    part = shard.gather(int(count), self._rng)
+                    parts.append(part)
+                    needed -= len(part[0])
+
+        fields = [np.concatenate(column) for column in zip(*parts)]
+        return tuple(torch.from_numpy(field) for field in fields)
+
+    def close(self) -> None:
+        """Release every shard's shared memory."""
+        for shard in self.shards:
+            shard.close()
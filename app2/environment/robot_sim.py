@@ -13,6 +13,8 @@ class RobotSimEnv(gym.Env):
             - "simulation": {
                   "render_mode": "human" for GUI or "headless" (default)
                   "timestep": Physics simulation timestep (default=1/240)
+                  "action_repeat": Physics steps per agent action (default=1)
+                  "substeps": Solver substeps per physics step (default=1)
               }
             - "robot": {
                   "urdf_path": Path to robot URDF file
@@ -26,7 +28,7 @@ class RobotSimEnv(gym.Env):
               }
             - "safety": {
                   "joint_limits": True/False (default=True)
-                  "max_episode_steps": Maximum steps per episode (default=1000)
+                  "max_episode_steps": Maximum physics steps per episode (default=1000)
               }
             - "observation_space": gym.Space definition
             - "action_space": gym.Space definition
@@ -47,10 +49,17 @@ class RobotSimEnv(gym.Env):
         self.physics_client = self._init_simulation()
         self.timestep = self.sim_config.get("timestep", 1/240)
         pb.setTimeStep(self.timestep, self.physics_client)
+        self.action_repeat = max(1, int(self.sim_config.get("action_repeat", 1)))
+        self.substeps = max(1, int(self.sim_config.get("substeps", 1)))
+        if self.substeps > 1:
+            pb.setPhysicsEngineParameter(numSubSteps=self.substeps, physicsClientId=self.physics_client)
         
-        # Load robot
+        # Load robot once; resets restore the snapshot taken here
         self.robot_id = self._load_robot()
         self._setup_joints()
+        self._cache_dynamics()
+        self._reset_joints()
+        self._initial_state = pb.saveState(physicsClientId=self.physics_client)
         
         # Initialize spaces
         self.action_space = config.get("action_space", self._default_action_space())
@@ -90,18 +99,48 @@ class RobotSimEnv(gym.Env):
         )
 
     def _setup_joints(self):
-        """Identify controllable joints and their properties."""
-        num_joints = pb.getNumJoints(self.robot_id, self.physics_client)
+        """Identify controllable joints and cache their indices and limits."""
+        self.num_joints = pb.getNumJoints(self.robot_id, self.physics_client)
         self.controllable_joints = []
         self.joint_limits = []
         
-        for i in range(num_joints):
+        for i in range(self.num_joints):
             joint_info = pb.getJointInfo(self.robot_id, i, self.physics_client)
             if joint_info[2] in [pb.JOINT_REVOLUTE, pb.JOINT_PRISMATIC]:
                 self.controllable_joints.append(i)
                 self.joint_limits.append((joint_info[8], joint_info[9]))
         
         self.num_controllable_joints = len(self.controllable_joints)
+        self.joint_indices = np.array(self.controllable_joints, dtype=np.int64)
+        limits = np.array(self.joint_limits, dtype=np.float64).reshape(-1, 2)
+        self.joint_low = limits[:, 0]
+        self.joint_high = limits[:, 1]
+        # PyBullet reports lower > upper for joints without limits
+        self._limited_joints = self.joint_low < self.joint_high
+        
+        # Per-step state buffers, written in place
+        self._obs_buffer = np.zeros(2 * self.num_controllable_joints, dtype=np.float32)
+        self._positions = self._obs_buffer[:self.num_controllable_joints]
+        self._velocities = self._obs_buffer[self.num_controllable_joints:]
+
+    def _cache_dynamics(self):
+        """Record nominal link masses so randomization never compounds across resets."""
+        self._link_indices = np.arange(-1, self.num_joints)
+        self._nominal_masses = np.array([
+            pb.getDynamicsInfo(self.robot_id, link_index, self.physics_client)[0]
+            for link_index in self._link_indices
+        ])
+
+    def _reset_joints(self):
+        """Move every controllable joint to zero position and velocity."""
+        for joint_index in self.controllable_joints:
+            pb.resetJointState(
+                self.robot_id,
+                joint_index,
+                targetValue=0,
+                targetVelocity=0,
+                physicsClientId=self.physics_client
+            )
 
     def _default_action_space(self) -> spaces.Box:
         """Create default action space if not provided in config."""
@@ -121,115 +160,123 @@ class RobotSimEnv(gym.Env):
         return spaces.Box(low=low, high=high, dtype=np.float32)
 
     def _randomize_environment(self):
-        """Apply domain randomization if enabled."""
+        """Apply domain randomization in place on the loaded robot if enabled."""
         if not self._dr_enabled:
             return
             
         friction_range = self.dr_config.get("friction_range", [0.5, 1.5])
         mass_range = self.dr_config.get("mass_range", [0.8, 1.2])
+        frictions = self.np_random.uniform(*friction_range, size=self.num_controllable_joints)
+        masses = self._nominal_masses * self.np_random.uniform(*mass_range, size=len(self._link_indices))
         
         # Randomize friction
-        for joint_index in self.controllable_joints:
+        for joint_index, friction in zip(self.controllable_joints, frictions):
             pb.changeDynamics(
                 self.robot_id,
                 joint_index,
-                lateralFriction=np.random.uniform(*friction_range),
+                lateralFriction=friction,
                 physicsClientId=self.physics_client
             )
         
-        # Randomize masses
-        for link_index in range(-1, pb.getNumJoints(self.robot_id, self.physics_client)):
-            mass = pb.getDynamicsInfo(self.robot_id, link_index, self.physics_client)[0]
-            new_mass = mass * np.random.uniform(*mass_range)
+        # Randomize masses relative to their nominal values
+        for link_index, mass in zip(self._link_indices, masses):
             pb.changeDynamics(
                 self.robot_id,
-                link_index,
-                mass=new_mass,
+                int(link_index),
+                mass=mass,
                 physicsClientId=self.physics_client
             )
 
-    def _get_obs(self) -> np.ndarray:
-        """Retrieve current observation (joint states)."""
+    def _fetch_joint_states(self):
+        """Query all controllable joint states once and write them into the state buffers."""
         joint_states = pb.getJointStates(
             self.robot_id,
             self.controllable_joints,
             physicsClientId=self.physics_client
         )
-        positions = [state[0] for state in joint_states]
-        velocities = [state[1] for state in joint_states]
-        return np.concatenate([positions, velocities]).astype(np.float32)
+        for i, state in enumerate(joint_states):
+            self._positions[i] = state[0]
+            self._velocities[i] = state[1]
 
-    def _check_safety(self) -> Tuple[bool, bool]:
-        """Check safety constraints and termination conditions."""
-        terminated = False
-        truncated = False
+    def _get_obs(self) -> np.ndarray:
+        """Return the current observation (joint positions + velocities) from the state buffers."""
+        return self._obs_buffer.copy()
+
+    def _check_safety(self) -> Tuple[bool, bool, np.ndarray]:
+        """
+        Check safety constraints and termination conditions against the state buffers.
+        
+        Returns:
+            terminated, truncated, and the indices of joints at or beyond their limits
+        """
+        violating_joints = self.joint_indices[:0]
         
         # Joint limit violation
         if self._safety_enabled:
-            joint_states = pb.getJointStates(
-                self.robot_id,
-                self.controllable_joints,
-                physicsClientId=self.physics_client
-            )
-            positions = [state[0] for state in joint_states]
-            for pos, (low, high) in zip(positions, self.joint_limits):
-                if pos <= low or pos >= high:
-                    terminated = True
-                    break
+            violations = (self._positions <= self.joint_low) | (self._positions >= self.joint_high)
+            violations &= self._limited_joints
+            violating_joints = self.joint_indices[violations]
+        terminated = violating_joints.size > 0
         
         # Max episode steps
         self.step_count += 1
-        if self.step_count >= self.max_episode_steps:
-            truncated = True
+        truncated = self.step_count >= self.max_episode_steps
             
-        return terminated, truncated
+        return terminated, truncated, violating_joints
 
     def reset(self, seed: Optional[int] = None, options: Optional[Dict] = None
              ) -> Tuple[np.ndarray, Dict[str, Any]]:
-        """Reset the environment to initial state."""
+        """Reset the environment to initial state by restoring the startup snapshot."""
         super().reset(seed=seed)
-        pb.resetSimulation(self.physics_client)
-        self.robot_id = self._load_robot()
-        self._setup_joints()
+        pb.restoreState(self._initial_state, physicsClientId=self.physics_client)
         self._randomize_environment()
         self.step_count = 0
         
-        # Reset robot to initial configuration
-        for joint_index in self.controllable_joints:
-            pb.resetJointState(
-                self.robot_id,
-                joint_index,
-                targetValue=0,
-                targetVelocity=0,
-                physicsClientId=self.physics_client
-            )
-        
+        self._fetch_joint_states()
         return self._get_obs(), {}
 
+    def _compute_reward(self) -> float:
+        """Reward for the physics step just taken."""
+        # Placeholder reward
+        return 0.0
+
     def step(self, action: np.ndarray) -> Tuple[np.ndarray, float, bool, bool, Dict[str, Any]]:
-        """Execute one timestep of the environment."""
-        # Apply control action
-        pb.setJointMotorControlArray(
-            self.robot_id,
-            self.controllable_joints,
-            pb.TORQUE_CONTROL,
-            forces=action,
-            physicsClientId=self.physics_client
-        )
+        """
+        Execute one agent decision, repeating the action for action_repeat physics steps.
         
-        # Step simulation
-        pb.stepSimulation(self.physics_client)
-        
-        # Get observation
-        obs = self._get_obs()
-        
-        # Check safety constraints
-        terminated, truncated = self._check_safety()
-        
-        # Placeholder reward
+        Rewards are summed over the repeated steps, and the repeat stops early
+        as soon as a step terminates or truncates the episode.
+        """
         reward = 0.0
+        terminated = truncated = False
+        violating_joints = self.joint_indices[:0]
+        physics_steps = 0
+        
+        for _ in range(self.action_repeat):
+            # Apply control action
+            pb.setJointMotorControlArray(
+                self.robot_id,
+                self.controllable_joints,
+                pb.TORQUE_CONTROL,
+                forces=action,
+                physicsClientId=self.physics_client
+            )
+            
+            # Step simulation
+            pb.stepSimulation(self.physics_client)
+            physics_steps += 1
+            
+            # Read joint states once for both reward and safety checks
+            self._fetch_joint_states()
+            reward += self._compute_reward()
+            
+            # Check safety constraints
+            terminated, truncated, violating_joints = self._check_safety()
+            if terminated or truncated:
+                break
         
-        return obs, reward, terminated, truncated, {}
+        info = {"violating_joints": violating_joints, "physics_steps": physics_steps}
+        return self._get_obs(), reward, terminated, truncated, info
 
     def render(self) -> Optional[np.ndarray]:
         """Render the environment."""
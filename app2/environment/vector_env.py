@@ -0,0 +1,59 @@
+import copy
+from functools import partial
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from gymnasium.vector import AsyncVectorEnv, AutoresetMode
+
+from .robot_sim import RobotSimEnv
+
+
+class RobotVectorEnv(AsyncVectorEnv):
+    """
+    Vectorized RobotSimEnv running one PyBullet client per worker process.
+
+    Built on gymnasium's AsyncVectorEnv, so it implements the standard
+    VectorEnv interface: step() takes actions of shape (num_envs, action_dim)
+    and returns batched observations, rewards and termination flags, and
+    sub-environments reset automatically when their episode ends. Batched
+    observations are written by the workers into shared memory instead of
+    being pickled through pipes.
+
+    Parameters:
+        config (dict): RobotSimEnv configuration shared by every sub-environment.
+            Workers always run headless.
+        num_envs (int): Number of environments (and worker processes)
+        context (str): multiprocessing start method (default: platform default)
+        autoreset_mode (str | AutoresetMode): When finished sub-environments are
+            reset (default=AutoresetMode.NEXT_STEP)
+    """
+
+    def __init__(self, config: Dict[str, Any], num_envs: int, context: Optional[str] = None,
+                 autoreset_mode: Union[str, AutoresetMode] = AutoresetMode.NEXT_STEP):
+        worker_config = copy.deepcopy(config)
+        worker_config.setdefault("simulation", {})["render_mode"] = "headless"
+        super().__init__(
+            [partial(RobotSimEnv, worker_config) for _ in range(num_envs)],
+            shared_memory=True,
+            context=context,
+            autoreset_mode=autoreset_mode,
+        )
+
+    def reset(self, *, seed: Optional[Union[int, Sequence[int]]] = None,
+              options: Optional[Dict[str, Any]] = None,
+              mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Reset all sub-environments, or only those selected by mask.
+
+        Args:
+            seed: Base seed (environment i gets seed + i) or one seed per environment
+            options: Options forwarded to each RobotSimEnv.reset
+            mask: Boolean array of shape (num_envs,) selecting environments to reset
+
+        Returns:
+            Batched observations and the merged info dictionary
+        """
+        if mask is not None:
+            options = dict(options or {})
+            options["reset_mask"] = np.asarray(mask, dtype=np.bool_)
+        return super().reset(seed=seed, options=options)
@@ -1,6 +1,13 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from fib_engine import fibonacci_sequence
+
+
 def calculate_fibonacci(n: int) -> list[int]:
     """
-    Compute the Fibonacci sequence iteratively with O(n) complexity.
+    Compute the Fibonacci sequence from the shared prefix table.
 
     Args:
         n: The number of Fibonacci numbers to generate (non-negative integer).
@@ -17,14 +24,5 @@ def calculate_fibonacci(n: int) -> list[int]:
     """
     if n < 0:
         raise ValueError("n must be a non-negative integer")
-    if n == 0:
-        return []
-    if n == 1:
-        return [0]
-    
-    sequence = [0, 1]
-    for i in range(2, n):
-        next_value = sequence[-1] + sequence[-2]
-        sequence.append(next_value)
-    
-    return sequence
\ No newline at end of file
+
+    return fibonacci_sequence(n)
\ No newline at end of file
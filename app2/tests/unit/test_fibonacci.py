@@ -0,0 +1,20 @@
+import pytest
+
+from services.fibonacci import calculate_fibonacci
+
+
+def test_calculate_fibonacci() -> None:
+    """Test the service against the iterative definition."""
+    expected = [0, 1]
+    for _ in range(98):
+        expected.append(expected[-1] + expected[-2])
+    assert calculate_fibonacci(100) == expected
+    assert calculate_fibonacci(5) == [0, 1, 1, 2, 3]
+    assert calculate_fibonacci(1) == [0]
+    assert calculate_fibonacci(0) == []
+
+
+def test_calculate_fibonacci_negative() -> None:
+    """Test that a negative n is rejected."""
+    with pytest.raises(ValueError):
+        calculate_fibonacci(-1)
@@ -1,11 +1,28 @@
-from fastapi import APIRouter, Query, Path, HTTPException
+from fastapi import APIRouter, Query, Path, HTTPException, Response
 from fastapi.responses import JSONResponse
 from typing import List, Dict
+import json
 import sys
 import os
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
-from services.fibonacci import calculate_fibonacci_number, calculate_fibonacci_sequence
+from services.fibonacci import (
+    InvalidFibonacciInputError,
+    calculate_fibonacci_batch,
+    calculate_fibonacci_number,
+    calculate_fibonacci_sequence,
+)
+from models.fibonacci import FibonacciBatchRequest
+from core.config import settings
+from fib_engine import ResponseCache
+
+# Serialized bodies for hot values of n
+_number_responses = ResponseCache()
+
+
+def _render_number(n: int) -> bytes:
+    result = calculate_fibonacci_number(n)
+    return json.dumps({'n': n, 'result': result}, separators=(',', ':')).encode()
 
 
 router = APIRouter(
@@ -15,13 +32,25 @@ router = APIRouter(
 )
 
 @router.get("/{n}", response_model=Dict)
-def get_fibonacci(n: int = Path(..., ge=0, title="Index of the Fibonacci number")) -> Dict:
+def get_fibonacci(n: int = Path(..., ge=0, title="Index of the Fibonacci number")) -> Response:
     try:
-        result = calculate_fibonacci_number(n)
-        return {'n': n, 'result': result}
+        body = _number_responses.get_or_build(n, lambda: _render_number(n))
+        return Response(content=body, media_type="application/json")
     except:
         raise HTTPException(status_code=400, detail=str())
 
+@router.post("/batch", response_model=Dict)
+def get_fibonacci_batch(request: FibonacciBatchRequest) -> Dict:
+    try:
+        results = calculate_fibonacci_batch(
+            request.indices,
+            [(r.start, r.stop) for r in request.ranges],
+            max_size=settings.MAX_BATCH_SIZE,
+        )
+        return {'results': results}
+    except InvalidFibonacciInputError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
 @router.get("/sequence", response_model=Dict)
 def get_sequence(limit: int = Query(..., ge=0, title="Maximum terms to return")) -> Dict:
     try:
@@ -3,6 +3,7 @@ import os
 class Settings:
     MAX_FIBONACCI_N: int
     MAX_SEQUENCE_LIMIT: int
+    MAX_BATCH_SIZE: int
 
     def __init__(self) -> None:
         try:
@@ -15,5 +16,10 @@ class Settings:
             self.MAX_SEQUENCE_LIMIT = int(val)
         except ValueError:
             self.MAX_SEQUENCE_LIMIT = 1000
+        try:
+            val = os.getenv('MAX_BATCH_SIZE', '10000').strip()
+            self.MAX_BATCH_SIZE = int(val)
+        except ValueError:
+            self.MAX_BATCH_SIZE = 10000
 
 settings = Settings()
\ No newline at end of file
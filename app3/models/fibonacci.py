@@ -1,5 +1,9 @@
+from typing import List
 from pydantic import BaseModel, conint
-from config import MAX_FIBONACCI_N, MAX_SEQUENCE_LIMIT
+from core.config import settings
+
+MAX_FIBONACCI_N = settings.MAX_FIBONACCI_N
+MAX_SEQUENCE_LIMIT = settings.MAX_SEQUENCE_LIMIT
 
 class FibonacciNumberRequest(BaseModel):
     """Request model for getting a Fibonacci number by index."""
@@ -7,4 +11,14 @@ class FibonacciNumberRequest(BaseModel):
 
 class FibonacciSequenceRequest(BaseModel):
     """Request model for getting a Fibonacci sequence up to a limit."""
-    limit: conint(ge=0, le=MAX_SEQUENCE_LIMIT)
\ No newline at end of file
+    limit: conint(ge=0, le=MAX_SEQUENCE_LIMIT)
+
+class FibonacciIndexRange(BaseModel):
+    """Half-open range of Fibonacci indices [start, stop)."""
+    start: conint(ge=0, le=MAX_FIBONACCI_N)
+    stop: conint(ge=0, le=MAX_FIBONACCI_N + 1)
+
+class FibonacciBatchRequest(BaseModel):
+    """Request model for evaluating many Fibonacci indices at once."""
+    indices: List[conint(ge=0, le=MAX_FIBONACCI_N)] = []
+    ranges: List[FibonacciIndexRange] = []
@@ -1,3 +1,10 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from fib_engine import fibonacci_number, fibonacci_many
+
+
 class InvalidFibonacciInputError(Exception):
     """Custom exception for invalid Fibonacci input."""
     pass
@@ -5,14 +12,37 @@ class InvalidFibonacciInputError(Exception):
 def calculate_fibonacci_number(n: int) -> int:
     if not isinstance(n, int) or n < 0:
         raise InvalidFibonacciInputError("n must be a non-negative integer.")
-    if n == 0:
-        return 0
-    elif n == 1:
-        return 1
-    a, b = 0, 1
-    for _ in range(2, n + 1):
-        a, b = b, a + b
-    return b
+    return fibonacci_number(n)
+
+def calculate_fibonacci_batch(indices: list, ranges: list = (), max_size: int = None) -> dict:
+    """
+    Evaluate Fibonacci numbers for a list of indices and half-open ranges.
+
+    All requested indices are merged and evaluated in one sorted pass, so
+    overlapping requests share work.
+
+    Args:
+        indices: Individual indices to evaluate
+        ranges: (start, stop) pairs, each expanding to indices start..stop-1
+        max_size: Upper bound on the total number of requested indices
+
+    Returns:
+        dict: Mapping of each distinct index to its Fibonacci number
+    """
+    total = len(indices)
+    for start, stop in ranges:
+        if start < 0 or stop < start:
+            raise InvalidFibonacciInputError("ranges must satisfy 0 <= start <= stop.")
+        total += stop - start
+    if max_size is not None and total > max_size:
+        raise InvalidFibonacciInputError(f"batch must request at most {max_size} indices.")
+    if any(not isinstance(n, int) or n < 0 for n in indices):
+        raise InvalidFibonacciInputError("indices must be non-negative integers.")
+
+    wanted = set(indices)
+    for start, stop in ranges:
+        wanted.update(range(start, stop))
+    return fibonacci_many(wanted)
 
 def calculate_fibonacci_sequence(limit: int) -> list:
     if not isinstance(limit, int) or limit < 0:
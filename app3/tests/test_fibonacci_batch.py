@@ -0,0 +1,23 @@
+from fastapi.testclient import TestClient
+from http import HTTPStatus
+from typing import Any, Dict
+
+from main import app
+
+client = TestClient(app)
+
+BATCH_URL = "/api/v1/fibonacci/batch"
+
+def test_get_fibonacci_batch_valid() -> None:
+    """Test batch request mixing indices and ranges."""
+    payload = {"indices": [10, 3, 10], "ranges": [{"start": 0, "stop": 4}]}
+    response: Any = client.post(BATCH_URL, json=payload)
+    assert response.status_code == HTTPStatus.OK
+    data: Dict[str, Dict[str, int]] = response.json()
+    assert data == {"results": {"0": 0, "1": 1, "2": 1, "3": 2, "10": 55}}
+
+def test_get_fibonacci_batch_inverted_range() -> None:
+    """Test batch request with stop < start."""
+    payload = {"ranges": [{"start": 5, "stop": 2}]}
+    response: Any = client.post(BATCH_URL, json=payload)
+    assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,73 @@
+"""
+Micro-benchmark: single-pass code_blocks.extract_code vs the old regex cascade.
+
+Usage:
+    python bench_code_blocks.py [response files...]
+
+Recorded model responses can be passed as files. Without arguments,
+responses shaped like our long completions are synthesized at several sizes
+(prose with inline code, optionally a shell snippet, then the code block,
+sometimes truncated). "same" shows whether both pipelines returned the same
+text; the legacy cascade returns the shell snippet or an inline span when
+one comes first.
+"""
+import random
+import re
+import sys
+import timeit
+
+from code_blocks import extract_code
+
+_LEGACY_PATTERNS = [
+    r'```(?:json|python|javascript|typescript|java|csharp|go|rust|php|ruby|html|css)?\s*\n?(.*?)\n?```',
+    r'`([^`]+)`',
+    r'<code[^>]*>(.*?)</code>',
+    r'<pre[^>]*>(.*?)</pre>'
+]
+
+
+def legacy_clean_code_response(text):
+    """The previous extract_content_from_markers + clean_code_response pipeline."""
+    cleaned = text.strip()
+    for pattern in _LEGACY_PATTERNS:
+        match = re.search(pattern, text, re.DOTALL)
+        if match:
+            cleaned = match.group(1).strip()
+            break
+    cleaned = re.sub(r'^```\w*\s*', '', cleaned, flags=re.MULTILINE)
+    cleaned = re.sub(r'```$', '', cleaned, flags=re.MULTILINE)
+    cleaned = re.sub(r'</?code>|</?pre>', '', cleaned)
+    return cleaned.strip()
+
+
+def synthesize_response(code_lines, truncated=False, shell_snippet=True, seed=0):
+    rng = random.Random(seed)
+    prose = " ".join(rng.choice(["the", "handler", "`config`", "returns", "a", "`dict`", "value"])
+                     for _ in range(code_lines * 4))
+    code = "\n".join(f"    result_{i} = compute(data[{i}], limit={i})  # step {i}" for i in range(code_lines))
+    response = f"{prose}\n\n"
+    if shell_snippet:
+        response += "Install with:\n```bash\npip install fastapi\n```\n\n"
+    response += f"```python\ndef handler(data):\n{code}\n    return result_0\n"
+    return response if truncated else response + "```\n\nThat's it."
+
+
+def main(paths):
+    if paths:
+        cases = [(path, open(path, encoding="utf-8").read()) for path in paths]
+    else:
+        cases = [(f"{lines} lines{', shell' if shell else ''}{', truncated' if truncated else ''}",
+                  synthesize_response(lines, truncated, shell))
+                 for lines in (100, 1000, 10000) for shell in (False, True) for truncated in (False, True)]
+
+    print(f"{'response':<32}{'size':>10}{'legacy ms':>12}{'single-pass ms':>16}{'speedup':>9}  same")
+    for name, text in cases:
+        number = max(1, 200000 // max(len(text), 1))
+        legacy = timeit.timeit(lambda: legacy_clean_code_response(text), number=number) / number
+        new = timeit.timeit(lambda: extract_code(text, "python"), number=number) / number
+        same = legacy_clean_code_response(text) == extract_code(text, "python")
+        print(f"{name:<32}{len(text):>10}{legacy * 1e3:>12.3f}{new * 1e3:>16.3f}{legacy / new:>8.1f}x  {same}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,214 @@
+"""
+Single-pass extraction of code spans from model responses.
+
+scan_code_spans walks a response once, left to right, and returns every
+fenced (``` or ~~~) block and every HTML <pre>/<code> block with its
+language tag. Markers are located with str.find cursors that only move
+forward, and each span's closer search resumes where its opener ended, so
+the scan is O(n) with no per-position regex attempts. extract_code
+then picks the span that best fits the requested content type instead of
+whichever pattern happens to match first.
+"""
+import html
+import re
+from typing import List, NamedTuple, Optional
+
+# Tags that never hold the code we are asked for
+_NON_CODE_LANGUAGES = {"text", "txt", "plaintext", "console", "output", "bash", "sh", "shell", "log"}
+_LANGUAGE_ALIASES = {
+    "py": "python", "python3": "python", "js": "javascript", "node": "javascript",
+    "ts": "typescript", "cs": "csharp", "c#": "csharp", "golang": "go", "rs": "rust", "rb": "ruby",
+}
+
+# Fence markers are located with str.find, HTML openers with a literal-prefixed regex
+_FENCE_MARKERS = ("```", "~~~")
+_HTML_MARKER = re.compile(r"<(?:[pP][rR][eE]|[cC][oO][dD][eE])")
+_FENCE_LINE = re.compile(r"[ \t]{0,3}(`{3,}|~{3,})[ \t]*([^\n`]*)$", re.MULTILINE)
+_HTML_OPENER = re.compile(r"<(pre|code)\b([^>]*)>", re.IGNORECASE)
+_HTML_CLOSE_TAIL = re.compile(r"\s*>")
+_CLASS_LANGUAGE = re.compile(r"""class\s*=\s*["'][^"']*?\b(?:language|lang)-([\w+#-]+)""", re.IGNORECASE)
+_INNER_CODE = re.compile(r"^\s*<code\b([^>]*)>(.*?)</code>\s*$", re.DOTALL | re.IGNORECASE)
+
+
+class CodeSpan(NamedTuple):
+    content: str
+    language: str
+    kind: str       # "fence" or "html"
+    start: int
+    end: int
+    closed: bool    # False if the response ended before the closing marker
+
+
+def _normalize_language(tag: str) -> str:
+    tag = tag.strip().lower()
+    return _LANGUAGE_ALIASES.get(tag, tag)
+
+
+def _line_start(text: str, pos: int) -> int:
+    """Return where the line holding pos starts if only 0-3 spaces/tabs precede pos, else -1."""
+    start = text.rfind("\n", max(pos - 4, 0), pos) + 1
+    if start == 0 and pos > 3:
+        return -1
+    return start if text[start:pos].strip(" \t") == "" else -1
+
+
+def _find_fence_close(text: str, fence: str, pos: int):
+    """Find a line holding only fence characters (at least as many as fence), from pos."""
+    while True:
+        at = text.find(fence, pos)
+        if at < 0:
+            return None
+        line_end = text.find("\n", at)
+        if line_end < 0:
+            line_end = len(text)
+        if _line_start(text, at) >= 0 and text[at:line_end].rstrip(" \t\r").strip(fence[0]) == "":
+            return _line_start(text, at), line_end
+        pos = at + len(fence)
+
+
+def _find_html_close(text: str, tag: str, pos: int):
+    """Find </tag> (lower or upper case, optional whitespace before >) from pos."""
+    while True:
+        hits = [at for at in (text.find(f"</{tag}", pos), text.find(f"</{tag.upper()}", pos)) if at >= 0]
+        if not hits:
+            return None
+        at = min(hits)
+        tail = _HTML_CLOSE_TAIL.match(text, at + len(tag) + 2)
+        if tail:
+            return at, tail.end()
+        pos = at + 1
+
+
+def scan_code_spans(text: str) -> List[CodeSpan]:
+    """
+    Return all fenced and HTML code spans in a response, in order.
+
+    Args:
+        text: Raw model response
+
+    Returns:
+        List of CodeSpan. Unclosed spans (truncated responses) run to the end
+        of the text. A fence may open after prose on the same line, but must
+        close on a line of its own. Inline `code` spans are ignored.
+    """
+    spans = []
+    length = len(text)
+    # Next occurrence of each marker; each cursor only moves forward
+    next_at = {marker: text.find(marker) for marker in _FENCE_MARKERS}
+    next_at["<"] = -1
+    html_marker = _HTML_MARKER.search(text)
+    if html_marker:
+        next_at["<"] = html_marker.start()
+    pos = 0
+    while True:
+        for marker, at in next_at.items():
+            if 0 <= at < pos:
+                if marker == "<":
+                    html_marker = _HTML_MARKER.search(text, pos)
+                    next_at[marker] = html_marker.start() if html_marker else -1
+                else:
+                    next_at[marker] = text.find(marker, pos)
+        hits = [(at, marker) for marker, at in next_at.items() if at >= 0]
+        if not hits:
+            return spans
+        at, marker = min(hits)
+
+        if marker[0] in "`~":
+            line_start = _line_start(text, at)
+            if line_start < 0:
+                # A fence opened after prose on the same line ("Here it is: ```python")
+                line_start = at
+            opener = _FENCE_LINE.match(text, line_start)
+            if opener is None:
+                # Inline backticks, or a fence closed on the same line
+                pos = at + len(marker)
+                while pos < length and text[pos] == marker[0]:
+                    pos += 1
+                continue
+            fence = opener.group(1)
+            info = opener.group(2).split()
+            language = _normalize_language(info[0]) if info else ""
+            body_start = min(opener.end() + 1, length)
+            close = _find_fence_close(text, fence, body_start)
+            body_end, end = close if close else (length, length)
+            content = text[body_start:body_end]
+            if content.endswith("\n"):
+                content = content[:-1]
+            spans.append(CodeSpan(content, language, "fence", line_start, end, close is not None))
+        else:
+            opener = _HTML_OPENER.match(text, at)
+            if opener is None:
+                pos = at + 1
+                continue
+            tag = opener.group(1).lower()
+            body_start = opener.end()
+            close = _find_html_close(text, tag, body_start)
+            body_end, end = close if close else (length, length)
+            attrs = opener.group(2)
+            content = text[body_start:body_end]
+            if tag == "pre":
+                # <pre><code class="language-x">...</code></pre>
+                inner = _INNER_CODE.match(content)
+                if inner:
+                    attrs, content = attrs + " " + inner.group(1), inner.group(2)
+            class_language = _CLASS_LANGUAGE.search(attrs)
+            language = _normalize_language(class_language.group(1)) if class_language else ""
+            spans.append(CodeSpan(html.unescape(content), language, "html", at, end, close is not None))
+        pos = max(end, at + 1)
+
+
+def _score(span: CodeSpan, content_type: str) -> tuple:
+    content = span.content.strip()
+    if content_type == "json":
+        fits = span.language == "json" or content[:1] in ("{", "[")
+        return (fits, span.language == "json", span.closed, len(content))
+    wanted = _normalize_language(content_type)
+    return (
+        span.language == wanted,
+        span.language not in _NON_CODE_LANGUAGES and span.language != "json",
+        span.closed,
+        len(content),
+    )
+
+
+def select_code_span(spans: List[CodeSpan], content_type: str = "code") -> Optional[CodeSpan]:
+    """
+    Pick the span that best matches the requested content type.
+
+    For "json", spans tagged json or starting with { or [ win. Otherwise
+    content_type may be a language name ("python") or "code": spans tagged
+    with that language win, then spans with any programming-language tag.
+    Closed spans beat truncated ones and longer spans beat shorter ones.
+    HTML spans are ignored when HTML itself is requested.
+
+    Args:
+        spans: Spans from scan_code_spans
+        content_type: "json", "code" or a language name
+
+    Returns:
+        The best CodeSpan, or None if spans is empty
+    """
+    content_type = content_type.lower()
+    if _normalize_language(content_type) == "html":
+        # <pre>/<code> tags are part of generated HTML, not markers around it
+        spans = [span for span in spans if span.kind != "html"]
+    if not spans:
+        return None
+    return max(spans, key=lambda span: _score(span, content_type))
+
+
+def extract_code(text: str, content_type: str = "code") -> str:
+    """
+    Extract the best non-empty code span from a response, or the whole
+    response if there is none.
+
+    Args:
+        text: Raw model response
+        content_type: "json", "code" or a language name
+
+    Returns:
+        The selected span's content, stripped
+    """
+    spans = [span for span in scan_code_spans(text) if span.content.strip()]
+    span = select_code_span(spans, content_type)
+    return (span.content if span is not None else text).strip()
@@ -1,21 +1,125 @@
+import argparse
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from PyPDF2 import PdfReader, PdfWriter
 
-def split_pdf(input_path, output_dir="pdf"):
+def parse_ranges(spec):
+    """
+    Parse a page range spec like "1-3,5,9-17" into (start, end) tuples.
+    Page numbers are 1-based and inclusive. Open ranges such as "5-" are
+    rejected; check_ranges checks the ranges against the PDF's page count.
+    """
+    ranges = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        start, dash, end = (piece.strip() for piece in part.partition("-"))
+        if not start.isdigit() or (dash and not end.isdigit()):
+            raise ValueError(f"Invalid page range {part!r}. Use a page (5) or a closed range (5-9).")
+        start = int(start)
+        end = int(end) if dash else start
+        if start < 1 or start > end:
+            raise ValueError(f"Invalid page range {part!r}.")
+        ranges.append((start, end))
+    return ranges
+
+def check_ranges(jobs, total_pages):
+    """Raise ValueError if any (start_page, end_page, ...) job lies outside the PDF."""
+    for start_page, end_page, *_ in jobs:
+        if start_page < 1 or end_page > total_pages or start_page > end_page:
+            raise ValueError(f"Invalid page range {start_page}-{end_page}. PDF has {total_pages} pages.")
+
+def write_ranges(source, jobs):
+    """
+    Write each (start_page, end_page, output_path) job from one reader.
+    source is a path or an already open PdfReader; either way the PDF is
+    read once for the whole batch, not once per range, and every range is
+    checked against its page count before anything is written.
+    Returns the number of pages written.
+    """
+    reader = source if isinstance(source, PdfReader) else PdfReader(source)
+    check_ranges(jobs, len(reader.pages))
+    pages = 0
+    for start_page, end_page, output_path in jobs:
+        writer = PdfWriter()
+        for i in range(start_page - 1, end_page):  # 0-based indexing
+            writer.add_page(reader.pages[i])
+        with open(output_path, "wb") as f:
+            writer.write(f)
+        pages += end_page - start_page + 1
+    return pages
+
+def _batch_jobs(jobs, num_batches):
+    # Deal jobs out largest-first so every batch gets a similar page count
+    batches = [[] for _ in range(num_batches)]
+    sizes = [0] * num_batches
+    for job in sorted(jobs, key=lambda job: job[1] - job[0], reverse=True):
+        i = sizes.index(min(sizes))
+        batches[i].append(job)
+        sizes[i] += job[1] - job[0] + 1
+    return [batch for batch in batches if batch]
+
+def split_pdf(input_path, output_dir="pdf", ranges=None, workers=None):
+    """
+    Split a PDF into one file per page, or one file per page range.
+
+    The parent opens the PDF once and checks every range against its page
+    count before any file is written, so a bad range never leaves a partial
+    output directory. With one worker that reader writes every range. With
+    more, ranges are fanned out across a process pool: each worker opens the
+    source itself and writes a balanced batch of ranges, so no PDF objects
+    cross process boundaries and the input is read once per worker rather
+    than once per range.
+
+    Output files are named "<page>.pdf" for single pages and
+    "<start>-<end>.pdf" for ranges (e.g. "2-5.pdf").
+    """
     # Make output directory if not exists
     os.makedirs(output_dir, exist_ok=True)
 
     reader = PdfReader(input_path)
+    total_pages = len(reader.pages)
+    if ranges is None:
+        ranges = [(i, i) for i in range(1, total_pages + 1)]
+    elif isinstance(ranges, str):
+        ranges = parse_ranges(ranges)
+    check_ranges(ranges, total_pages)
 
-    for i, page in enumerate(reader.pages, start=1):
-        writer = PdfWriter()
-        writer.add_page(page)
+    jobs = []
+    for start_page, end_page in ranges:
+        name = f"{start_page}.pdf" if start_page == end_page else f"{start_page}-{end_page}.pdf"
+        jobs.append((start_page, end_page, os.path.join(output_dir, name)))
 
-        output_path = os.path.join(output_dir, f"{i}.pdf")
-        with open(output_path, "wb") as f:
-            writer.write(f)
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    started = time.perf_counter()
+    if workers <= 1:
+        pages = write_ranges(reader, jobs)
+        for _, _, output_path in jobs:
+            print(f"Saved: {output_path}")
+    else:
+        pages = 0
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(write_ranges, input_path, batch): batch
+                for batch in _batch_jobs(jobs, workers)
+            }
+            for future in as_completed(futures):
+                pages += future.result()
+                for _, _, output_path in futures[future]:
+                    print(f"Saved: {output_path}")
+    elapsed = time.perf_counter() - started
 
-        print(f"Saved: {output_path}")
+    written_mb = sum(os.path.getsize(job[2]) for job in jobs) / 1e6
+    print(f"Wrote {len(jobs)} files ({pages} pages, {written_mb:.1f} MB) in {elapsed:.2f}s "
+          f"with {workers} worker(s): {pages / elapsed:.1f} pages/s, {written_mb / elapsed:.1f} MB/s")
 
 if __name__ == "__main__":
-    split_pdf("input.pdf")
+    parser = argparse.ArgumentParser(description="Split a PDF into pages or page ranges.")
+    parser.add_argument("input", nargs="?", default="input.pdf")
+    parser.add_argument("--output-dir", default="pdf")
+    parser.add_argument("--ranges", help='Page ranges such as "1-3,5,9-17" (default: every page)')
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+    split_pdf(args.input, args.output_dir, ranges=args.ranges, workers=args.workers)
@@ -1,27 +1,15 @@
 import os
-from PyPDF2 import PdfReader, PdfWriter
+from d import write_ranges
 
 def extract_pages(input_path, start_page, end_page, output_path="output.pdf"):
     """
     Extracts pages from start_page to end_page (inclusive)
     and saves them into a single PDF file.
     Page numbers are 1-based.
+    For several ranges at once, use d.split_pdf(input_path, ranges="2-5,9-17").
     """
-    reader = PdfReader(input_path)
-    writer = PdfWriter()
-
-    # Validate page range
-    total_pages = len(reader.pages)
-    if start_page < 1 or end_page > total_pages or start_page > end_page:
-        raise ValueError(f"Invalid page range. PDF has {total_pages} pages.")
-
-    # Add selected pages
-    for i in range(start_page - 1, end_page):  # 0-based indexing
-        writer.add_page(reader.pages[i])
-
-    # Write output
-    with open(output_path, "wb") as f:
-        writer.write(f)
+    # Validate the page range and write the selected pages from one reader
+    write_ranges(input_path, [(start_page, end_page, output_path)])
 
     print(f"Saved: {output_path} (Pages {start_page} to {end_page})")
 
@@ -0,0 +1,317 @@
+"""
+Shared Fibonacci engine
+
+This module backs the Fibonacci services in app1, app2 and app3. It provides:
+    - O(log n) fast-doubling for single terms
+    - A process-wide prefix table that grows on demand and serves sequences
+      by slicing
+    - An LRU cache of serialized responses for hot request parameters
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+# Largest number of terms kept in the process-wide prefix table. Terms past
+# this index are computed on the fly instead of being stored.
+PREFIX_TABLE_LIMIT: int = 20000
+
+# Gap between consecutive batch indices above which fibonacci_many jumps from
+# the previous anchor with fast doubling instead of walking term by term.
+BATCH_WALK_LIMIT: int = 1024
+
+# Default bounds for ResponseCache
+DEFAULT_CACHE_SIZE: int = 256
+DEFAULT_CACHE_BYTES: int = 64 * 1024 * 1024
+
+
+def fib_pair(n: int) -> Tuple[int, int]:
+    """
+    Compute the pair (F(n), F(n + 1)) using fast doubling.
+
+    Uses the identities F(2k) = F(k) * (2F(k+1) - F(k)) and
+    F(2k+1) = F(k)^2 + F(k+1)^2, walking the bits of n from the most
+    significant one, so only O(log n) big-integer multiplications are needed.
+
+    Args:
+        n: Index of the first term of the pair (non-negative integer)
+
+    Returns:
+        Tuple[int, int]: F(n) and F(n + 1)
+
+    Raises:
+        ValueError: If n is negative
+    """
+    if n < 0:
+        raise ValueError("n must be a non-negative integer")
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if bit == "1":
+            a, b = d, c + d
+        else:
+            a, b = c, d
+    return a, b
+
+
+class _PrefixTable:
+    """
+    Append-only table of F(0), F(1), ... shared by every request in the process.
+
+    Growth happens under a lock; readers slice the underlying list without
+    locking since terms are only ever appended.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self._terms: List[int] = [0, 1]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def ensure(self, stop: int) -> List[int]:
+        """
+        Grow the table to hold at least min(stop, limit) terms.
+
+        Args:
+            stop: Number of leading terms the caller needs
+
+        Returns:
+            List[int]: The shared term list (must not be mutated by callers)
+        """
+        terms = self._terms
+        target = min(stop, self.limit)
+        if len(terms) >= target:
+            return terms
+        with self._lock:
+            a, b = terms[-2], terms[-1]
+            while len(terms) < target:
+                a, b = b, a + b
+                terms.append(b)
+        return terms
+
+
+_table = _PrefixTable(PREFIX_TABLE_LIMIT)
+
+
+def fibonacci_number(n: int) -> int:
+    """
+    Return F(n), served from the prefix table when it is already cached.
+
+    Args:
+        n: Index of the Fibonacci number (non-negative integer)
+
+    Returns:
+        int: The n-th Fibonacci number (F(0) = 0, F(1) = 1)
+
+    Raises:
+        ValueError: If n is negative
+    """
+    if n < 0:
+        raise ValueError("n must be a non-negative integer")
+    terms = _table.ensure(0)
+    if n < len(terms):
+        return terms[n]
+    return fib_pair(n)[0]
+
+
+def iter_fibonacci(start: int, count: int) -> Iterator[int]:
+    """
+    Lazily yield F(start), F(start + 1), ... for count terms.
+
+    Terms inside the prefix table are read from it; the remainder is walked
+    from a seeded pair rather than from zero.
+
+    Args:
+        start: Index of the first term (non-negative integer)
+        count: Number of terms to yield (non-negative integer)
+
+    Yields:
+        int: Consecutive Fibonacci numbers
+
+    Raises:
+        ValueError: If start or count is negative
+    """
+    if start < 0 or count < 0:
+        raise ValueError("start and count must be non-negative integers")
+    stop = start + count
+    terms = _table.ensure(stop)
+    cached = len(terms)
+    index = start
+    while index < stop and index < cached:
+        yield terms[index]
+        index += 1
+    if index >= stop:
+        return
+    a, b = fib_pair(index)
+    while index < stop:
+        yield a
+        a, b = b, a + b
+        index += 1
+
+
+def fibonacci_sequence(count: int, start: int = 0) -> List[int]:
+    """
+    Return the list [F(start), ..., F(start + count - 1)].
+
+    Args:
+        count: Number of terms to return (non-negative integer)
+        start: Index of the first term (default=0)
+
+    Returns:
+        List[int]: The requested slice of the Fibonacci sequence
+
+    Raises:
+        ValueError: If start or count is negative
+    """
+    if start < 0 or count < 0:
+        raise ValueError("start and count must be non-negative integers")
+    stop = start + count
+    terms = _table.ensure(stop)
+    if stop <= len(terms):
+        return terms[start:stop]
+    return list(iter_fibonacci(start, count))
+
+
+def fibonacci_many(indices: Iterable[int]) -> Dict[int, int]:
+    """
+    Evaluate F(n) for many indices in a single sorted pass.
+
+    Indices inside the prefix table are read from it. The rest are visited in
+    ascending order, each one derived from the previous result (the anchor):
+    short gaps are walked term by term, long gaps jump with the addition
+    formula F(i + g) = F(i) * F(g - 1) + F(i + 1) * F(g), so only a
+    fast-doubling of the gap g is needed rather than of the full index.
+
+    Args:
+        indices: Indices to evaluate; duplicates are allowed
+
+    Returns:
+        Dict[int, int]: Mapping of each distinct index to its Fibonacci number
+
+    Raises:
+        ValueError: If any index is negative
+    """
+    wanted = sorted(set(indices))
+    if not wanted:
+        return {}
+    if wanted[0] < 0:
+        raise ValueError("indices must be non-negative integers")
+
+    terms = _table.ensure(wanted[-1] + 1)
+    # Other threads may append to terms concurrently, so index from this
+    # snapshot of its length rather than from the end
+    cached = len(terms)
+    # Anchor (i, F(i), F(i + 1)) starts at the last cached term
+    i, a, b = cached - 1, terms[cached - 1], terms[cached - 1] + terms[cached - 2]
+    results: Dict[int, int] = {}
+    for n in wanted:
+        if n < cached:
+            results[n] = terms[n]
+            continue
+        gap = n - i
+        if gap > BATCH_WALK_LIMIT:
+            fg, fg1 = fib_pair(gap)
+            a, b = a * (fg1 - fg) + b * fg, a * fg + b * fg1
+        else:
+            for _ in range(gap):
+                a, b = b, a + b
+        i = n
+        results[n] = a
+    return results
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of serialized response bodies.
+
+    Entries are evicted least-recently-used first once either the entry
+    count or the total payload size exceeds its bound. Bodies larger than
+    the byte budget are returned but never stored.
+
+    Args:
+        maxsize: Maximum number of cached responses
+        max_bytes: Maximum combined size of cached responses in bytes
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE,
+                 max_bytes: int = DEFAULT_CACHE_BYTES) -> None:
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """
+        Return the cached body for key, or None on a miss.
+
+        Args:
+            key: Cache key (typically the request parameters)
+
+        Returns:
+            Optional[bytes]: The serialized response body if cached
+        """
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key: Hashable, body: bytes) -> None:
+        """
+        Store body under key, evicting least-recently-used entries as needed.
+
+        Args:
+            key: Cache key (typically the request parameters)
+            body: Serialized response body
+        """
+        if len(body) > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = body
+            self._size += len(body)
+            while len(self._entries) > self.maxsize or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def get_or_build(self, key: Hashable, build: Callable[[], bytes]) -> bytes:
+        """
+        Return the cached body for key, building and storing it on a miss.
+
+        The builder runs outside the lock so a slow miss does not block hits.
+
+        Args:
+            key: Cache key (typically the request parameters)
+            build: Zero-argument callable producing the serialized body
+
+        Returns:
+            bytes: The serialized response body
+        """
+        body = self.get(key)
+        if body is None:
+            body = build()
+            self.put(key, body)
+        return body
+
+    def clear(self) -> None:
+        """Drop every cached response and reset the hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
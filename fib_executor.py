@@ -0,0 +1,100 @@
+"""
+Compute executor for the Fibonacci services
+
+Keeps CPU-bound big-integer work off the asyncio event loop:
+    - Requests at or above a size threshold run in a process pool
+    - Concurrent requests for the same key share one computation (single-flight)
+    - A bound on queued computations rejects new work instead of letting
+      latency grow without limit
+"""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+
+# Requests smaller than this are computed inline on the event loop
+DEFAULT_OFFLOAD_THRESHOLD: int = 2000
+
+# Maximum number of computations queued or running in the pool
+DEFAULT_MAX_PENDING: int = 32
+
+
+class ExecutorOverloadedError(Exception):
+    """Raised when the compute queue is full and new work is rejected."""
+
+    def __init__(self, pending: int):
+        self.pending = pending
+        super().__init__(f"Compute queue is full ({pending} computations pending)")
+
+
+class ComputeExecutor:
+    """
+    Dispatches Fibonacci computations to a process pool with single-flight.
+
+    The pool is created lazily on first offload so importing this module or
+    serving only small requests never forks workers.
+
+    Args:
+        threshold: Minimum request size dispatched to the process pool
+        max_pending: Maximum number of distinct computations in flight
+        max_workers: Process pool size (defaults to the CPU count)
+    """
+
+    def __init__(self, threshold: int = DEFAULT_OFFLOAD_THRESHOLD,
+                 max_pending: int = DEFAULT_MAX_PENDING,
+                 max_workers: Optional[int] = None) -> None:
+        self.threshold = threshold
+        self.max_pending = max_pending
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._inflight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+    @property
+    def pending(self) -> int:
+        """Number of distinct computations queued or running in the pool."""
+        return len(self._inflight)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    async def run(self, key: Hashable, size: int, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run func(*args), offloading and coalescing it when size is large.
+
+        Args:
+            key: Identity of the computation; concurrent calls with the same
+                key await a single shared result
+            size: Cost estimate compared against the offload threshold
+            func: Picklable module-level callable performing the work
+            *args: Picklable arguments passed to func
+
+        Returns:
+            Any: The value returned by func
+
+        Raises:
+            ExecutorOverloadedError: If max_pending computations are already
+                in flight and key is not one of them
+        """
+        shared = self._inflight.get(key)
+        if shared is not None:
+            return await asyncio.shield(shared)
+
+        if size < self.threshold:
+            return func(*args)
+
+        if len(self._inflight) >= self.max_pending:
+            raise ExecutorOverloadedError(len(self._inflight))
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._get_pool(), func, *args)
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so a cancelled caller does not cancel the shared computation
+        return await asyncio.shield(future)
+
+    def shutdown(self) -> None:
+        """Stop the process pool, cancelling computations that have not started."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
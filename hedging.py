@@ -0,0 +1,188 @@
+"""
+Hedged requests for slow model calls.
+
+A hedged call starts the primary attempt and, if it has not finished after
+a dynamic percentile of recently observed latencies for that model, starts
+one duplicate attempt (e.g. on another API key). The first attempt to
+succeed wins and the other is told to stop through its CancelToken. The
+fraction of calls allowed to hedge is capped so hedging cannot more than
+slightly increase load on the provider, and when every worker thread is
+busy calls run unhedged in the caller's thread instead of queueing.
+"""
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_PERCENTILE = 95.0
+DEFAULT_MIN_SAMPLES = 10
+DEFAULT_MIN_DELAY = 5.0
+DEFAULT_BUDGET = 0.1
+DEFAULT_WINDOW = 200
+
+
+class CancelToken(threading.Event):
+    """
+    Event set when an attempt has lost and should stop.
+
+    Callbacks registered with add_callback run once when the token is set, so
+    an attempt blocked in a read can have its connection closed from outside
+    instead of noticing the cancellation only between reads.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._callbacks: List[Callable[[], None]] = []
+        self._callback_lock = threading.Lock()
+
+    def add_callback(self, callback: Callable[[], None]) -> None:
+        """Run callback when the token is set, or now if it already is."""
+        with self._callback_lock:
+            if not self.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def set(self) -> None:
+        with self._callback_lock:
+            if self.is_set():
+                return
+            super().set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                # Aborting a loser is best effort and must not fail the winner
+                pass
+
+
+class HedgePolicy:
+    def __init__(self, percentile: float = DEFAULT_PERCENTILE, min_samples: int = DEFAULT_MIN_SAMPLES,
+                 min_delay: float = DEFAULT_MIN_DELAY, budget: float = DEFAULT_BUDGET,
+                 window: int = DEFAULT_WINDOW, max_workers: int = 8):
+        """
+        Decide when to hedge and run hedged calls.
+
+        Args:
+            percentile: Latency percentile (per model) after which a hedge is sent
+            min_samples: Observed latencies needed before a model is hedged at all
+            min_delay: Never hedge earlier than this many seconds
+            budget: Maximum fraction of recent calls that may send a hedge
+            window: Number of recent latencies and calls the policy remembers
+            max_workers: Threads available for in-flight attempts; when all are
+                busy, calls run unhedged in the caller's thread
+        """
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.budget = budget
+        self._latencies: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        self._hedged: Deque[bool] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedge")
+
+    def hedge_delay(self, key: str) -> Optional[float]:
+        """Seconds to wait before hedging a call for key, or None while too few samples exist."""
+        with self._lock:
+            samples = sorted(self._latencies[key])
+        if len(samples) < self.min_samples:
+            return None
+        index = min(int(len(samples) * self.percentile / 100.0), len(samples) - 1)
+        return max(samples[index], self.min_delay)
+
+    def record_latency(self, key: str, seconds: float) -> None:
+        """Add an observed attempt latency (or a lower bound on one) for key."""
+        with self._lock:
+            self._latencies[key].append(seconds)
+
+    def _acquire_hedge(self) -> bool:
+        with self._lock:
+            # The call being decided counts toward the window
+            allowed = sum(self._hedged) + 1 <= self.budget * (len(self._hedged) + 1)
+            self._hedged.append(allowed)
+            return allowed
+
+    def _record_unhedged(self) -> None:
+        with self._lock:
+            self._hedged.append(False)
+
+    def _start(self, attempt: Callable[[int, CancelToken], T], index: int, cancel: CancelToken,
+               started: Dict[int, float]) -> Future:
+        """Submit an attempt on a worker slot the caller has already acquired."""
+        def timed():
+            try:
+                started[index] = time.monotonic()
+                result = attempt(index, cancel)
+                return result, time.monotonic() - started[index]
+            finally:
+                self._slots.release()
+        return self._pool.submit(timed)
+
+    def run(self, key: str, attempt: Callable[[int, CancelToken], T]) -> T:
+        """
+        Run attempt(0, cancel) and, if it is slow, a hedge attempt(1, cancel).
+
+        The latency of every attempt that succeeds is recorded. A loser that is
+        cancelled records how long it had run, a lower bound on its latency, so
+        the hedge delay is not learned from the fastest attempts alone.
+
+        Args:
+            key: Latency bucket, normally the model name
+            attempt: Callable taking the attempt index (0 primary, 1 hedge) and a
+                CancelToken that is set when the attempt lost and should stop
+
+        Returns:
+            The result of the first attempt to succeed
+
+        Raises:
+            Exception: The last attempt's error if every attempt failed
+        """
+        cancels = [CancelToken(), CancelToken()]
+        started: Dict[int, float] = {}
+        if not self._slots.acquire(blocking=False):
+            # Every worker is busy: do not queue, run unhedged in this thread
+            self._record_unhedged()
+            begin = time.monotonic()
+            result = attempt(0, cancels[0])
+            self.record_latency(key, time.monotonic() - begin)
+            return result
+        futures = [self._start(attempt, 0, cancels[0], started)]
+
+        delay = self.hedge_delay(key)
+        if delay is None:
+            self._record_unhedged()
+        else:
+            done, _ = wait(futures, timeout=delay)
+            if done or not self._slots.acquire(blocking=False):
+                self._record_unhedged()
+            elif self._acquire_hedge():
+                futures.append(self._start(attempt, 1, cancels[1], started))
+            else:
+                self._slots.release()
+
+        pending = set(futures)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result, latency = future.result()
+                except Exception as exc:
+                    error = exc
+                    continue
+                now = time.monotonic()
+                for index, other in enumerate(futures):
+                    if other is future or other.done():
+                        continue
+                    cancels[index].set()
+                    if index in started:
+                        # Censored sample: the loser would have taken at least this long
+                        self.record_latency(key, now - started[index])
+                self.record_latency(key, latency)
+                return result
+        raise error
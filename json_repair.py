@@ -0,0 +1,267 @@
+"""
+Tolerant parsing of model-generated JSON task lists.
+
+Models often return almost-valid JSON: arrays cut off mid-element, single
+quotes, raw newlines inside strings, Python literals, trailing commas or a
+closing line of prose. parse_json_array recovers every complete element it
+can instead of failing the whole response, so callers only need to ask the
+model again for what is actually missing.
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# Fields of a decomposed task and the type each must have when present
+TASK_SCHEMA = {
+    "name": str,
+    "description": str,
+    "subtasks_necessary": bool,
+    "function_name": str,
+    "parameters": dict,
+    "return_type": str,
+    "file_path": str,
+    "language": str,
+    "framework": str,
+    "implementation_details": dict,
+}
+REQUIRED_TASK_FIELDS = ("name", "description")
+
+_THINK_BLOCK = re.compile(r"<think>.*?(?:</think>|$)", re.DOTALL)
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?")
+_WORD = re.compile(r"[A-Za-z_$][\w$-]*")
+_LITERALS = {"true": True, "false": False, "null": None, "True": True, "False": False, "None": None}
+_ESCAPES = {'"': '"', "'": "'", "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+_STRING_SPECIALS = {'"': re.compile(r'["\\]'), "'": re.compile(r"['\\]")}
+_AFTER_STRING = set(",:}]")
+
+
+class JSONRepairError(ValueError):
+    """Raised when text cannot be repaired into JSON."""
+
+
+class _Truncated(Exception):
+    """The input ended in the middle of a value."""
+
+
+class _Parser:
+    def __init__(self, text: str, pos: int = 0):
+        self.text = text
+        self.pos = pos
+
+    def peek(self) -> str:
+        text, pos = self.text, self.pos
+        while pos < len(text) and text[pos].isspace():
+            pos += 1
+        self.pos = pos
+        if pos >= len(text):
+            raise _Truncated()
+        return text[pos]
+
+    def value(self) -> Any:
+        c = self.peek()
+        if c == "{":
+            return self.object()
+        if c == "[":
+            return self.array()
+        if c in "\"'":
+            return self.string()
+        match = _NUMBER.match(self.text, self.pos)
+        if match:
+            if match.end() == len(self.text):
+                raise _Truncated()
+            self.pos = match.end()
+            number = match.group()
+            return float(number) if any(ch in number for ch in ".eE") else int(number)
+        match = _WORD.match(self.text, self.pos)
+        if match and match.group() in _LITERALS:
+            self.pos = match.end()
+            return _LITERALS[match.group()]
+        if match and match.end() == len(self.text):
+            raise _Truncated()
+        raise JSONRepairError(f"Unexpected character {c!r} at position {self.pos}")
+
+    def object(self) -> Dict[str, Any]:
+        self.pos += 1
+        result = {}
+        while True:
+            c = self.peek()
+            if c == "}":
+                self.pos += 1
+                return result
+            if c == ",":
+                # Also skips trailing and doubled commas
+                self.pos += 1
+                continue
+            if c in "\"'":
+                key = self.string()
+            else:
+                match = _WORD.match(self.text, self.pos)
+                if not match:
+                    raise JSONRepairError(f"Expected key at position {self.pos}")
+                self.pos = match.end()
+                key = match.group()
+            if self.peek() != ":":
+                raise JSONRepairError(f"Expected ':' at position {self.pos}")
+            self.pos += 1
+            result[key] = self.value()
+
+    def array(self) -> List[Any]:
+        self.pos += 1
+        items = []
+        while True:
+            c = self.peek()
+            if c == "]":
+                self.pos += 1
+                return items
+            if c == ",":
+                self.pos += 1
+                continue
+            items.append(self.value())
+
+    def _hex_escape(self, pos: int) -> int:
+        """Return the code unit of the \\uXXXX escape starting at pos."""
+        digits = self.text[pos + 2:pos + 6]
+        if len(digits) < 4:
+            raise _Truncated()
+        try:
+            return int(digits, 16)
+        except ValueError:
+            raise JSONRepairError(f"Invalid \\u escape at position {pos}")
+
+    def string(self) -> str:
+        text = self.text
+        quote = text[self.pos]
+        specials = _STRING_SPECIALS[quote]
+        pos = self.pos + 1
+        chunks = []
+        while True:
+            match = specials.search(text, pos)
+            if match is None:
+                raise _Truncated()
+            chunks.append(text[pos:match.start()])
+            pos = match.start()
+            if text[pos] == "\\":
+                if pos + 1 >= len(text):
+                    raise _Truncated()
+                escape = text[pos + 1]
+                if escape == "u":
+                    code = self._hex_escape(pos)
+                    pos += 6
+                    if 0xD800 <= code < 0xDC00 and text.startswith("\\u", pos):
+                        # Combine a UTF-16 surrogate pair such as \uD83D\uDE00
+                        low = self._hex_escape(pos)
+                        if 0xDC00 <= low < 0xE000:
+                            code = 0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)
+                            pos += 6
+                    # Lone surrogates cannot be encoded as UTF-8
+                    chunks.append("\ufffd" if 0xD800 <= code < 0xE000 else chr(code))
+                elif escape in _ESCAPES:
+                    chunks.append(_ESCAPES.get(escape, escape))
+                    pos += 2
+                else:
+                    # Unknown escapes such as \d keep their backslash (Windows paths)
+                    chunks.append(text[pos:pos + 2])
+                    pos += 2
+                continue
+            # A quote only closes the string if JSON structure follows it;
+            # otherwise it is an unescaped quote inside the text
+            after = pos + 1
+            while after < len(text) and text[after].isspace():
+                after += 1
+            if after >= len(text) or text[after] in _AFTER_STRING:
+                self.pos = pos + 1
+                # Raw newlines and tabs inside the string are kept as characters
+                return "".join(chunks)
+            chunks.append(quote)
+            pos += 1
+
+
+def parse_json_array(text: str) -> Tuple[List[Any], bool]:
+    """
+    Recover the longest valid prefix of the first JSON array in a model response.
+
+    Leading prose, markdown fences and <think> blocks are skipped, and anything
+    after the closing bracket is ignored. Single quotes, raw control characters
+    in strings, Python literals, unquoted keys, missing or trailing commas and
+    unescaped inner quotes are repaired. If the array is cut off, the elements
+    completed before the cut are returned. A lone top-level object is treated
+    as a one-element array.
+
+    Args:
+        text: Raw model response
+
+    Returns:
+        Tuple of (items, complete) where complete is False if the array was
+        truncated or stopped at an unrepairable fault
+
+    Raises:
+        JSONRepairError: If no array or object could be found
+    """
+    text = _THINK_BLOCK.sub("", text)
+    candidates = [i for i, c in enumerate(text) if c in "[{"]
+    if not candidates:
+        raise JSONRepairError("No JSON array or object found in response")
+
+    resume = 0
+    for start in candidates:
+        if start < resume:
+            # Inside a span that already failed to parse
+            continue
+        parser = _Parser(text, start)
+        if text[start] == "{":
+            try:
+                return [parser.object()], True
+            except _Truncated:
+                return [], False
+            except JSONRepairError:
+                resume = parser.pos
+                continue
+
+        parser.pos += 1
+        items: List[Any] = []
+        while True:
+            try:
+                c = parser.peek()
+                if c == "]":
+                    return items, True
+                if c == ",":
+                    parser.pos += 1
+                    continue
+                items.append(parser.value())
+            except _Truncated:
+                return items, False
+            except JSONRepairError:
+                if items:
+                    return items, False
+                resume = parser.pos
+                break
+    return [], False
+
+
+def validate_task(item: Any) -> Optional[Dict[str, Any]]:
+    """
+    Check a decomposed task against TASK_SCHEMA, coercing near-misses.
+
+    Args:
+        item: One element of a parsed task array
+
+    Returns:
+        Normalized task dict, or None if it lacks a non-empty name or description
+    """
+    if not isinstance(item, dict):
+        return None
+    for field in REQUIRED_TASK_FIELDS:
+        if not isinstance(item.get(field), str) or not item[field].strip():
+            return None
+
+    task = dict(item)
+    for field, expected in TASK_SCHEMA.items():
+        value = task.get(field)
+        if value is None or isinstance(value, expected):
+            continue
+        if expected is bool:
+            task[field] = str(value).strip().lower() in ("true", "yes", "1")
+        elif expected is dict:
+            task[field] = {}
+        else:
+            task[field] = str(value)
+    return task
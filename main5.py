@@ -2,12 +2,19 @@ import os
 import json
 import subprocess
 import re
+import socket
+import threading
 from json import JSONDecodeError
 from dataclasses import dataclass, asdict
 from pathlib import Path
 from typing import List, Dict, Optional, Union, Any
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 from dotenv import load_dotenv
+from code_blocks import extract_code
+from hedging import CancelToken, HedgePolicy
+from json_repair import JSONRepairError, parse_json_array, validate_task
 
 load_dotenv()
 
@@ -30,6 +37,55 @@ MODEL_CONFIG = {
     "coding": "deepseek/deepseek-r1-0528:free"
 }
 
+# Opt-in hedging of slow calls (HEDGE_REQUESTS=1): once a call runs past the
+# model's recent latency percentile, a duplicate is sent on another API key
+HEDGE_REQUESTS = os.getenv("HEDGE_REQUESTS", "0").lower() in ("1", "true", "yes")
+HEDGE_POLICY = HedgePolicy(
+    percentile=float(os.getenv("HEDGE_PERCENTILE", "95")),
+    budget=float(os.getenv("HEDGE_BUDGET", "0.1"))
+) if HEDGE_REQUESTS and N > 1 else None
+
+
+class AbortableAdapter(HTTPAdapter):
+    """HTTPAdapter whose in-flight connections can be shut down from another thread"""
+
+    def __init__(self):
+        self._connections = []
+        self._aborted = False
+        self._lock = threading.Lock()
+        super().__init__()
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        track = self._track
+        pools = {}
+        for scheme, base in (("http", HTTPConnectionPool), ("https", HTTPSConnectionPool)):
+            class TrackingPool(base):
+                def _get_conn(self, timeout=None):
+                    return track(super()._get_conn(timeout))
+            pools[scheme] = TrackingPool
+        self.poolmanager.pool_classes_by_scheme = pools
+
+    def _track(self, conn):
+        with self._lock:
+            if self._aborted:
+                raise requests.exceptions.ConnectionError("Request aborted")
+            self._connections.append(conn)
+        return conn
+
+    def abort(self):
+        """Shut down every connection so reads blocked on them fail immediately"""
+        with self._lock:
+            self._aborted = True
+            connections = list(self._connections)
+        for conn in connections:
+            sock = getattr(conn, "sock", None)
+            if sock is not None:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
 # Language and framework configurations
 LANGUAGE_CONFIG = {
     "python": {
@@ -145,21 +201,8 @@ class UniversalProjectGenerator:
         self.language_config = None
         
     def extract_content_from_markers(self, text: str, content_type: str = "json") -> str:
-        """Extract content from code blocks or other markers"""
-        # Remove markdown code blocks
-        patterns = [
-            r'```(?:json|python|javascript|typescript|java|csharp|go|rust|php|ruby|html|css)?\s*\n?(.*?)\n?```',
-            r'`([^`]+)`',
-            r'<code[^>]*>(.*?)</code>',
-            r'<pre[^>]*>(.*?)</pre>'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.DOTALL)
-            if match:
-                return match.group(1).strip()
-        
-        return text.strip()
+        """Extract the best fenced or HTML code block for content_type ("json", "code" or a language)"""
+        return extract_code(text, content_type)
     
     def clean_json_response(self, response: str) -> str:
         """Clean and extract JSON from model response"""
@@ -175,11 +218,78 @@ class UniversalProjectGenerator:
         
         return cleaned.strip()
     
+    def _stream_completion(self, prompt: str, model: str, temperature: float,
+                           api_key: str, cancel: CancelToken) -> str:
+        """Stream one completion on api_key, abandoning it as soon as cancel is set"""
+        headers = dict(HEADERS, Authorization=f"Bearer {api_key}")
+        # A losing attempt may be blocked before the headers or between chunks;
+        # shutting its socket down makes that read fail instead of waiting out the timeout
+        adapter = AbortableAdapter()
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        cancel.add_callback(adapter.abort)
+        try:
+            return self._read_stream(session, prompt, model, temperature, headers, cancel)
+        except Exception:
+            if cancel.is_set():
+                # The loser's aborted read; the winner's result is used
+                return ""
+            raise
+        finally:
+            session.close()
+
+    def _read_stream(self, session: requests.Session, prompt: str, model: str, temperature: float,
+                     headers: Dict[str, str], cancel: CancelToken) -> str:
+        with session.post(
+            f"{BASE_URL}/chat/completions",
+            headers=headers,
+            json={
+                "model": MODEL_CONFIG[model],
+                "messages": [{"role": "user", "content": prompt}],
+                "temperature": temperature,
+                "stream": True
+            },
+            stream=True,
+            timeout=120
+        ) as response:
+            response.raise_for_status()
+            chunks = []
+            for line in response.iter_lines(decode_unicode=True):
+                if cancel.is_set():
+                    # Closing the stream tells the provider to stop generating
+                    return ""
+                if not line or not line.startswith("data: "):
+                    continue
+                data = line[len("data: "):]
+                if data == "[DONE]":
+                    break
+                payload = json.loads(data)
+                if "error" in payload:
+                    raise RuntimeError(f"Model error: {payload['error']}")
+                content = payload["choices"][0].get("delta", {}).get("content")
+                if content:
+                    chunks.append(content)
+            return "".join(chunks)
+
     def call_model(self, prompt: str, model: str, temperature=0.7) -> str:
         """Generic OpenRouter API caller with improved error handling"""
         global I, OPENROUTER_API_KEY
         try:
             print(f"Calling {model} model...")
+            if HEDGE_POLICY is not None:
+                # Primary on the current key, hedge (if slow) on the next one
+                keys = (OPENROUTER_API_KEY,
+                        OPENROUTER_API_KEY_L[(OPENROUTER_API_KEY_L.index(OPENROUTER_API_KEY) + 1) % N])
+                content = HEDGE_POLICY.run(
+                    model,
+                    lambda attempt, cancel: self._stream_completion(prompt, model, temperature,
+                                                                    keys[attempt], cancel)
+                )
+                print(f"Model {model} responded successfully")
+                I = (I+1) % N
+                return content
+
             response = requests.post(
                 f"{BASE_URL}/chat/completions",
                 headers=HEADERS,
@@ -338,109 +448,129 @@ class UniversalProjectGenerator:
     def decompose_task(self, task_description: str, parent_task=None) -> Task:
         """Recursive task decomposition with language-specific context"""
         max_retries = 3
+        # Get file extensions for the detected language
+        extensions = self.language_config["file_extensions"]
+        main_ext = extensions[0] if extensions else ".txt"
+        task_data = []
+        complete = False
+        response = ""
         for attempt in range(max_retries):
-            try:
-                # Get file extensions for the detected language
-                extensions = self.language_config["file_extensions"]
-                main_ext = extensions[0] if extensions else ".txt"
-                
-                prompt = f"""
-                Break down this {self.detected_language} development task into subtasks with DETAILED implementation specifications.
-                
-                LANGUAGE CONTEXT:
-                - Primary Language: {self.detected_language}
-                - Framework: {self.detected_framework or 'Standard library'}
-                - File Extension: {main_ext}
-                - Common Frameworks: {', '.join(self.language_config['common_frameworks'])}
-                
-                Task to decompose: {task_description}
-                Parent task: {parent_task.name if parent_task else 'None'}
-                
-                CRITICAL REQUIREMENTS:
-                1. Return ONLY valid JSON - no explanations, no markdown, no code blocks
-                2. Use double quotes for all strings
-                3. Ensure proper JSON syntax
-                4. Each subtask should include complete specifications for {self.detected_language} implementation
-                
-                Response format (JSON array):
-                [
-                  {{
-                    "name": "task_name",
-                    "description": "detailed_description",
-                    "subtasks_necessary": true,
-                    "function_name": "exact_function_name_or_class_name",
-                    "parameters": {{"param1": "type1", "param2": "type2"}},
-                    "return_type": "return_type",
-                    "file_path": "./app/path/to/file{main_ext}",
-                    "language": "{self.detected_language}",
-                    "framework": "{self.detected_framework or ''}",
-                    "implementation_details": {{
-                      "TYPE": "function",
-                      "expected_loc": 50,
-                      "to_be_coded": true,
-                      "logic": "Step-by-step algorithm description",
-                      "dependencies": ["required_imports"],
-                      "framework_specifics": "Framework-specific notes",
-                      "example_usage": "Usage example"
-                    }}
-                  }}
-                ]
-                
-                Return ONLY the JSON array, nothing else.
+            if task_data:
+                # Only ask for the subtasks the truncated response didn't deliver
+                received = ", ".join(json.dumps(task["name"]) for task in task_data)
+                continuation = f"""
+                A previous response was cut off. These subtasks were already received: {received}.
+                Return ONLY a JSON array of the REMAINING subtasks, in the same format, without repeating any received subtask.
+                Return [] if there are no remaining subtasks.
                 """
-                
-                response = self.call_model(prompt, "reasoning", temperature=0.2)
-                print("Raw decomposition response:")
-                print(response[:500] + "..." if len(response) > 500 else response)
-                
-                # Clean response before parsing
-                cleaned_response = self.clean_json_response(response)
-                print("Cleaned response:")
-                print(cleaned_response[:300] + "..." if len(cleaned_response) > 300 else cleaned_response)
-                
-                task_data = json.loads(cleaned_response)
-                print("Successfully parsed task data")
-                
-                # Process subtasks if necessary
-                for idx, task in enumerate(task_data):
-                    task['subtasks'] = []
-                    if task.get('subtasks_necessary', False):
-                        subtask_description = f"Subtask for {task['name']}: {task['description']}"
-                        subtask_data = self.decompose_task(subtask_description, task)
-                        if isinstance(subtask_data, list):
-                            task_data[idx]['subtasks'].extend(subtask_data)
-                        else:
-                            task_data[idx]['subtasks'].append(subtask_data)
-                
-                return task_data
-                
-            except (JSONDecodeError, ValueError) as e:
+            else:
+                continuation = ""
+            
+            prompt = f"""
+            Break down this {self.detected_language} development task into subtasks with DETAILED implementation specifications.
+            
+            LANGUAGE CONTEXT:
+            - Primary Language: {self.detected_language}
+            - Framework: {self.detected_framework or 'Standard library'}
+            - File Extension: {main_ext}
+            - Common Frameworks: {', '.join(self.language_config['common_frameworks'])}
+            
+            Task to decompose: {task_description}
+            Parent task: {parent_task['name'] if isinstance(parent_task, dict) else getattr(parent_task, 'name', 'None')}
+            
+            CRITICAL REQUIREMENTS:
+            1. Return ONLY valid JSON - no explanations, no markdown, no code blocks
+            2. Use double quotes for all strings
+            3. Ensure proper JSON syntax
+            4. Each subtask should include complete specifications for {self.detected_language} implementation
+            
+            Response format (JSON array):
+            [
+              {{
+                "name": "task_name",
+                "description": "detailed_description",
+                "subtasks_necessary": true,
+                "function_name": "exact_function_name_or_class_name",
+                "parameters": {{"param1": "type1", "param2": "type2"}},
+                "return_type": "return_type",
+                "file_path": "./app/path/to/file{main_ext}",
+                "language": "{self.detected_language}",
+                "framework": "{self.detected_framework or ''}",
+                "implementation_details": {{
+                  "TYPE": "function",
+                  "expected_loc": 50,
+                  "to_be_coded": true,
+                  "logic": "Step-by-step algorithm description",
+                  "dependencies": ["required_imports"],
+                  "framework_specifics": "Framework-specific notes",
+                  "example_usage": "Usage example"
+                }}
+              }}
+            ]
+            {continuation}
+            Return ONLY the JSON array, nothing else.
+            """
+            
+            response = self.call_model(prompt, "reasoning", temperature=0.2)
+            print("Raw decomposition response:")
+            print(response[:500] + "..." if len(response) > 500 else response)
+            
+            # Repair locally instead of re-calling the model for syntax faults
+            try:
+                items, complete = parse_json_array(response)
+            except JSONRepairError as e:
                 print(f"Attempt {attempt + 1}/{max_retries} failed: {str(e)}")
-                if attempt == max_retries - 1:
-                    print(f"All attempts failed. Last response: {response[:200]}...")
-                    # Return a minimal task structure
-                    return [{
-                        "name": "Fallback Task",
-                        "description": task_description,
-                        "subtasks": [],
-                        "subtasks_necessary": False,
-                        "function_name": "main_function",
-                        "parameters": {},
-                        "return_type": "None",
-                        "file_path": f"./app/main{main_ext}",
-                        "language": self.detected_language,
-                        "framework": self.detected_framework or '',
-                        "implementation_details": {
-                            "TYPE": "function",
-                            "expected_loc": 20,
-                            "to_be_coded": True,
-                            "logic": "Basic implementation needed",
-                            "dependencies": [],
-                            "framework_specifics": "",
-                            "example_usage": ""
-                        }
-                    }]
                 continue
+            
+            received_names = {task["name"] for task in task_data}
+            valid = [task for task in map(validate_task, items) if task is not None]
+            new_tasks = [task for task in valid if task["name"] not in received_names]
+            task_data.extend(new_tasks)
+            print(f"Parsed {len(new_tasks)} task(s) "
+                  f"({len(items) - len(valid)} invalid, {'complete' if complete else 'truncated'})")
+            if complete and task_data:
+                break
+            print(f"Attempt {attempt + 1}/{max_retries} incomplete, requesting missing subtasks")
+        
+        if not task_data:
+            print(f"All attempts failed. Last response: {response[:200]}...")
+            # Return a minimal task structure
+            return [{
+                "name": "Fallback Task",
+                "description": task_description,
+                "subtasks": [],
+                "subtasks_necessary": False,
+                "function_name": "main_function",
+                "parameters": {},
+                "return_type": "None",
+                "file_path": f"./app/main{main_ext}",
+                "language": self.detected_language,
+                "framework": self.detected_framework or '',
+                "implementation_details": {
+                    "TYPE": "function",
+                    "expected_loc": 20,
+                    "to_be_coded": True,
+                    "logic": "Basic implementation needed",
+                    "dependencies": [],
+                    "framework_specifics": "",
+                    "example_usage": ""
+                }
+            }]
+        
+        print("Successfully parsed task data")
+        
+        # Process subtasks if necessary
+        for idx, task in enumerate(task_data):
+            task['subtasks'] = []
+            if task.get('subtasks_necessary', False):
+                subtask_description = f"Subtask for {task['name']}: {task['description']}"
+                subtask_data = self.decompose_task(subtask_description, task)
+                if isinstance(subtask_data, list):
+                    task_data[idx]['subtasks'].extend(subtask_data)
+                else:
+                    task_data[idx]['subtasks'].append(subtask_data)
+        
+        return task_data
 
     def rebuild_task_tree(self, root_task: Task) -> Task:
         """DFS function to rebuild the task tree"""
@@ -537,15 +667,7 @@ class UniversalProjectGenerator:
 
     def clean_code_response(self, code_text: str) -> str:
         """Remove markdown code blocks and extract clean code from generated response"""
-        # First try to extract from code blocks
-        cleaned = self.extract_content_from_markers(code_text, "code")
-        
-        # Remove any remaining markdown artifacts
-        cleaned = re.sub(r'^```\w*\s*', '', cleaned, flags=re.MULTILINE)
-        cleaned = re.sub(r'```$', '', cleaned, flags=re.MULTILINE)
-        cleaned = re.sub(r'</?code>|</?pre>', '', cleaned)
-        
-        return cleaned.strip()
+        return self.extract_content_from_markers(code_text, self.detected_language or "code")
 
     def generate_code(self, task: Task) -> str:
         """Generate code using language-specific patterns"""
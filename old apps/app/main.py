@@ -1,12 +1,19 @@
 import logging
 from src.config import load_config
 from src.data_loader import load_data
-from src.preprocessing import preprocess_data
+from src.preprocessing import preprocess_data, create_sequences, temporal_split_series
 from src.anomaly_detection import detect_and_remove_anomalies
-from src.model import build_model
+from src.model import build_gru_model
+from src.stage_cache import (StageCache, file_fingerprint, save_series, load_series,
+                             save_series_and_scaler, load_series_and_scaler)
 from src.train import train_model
 from src.evaluate import evaluate_model
+from src.backtest import run_backtest
+from src.export import export_model
 import tensorflow as tf
+import os
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
 
 def main(config_path: str) -> None:
     """
@@ -15,13 +22,20 @@ def main(config_path: str) -> None:
     Steps:
     1. Load configuration from YAML file
     2. Set up logging
-    3. Load and preprocess data
-    4. Perform anomaly detection
-    5. Create sequences and split data
-    6. Build TensorFlow model
-    7. Train model
-    8. Evaluate model
-    9. Save model and artifacts
+    3. Load and preprocess data (cached)
+    4. Perform anomaly detection (cached)
+    5. Optionally backtest over rolling-origin folds
+    6. Split series (training windows are built on the fly)
+    7. Build TensorFlow model
+    8. Train model
+    9. Evaluate model
+    10. Save model and artifacts
+    
+    Preprocessing and anomaly detection results are kept in a stage cache
+    (config['cache']['dir']). Each stage is keyed on the source file's
+    fingerprint and the hash of every config section it depends on, so
+    re-running with only 'model' or 'training' changes goes straight to
+    training.
     
     Args:
         config_path: Path to configuration YAML file
@@ -33,7 +47,7 @@ def main(config_path: str) -> None:
     """
     try:
         # Load configuration
-        config = load_config(config_path).get_config()
+        config = load_config(config_path)
         
         # Initialize logging
         logging.basicConfig(
@@ -43,48 +57,92 @@ def main(config_path: str) -> None:
         logger = logging.getLogger(__name__)
         logger.info("Pipeline started")
         
-        # Data loading
-        logger.info("Loading data")
-        data = load_data(config['data']['path'])
-        
-        # Preprocessing
-        logger.info("Preprocessing data")
-        processed_data = preprocess_data(data, config['preprocessing'])
-        
+        # Stage cache: each stage is keyed on its inputs and its config section
+        cache_config = config.get('cache', {})
+        cache = StageCache(cache_config.get('dir', 'data/stage_cache'),
+                           enabled=cache_config.get('enabled', True))
+        data_config = config['data']
+
+        def load_and_preprocess():
+            # Data loading
+            logger.info("Loading data")
+            data = load_data(
+                data_config['path'],
+                data_config['datetime_col'],
+                data_config['value_col'],
+                datetime_format=data_config.get('datetime_format'),
+                cache_dir=data_config.get('cache_dir'),
+                start=data_config.get('start'),
+                end=data_config.get('end')
+            )
+            # Preprocessing
+            logger.info("Preprocessing data")
+            return preprocess_data(data[data_config['value_col']], config['preprocessing'])
+
+        preprocess_key = cache.key(file_fingerprint(data_config['path']), data_config,
+                                   config['preprocessing'])
+        (processed_data, scaler), hit = cache.run(
+            'preprocess', preprocess_key, load_and_preprocess,
+            save_series_and_scaler, load_series_and_scaler
+        )
+        if hit:
+            logger.info("Loaded preprocessed data and scaler from stage cache")
+
         # Anomaly detection
-        logger.info("Running anomaly detection")
-        cleaned_data = detect_and_remove_anomalies(processed_data, config['anomaly_detection'])
-        
-        # Sequence creation and splitting
-        logger.info("Creating sequences and splitting data")
-        # Placeholder for sequence creation logic
-        # This would typically be implemented in preprocessing or separate module
-        # Example: 
-        # from src.preprocessing import create_sequences, split_data
-        # sequences = create_sequences(cleaned_data, **config['sequence'])
-        # train_data, val_data, test_data = split_data(sequences, **config['split'])
+        anomaly_key = cache.key(preprocess_key, config['anomaly_detection'])
+        cleaned_data, hit = cache.run(
+            'anomaly_detection', anomaly_key,
+            lambda: detect_and_remove_anomalies(processed_data, config['anomaly_detection']),
+            save_series, load_series
+        )
+        if hit:
+            logger.info("Loaded cleaned series from stage cache")
+        else:
+            logger.info("Ran anomaly detection")
+
+        # Optional rolling-origin backtest
+        if config.get('backtest'):
+            logger.info("Running rolling-origin backtest")
+            backtest_table = run_backtest(cleaned_data, scaler, config)
+            logger.info(f"Backtest results:\n{backtest_table.to_string()}")
+            if config['backtest'].get('results_path'):
+                backtest_table.to_csv(config['backtest']['results_path'])
+
+        # Series splitting; training windows are built on the fly by train_model
+        logger.info("Splitting data")
+        sequence_config = config['sequence']
+        sequence_length = sequence_config['sequence_length']
+        forecast_horizon = sequence_config['forecast_horizon']
+        values = cleaned_data.to_numpy(dtype='float32')
+        segments = temporal_split_series(values, sequence_length, forecast_horizon,
+                                         tuple(config['split']['split_ratios']))
         
         # Model building
         logger.info("Building model")
-        model = build_model(config['model'])
-        
+        model = build_gru_model((sequence_length, 1), config['model'])
+
         # Model training
         logger.info("Training model")
-        # Placeholder for actual training call
-        # Example: 
-        # history = train_model(model, train_data, val_data, config['training'])
-        
+        train_model(model, segments['train'], segments['val'], config['training'],
+                    sequence_length=sequence_length, forecast_horizon=forecast_horizon)
+
         # Model evaluation
         logger.info("Evaluating model")
-        # Placeholder for evaluation call
-        # Example: 
-        # metrics = evaluate_model(model, test_data, config['evaluation'])
-        
+        X_test, y_test = create_sequences(segments['test'].reshape(-1, 1),
+                                          sequence_length, forecast_horizon, copy=False)
+        metrics = evaluate_model(model, X_test, y_test.reshape(len(y_test), -1), scaler)
+        logger.info(f"Test MAE: {metrics['mae']:.4f}, RMSE: {metrics['rmse']:.4f}")
+
         # Save artifacts
         logger.info("Saving model and artifacts")
-        # Placeholder for saving logic
-        # Example: model.save(config['output']['model_path'])
-        
+        if 'output' in config:
+            model.save(config['output']['model_path'])
+            if config['output'].get('artifact_path'):
+                # Lightweight serving artifact with the scaler folded in
+                export_format = export_model(model, scaler, config['output']['artifact_path'],
+                                             format=config['output'].get('artifact_format', 'auto'))
+                logger.info(f"Exported {export_format} inference artifact")
+
         logger.info("Pipeline completed successfully")
         
     except FileNotFoundError as e:
@@ -100,14 +158,6 @@ def main(config_path: str) -> None:
         logging.exception(f"Unexpected error in pipeline: {e}")
         raise
 
-if __name__ == '__main__':
-    main('config.yaml')
-
-import os
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fibonacci import router as fibonacci_router
-
 def create_app() -> FastAPI:
     """
     Create and configure the FastAPI application instance.
@@ -115,6 +165,8 @@ def create_app() -> FastAPI:
     Returns:
         FastAPI: Configured FastAPI application instance
     """
+    from .routers.fibonacci import router as fibonacci_router
+    
     app = FastAPI(
         title="Fibonacci API",
         description="API for calculating Fibonacci numbers",
@@ -145,4 +197,10 @@ def create_app() -> FastAPI:
 
     return app
 
-app = create_app()
\ No newline at end of file
+# The API is only built when this module is imported from the app package.
+# Running the pipeline, or a spawned backtest worker re-importing this file
+# as __mp_main__, must not try to import the package-relative routers.
+if __name__ == '__main__':
+    main('config.yaml')
+elif __name__ != '__mp_main__':
+    app = create_app()
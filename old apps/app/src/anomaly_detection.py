@@ -1,7 +1,8 @@
+import joblib
 import pandas as pd
 import numpy as np
 from sklearn.ensemble import IsolationForest
-from typing import Dict
+from typing import Any, Dict, Optional
 
 def detect_and_remove_anomalies(data: pd.Series, config: Dict) -> pd.Series:
     """
@@ -56,4 +57,180 @@ def detect_and_remove_anomalies(data: pd.Series, config: Dict) -> pd.Series:
     # Interpolate missing values
     cleaned = cleaned.interpolate(method='linear', limit_direction='both')
     
-    return cleaned
\ No newline at end of file
+    return cleaned
+
+class StreamingAnomalyDetector:
+    """
+    Fitted, persistable anomaly detector that scores live meter data incrementally.
+    
+    The detector keeps a fixed-size sliding window of recent clean values in a ring
+    buffer. Points are scored against statistics of that window, either robust
+    z-scores (median / MAD) or an IsolationForest, and the statistics are refreshed
+    only every `refit_every` ingested points. Scoring a micro-batch therefore costs
+    O(batch) amortized, independent of how much history has been seen.
+    
+    Args:
+        method: 'robust_z' (default) or 'isolation_forest'
+        window: Number of recent points the statistics are computed over
+        threshold: |robust z-score| above which a point is anomalous ('robust_z' only)
+        refit_every: Ingested points between statistic / forest refreshes
+        contamination: Expected outlier proportion ('isolation_forest' only)
+        **forest_params: Additional IsolationForest parameters
+    
+    Raises:
+        ValueError: For unknown methods or non-positive window sizes
+    """
+    
+    def __init__(self, method: str = 'robust_z', window: int = 10080, threshold: float = 3.5,
+                 refit_every: int = 1440, contamination: float = 0.01, **forest_params: Any):
+        if method not in ('robust_z', 'isolation_forest'):
+            raise ValueError(f"Unknown method '{method}', expected 'robust_z' or 'isolation_forest'")
+        if window < 2 or refit_every < 1:
+            raise ValueError("window must be at least 2 and refit_every at least 1")
+        self.method = method
+        self.window = window
+        self.threshold = threshold
+        self.refit_every = refit_every
+        self.contamination = contamination
+        self.forest_params = forest_params
+        self._buffer = np.empty(window, dtype=np.float64)
+        self._count = 0
+        self._since_refit = 0
+        self._last_value: Optional[float] = None
+        self._median = 0.0
+        self._scale = 1.0
+        self._forest: Optional[IsolationForest] = None
+    
+    @classmethod
+    def from_config(cls, config: Dict) -> 'StreamingAnomalyDetector':
+        """Create a detector from the 'anomaly_detection' configuration section."""
+        return cls(**config)
+    
+    def _window_values(self) -> np.ndarray:
+        return self._buffer[:min(self._count, self.window)]
+    
+    def _refit(self) -> None:
+        """Recompute window statistics (and refit the forest) from the ring buffer."""
+        values = self._window_values()
+        self._median = float(np.nanmedian(values))
+        mad = float(np.nanmedian(np.abs(values - self._median)))
+        # 1.4826 * MAD estimates the standard deviation for normal data
+        self._scale = 1.4826 * mad if mad > 0 else (float(np.nanstd(values)) or 1.0)
+        if self.method == 'isolation_forest':
+            self._forest = IsolationForest(contamination=self.contamination, **self.forest_params)
+            self._forest.fit(values[~np.isnan(values)].reshape(-1, 1))
+        self._since_refit = 0
+    
+    def _append(self, values: np.ndarray) -> None:
+        """Write clean values into the ring buffer, skipping any NaN gaps."""
+        values = values[~np.isnan(values)][-self.window:]
+        positions = (self._count + np.arange(len(values))) % self.window
+        self._buffer[positions] = values
+        self._count += len(values)
+        self._since_refit += len(values)
+        if len(values):
+            self._last_value = float(values[-1])
+    
+    def fit(self, data: pd.Series) -> 'StreamingAnomalyDetector':
+        """
+        Initialize the window from historical data and fit the statistics.
+        
+        Args:
+            data: Historical series; only the last `window` points are kept
+        
+        Returns:
+            StreamingAnomalyDetector: self
+        
+        Raises:
+            ValueError: If data contains fewer than 2 valid points
+        """
+        values = data.dropna().to_numpy(dtype=np.float64)
+        if len(values) < 2:
+            raise ValueError("Input data must contain at least 2 points")
+        self._count = 0
+        self._append(values)
+        self._refit()
+        return self
+    
+    def score(self, values: np.ndarray) -> np.ndarray:
+        """
+        Flag anomalous points without updating the detector.
+        
+        Args:
+            values: 1D array of new observations
+        
+        Returns:
+            np.ndarray: Boolean mask, True where a point is anomalous; NaN
+            gaps are never flagged
+        
+        Raises:
+            RuntimeError: If the detector has not been fitted
+        """
+        if self._count == 0:
+            raise RuntimeError("Detector must be fitted before scoring")
+        values = np.asarray(values, dtype=np.float64)
+        if self.method == 'isolation_forest':
+            anomalies = np.zeros(len(values), dtype=bool)
+            valid = ~np.isnan(values)
+            if valid.any():
+                anomalies[valid] = self._forest.predict(values[valid].reshape(-1, 1)) == -1
+            return anomalies
+        with np.errstate(invalid='ignore'):
+            return np.abs(values - self._median) / self._scale > self.threshold
+    
+    def remove_anomalies(self, data: pd.Series) -> pd.Series:
+        """
+        Replace anomalous points and NaN gaps with interpolated values, without
+        updating the detector.
+        
+        Only runs of anomalies and gaps are re-interpolated; the last value
+        ingested before the series is the left anchor of a leading run.
+        
+        Args:
+            data: Series of observations to clean
+        
+        Returns:
+            pd.Series: Cleaned copy of data
+        """
+        values = data.to_numpy(dtype=np.float64)
+        missing = np.isnan(values) | self.score(values)
+        cleaned = data.astype(np.float64)
+        if not missing.any():
+            return cleaned
+        cleaned[missing] = np.nan
+        if self._last_value is None or not missing[0]:
+            return cleaned.interpolate(method='linear', limit_direction='both')
+        # Interpolate a leading run from the last clean value seen, placed as a
+        # virtual point one step before the series
+        anchored = pd.Series(np.concatenate(([self._last_value], cleaned.to_numpy())))
+        anchored = anchored.interpolate(method='linear', limit_direction='both')
+        cleaned[:] = anchored.to_numpy()[1:]
+        return cleaned
+    
+    def update(self, new_points: pd.Series) -> pd.Series:
+        """
+        Clean a micro-batch of new points and ingest it into the sliding window.
+        
+        Args:
+            new_points: Newly arrived observations, in time order
+        
+        Returns:
+            pd.Series: The cleaned micro-batch
+        """
+        cleaned = self.remove_anomalies(new_points)
+        self._append(cleaned.to_numpy(dtype=np.float64))
+        if self._since_refit >= self.refit_every:
+            self._refit()
+        return cleaned
+    
+    def save(self, path: str) -> None:
+        """Persist the fitted detector with joblib."""
+        joblib.dump(self, path)
+    
+    @classmethod
+    def load(cls, path: str) -> 'StreamingAnomalyDetector':
+        """Load a detector previously written by save()."""
+        detector = joblib.load(path)
+        if not isinstance(detector, cls):
+            raise TypeError(f"{path} does not contain a {cls.__name__}")
+        return detector
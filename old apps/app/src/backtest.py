@@ -0,0 +1,209 @@
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+class Fold(NamedTuple):
+    """Series positions of one backtest fold; ranges are half-open [start, end)."""
+    index: int
+    train_start: int
+    train_end: int
+    test_start: int
+    test_end: int
+
+def make_folds(n_timesteps: int, sequence_length: int, forecast_horizon: int,
+               backtest_config: Dict[str, Any]) -> List[Fold]:
+    """
+    Lay out rolling-origin folds over a series.
+
+    Each fold trains on [train_start, train_end) and is tested on the forecasts whose
+    targets fall in [train_end, train_end + test_size). The origin advances by step
+    between folds.
+
+    Args:
+        n_timesteps: Length of the series
+        sequence_length: Number of timesteps in each input sequence
+        forecast_horizon: Number of future timesteps to predict
+        backtest_config: Dictionary with keys:
+            - 'initial_train_size': Timesteps in the first fold's training range
+            - 'test_size': Timesteps in each test range
+            - 'step' (optional): Origin advance between folds (default=test_size)
+            - 'window' (optional): 'expanding' keeps the start fixed, 'rolling'
+              keeps the training range at initial_train_size (default='expanding')
+            - 'max_folds' (optional): Keep only the last max_folds folds
+            - 'val_size' (optional): Timesteps at the end of each training range
+              used as validation targets (default=test_size)
+
+    Returns:
+        List of Fold tuples in temporal order
+
+    Raises:
+        KeyError: If a required key is missing
+        ValueError: For invalid sizes or window type, or if no fold fits
+    """
+    initial_train_size = backtest_config['initial_train_size']
+    test_size = backtest_config['test_size']
+    step = backtest_config.get('step', test_size)
+    window = backtest_config.get('window', 'expanding')
+    max_folds = backtest_config.get('max_folds')
+    val_size = backtest_config.get('val_size', test_size)
+
+    if window not in ('expanding', 'rolling'):
+        raise ValueError(f"window must be 'expanding' or 'rolling', got {window!r}")
+    if step <= 0 or test_size < forecast_horizon:
+        raise ValueError("step must be positive and test_size at least forecast_horizon")
+    if val_size < forecast_horizon:
+        raise ValueError("val_size must be at least forecast_horizon")
+    # The training range is split into a training part with at least one window
+    # and a validation part with at least one target window
+    if initial_train_size < sequence_length + 2 * forecast_horizon:
+        raise ValueError("initial_train_size must be at least sequence_length + 2 * forecast_horizon "
+                         "to hold a training window and a validation window")
+
+    folds = []
+    train_end = initial_train_size
+    while train_end + forecast_horizon <= n_timesteps:
+        train_start = 0 if window == 'expanding' else train_end - initial_train_size
+        test_end = min(train_end + test_size, n_timesteps)
+        folds.append(Fold(len(folds), train_start, train_end, train_end, test_end))
+        train_end += step
+
+    if not folds:
+        raise ValueError(f"Series of {n_timesteps} timesteps is too short for a single fold")
+    if max_folds is not None:
+        folds = folds[-max_folds:]
+    return folds
+
+def _run_chain(values: np.ndarray, folds: List[Fold], scaler: Any, config: Dict[str, Any],
+               worker_id: int) -> List[Dict[str, Any]]:
+    """Train and test a contiguous run of folds, warm-starting each from the previous one."""
+    import tensorflow as tf
+    from src.evaluate import evaluate_model
+    from src.model import build_gru_model
+    from src.preprocessing import create_sequences
+    from src.train import train_model
+
+    backtest_config = config['backtest']
+    sequence_length = config['sequence']['sequence_length']
+    forecast_horizon = config['sequence']['forecast_horizon']
+    val_size = backtest_config.get('val_size', backtest_config['test_size'])
+    warm_start = backtest_config.get('warm_start', True)
+    warm_epochs = backtest_config.get('warm_start_epochs', config['training']['epochs'])
+    threads = backtest_config.get('threads_per_worker')
+    if threads:
+        tf.config.threading.set_intra_op_parallelism_threads(threads)
+        tf.config.threading.set_inter_op_parallelism_threads(threads)
+    seed = backtest_config.get('seed')
+    if seed is not None:
+        tf.keras.utils.set_random_seed(seed + worker_id)
+
+    output_dir = backtest_config.get('output_dir') or tempfile.mkdtemp(prefix='backtest-')
+    os.makedirs(output_dir, exist_ok=True)
+
+    model = None
+    rows = []
+    for fold in folds:
+        warm = warm_start and model is not None
+        if not warm:
+            model = build_gru_model((sequence_length, 1), config['model'])
+        training_config = dict(config['training'])
+        training_config['model_save_path'] = os.path.join(output_dir, f"fold_{fold.index}.weights.h5")
+        if warm:
+            training_config['epochs'] = warm_epochs
+
+        # Validation targets are the last val_size steps of the training range
+        val_start = max(fold.train_end - val_size, fold.train_start + sequence_length + forecast_horizon)
+        train_values = values[fold.train_start:val_start]
+        val_values = values[val_start - sequence_length:fold.train_end]
+        test_values = values[fold.test_start - sequence_length:fold.test_end]
+
+        started = time.perf_counter()
+        history = train_model(model, train_values, val_values, training_config,
+                              sequence_length=sequence_length, forecast_horizon=forecast_horizon)
+        fit_seconds = time.perf_counter() - started
+
+        X_test, y_test = create_sequences(test_values.reshape(-1, 1), sequence_length, forecast_horizon,
+                                          copy=False)
+        metrics = evaluate_model(model, X_test, y_test.reshape(len(y_test), -1), scaler, plot=False)
+
+        row = {
+            **fold._asdict(),
+            'warm_start': warm,
+            'epochs': len(history.history['loss']),
+            'fit_seconds': fit_seconds,
+            'mae': metrics['mae'],
+            'rmse': metrics['rmse'],
+        }
+        for step, mae in enumerate(metrics['mae_per_horizon'], start=1):
+            row[f'mae_t+{step}'] = float(mae)
+        rows.append(row)
+    return rows
+
+def run_backtest(series: pd.Series, scaler: Any, config: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Run a rolling-origin backtest of the GRU forecaster and tabulate per-fold metrics.
+
+    Folds come from make_folds(config['backtest']). Each fold is trained on its own
+    range and evaluated on the following test range on the original scale. Instead of
+    training every fold from scratch, a fold starts from the previous fold's weights and
+    trains for warm_start_epochs (early stopping still applies).
+
+    With n_workers > 1 the folds are cut into n_workers contiguous chains that run in
+    separate spawned processes; warm starting happens within a chain, so the first fold
+    of every chain trains from scratch.
+
+    Args:
+        series: Scaled, cleaned time series in temporal order
+        scaler: Scaler fitted on the value column, used to report metrics in original units
+        config: Pipeline configuration with 'sequence', 'model', 'training' and 'backtest'
+            sections. Besides the make_folds keys, 'backtest' accepts:
+            - 'val_size': Timesteps at the end of each training range used for early
+              stopping (default=test_size)
+            - 'warm_start': Reuse the previous fold's weights (default=True)
+            - 'warm_start_epochs': Epoch budget for warm-started folds
+              (default=training epochs)
+            - 'n_workers': Number of worker processes (default=1)
+            - 'threads_per_worker': TensorFlow thread pool size in each worker
+            - 'seed': Base random seed (worker i uses seed + i)
+            - 'output_dir': Where fold checkpoints are written (default: a temp dir)
+
+    Returns:
+        pd.DataFrame with one row per fold: fold positions (plus timestamps when the
+        series has a DatetimeIndex), warm_start, epochs, fit_seconds, mae, rmse and
+        mae_t+k for each forecast step
+
+    Raises:
+        KeyError: For missing configuration sections
+        ValueError: For invalid fold settings
+    """
+    sequence_length = config['sequence']['sequence_length']
+    forecast_horizon = config['sequence']['forecast_horizon']
+    backtest_config = config['backtest']
+    values = series.to_numpy(dtype=np.float32)
+
+    folds = make_folds(len(values), sequence_length, forecast_horizon, backtest_config)
+    n_workers = min(backtest_config.get('n_workers', 1), len(folds))
+
+    if n_workers <= 1:
+        rows = _run_chain(values, folds, scaler, config, 0)
+    else:
+        chains = [list(chain) for chain in np.array_split(np.arange(len(folds)), n_workers)]
+        # TensorFlow is not fork-safe, so workers are spawned
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=n_workers, mp_context=context) as executor:
+            futures = [
+                executor.submit(_run_chain, values, [folds[i] for i in chain], scaler, config, worker_id)
+                for worker_id, chain in enumerate(chains)
+            ]
+            rows = [row for future in futures for row in future.result()]
+
+    table = pd.DataFrame(rows).rename(columns={'index': 'fold'}).set_index('fold')
+    if isinstance(series.index, pd.DatetimeIndex):
+        table.insert(4, 'test_from', series.index[table['test_start']])
+        table.insert(5, 'test_to', series.index[table['test_end'] - 1])
+    return table
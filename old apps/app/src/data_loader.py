@@ -1,62 +1,146 @@
+import hashlib
+import os
 import pandas as pd
 from typing import Optional
 
-def load_data(file_path: str, datetime_col: str, value_col: str) -> pd.DataFrame:
+try:
+    import pyarrow  # noqa: F401  (required by the Parquet cache)
+except ImportError:  # pragma: no cover - optional dependency
+    pyarrow = None
+
+# Rows parsed per CSV chunk
+DEFAULT_CHUNKSIZE = 1_000_000
+
+def _cache_path(file_path: str, datetime_col: str, value_col: str,
+                datetime_format: Optional[str], cache_dir: str) -> str:
+    """Build the cache file path keyed by source path, mtime, size and parse options."""
+    stat = os.stat(file_path)
+    key = "|".join([
+        os.path.abspath(file_path), str(stat.st_mtime_ns), str(stat.st_size),
+        datetime_col, value_col, datetime_format or ""
+    ])
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(cache_dir, f"{stem}-{digest}.parquet")
+
+def _read_csv_chunked(file_path: str, datetime_col: str, value_col: str,
+                      datetime_format: Optional[str], chunksize: int) -> pd.DataFrame:
+    """Stream the CSV in typed chunks, parsing timestamps with a fixed format."""
+    try:
+        # The header is read and usecols checked when the reader is created
+        reader = pd.read_csv(
+            file_path,
+            usecols=[datetime_col, value_col],
+            dtype={datetime_col: 'string', value_col: 'float64'},
+            chunksize=chunksize
+        )
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"Data file not found at {file_path}") from e
+    except ValueError as e:
+        if 'Usecols do not match columns' not in str(e):
+            raise
+        raise KeyError(f"One or more specified columns missing in {file_path}") from e
+
+    # Value and timestamp parse errors surface unchanged
+    chunks = []
+    for chunk in reader:
+        timestamps = pd.to_datetime(chunk[datetime_col], format=datetime_format, errors='coerce')
+        chunks.append(pd.DataFrame(
+            {value_col: chunk[value_col].to_numpy()},
+            index=pd.DatetimeIndex(timestamps, name=datetime_col)
+        ))
+
+    if not chunks:
+        return pd.DataFrame({value_col: pd.Series(dtype='float64')},
+                            index=pd.DatetimeIndex([], name=datetime_col))
+
+    df = pd.concat(chunks)
+    # Drop rows whose timestamps failed to parse
+    df = df[df.index.notna()]
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index(kind='stable')
+    return df
+
+def load_data(file_path: str, datetime_col: str, value_col: str,
+              datetime_format: Optional[str] = None,
+              cache_dir: Optional[str] = None,
+              start: Optional[str] = None,
+              end: Optional[str] = None,
+              chunksize: int = DEFAULT_CHUNKSIZE) -> pd.DataFrame:
     """
     Load and preprocess time-series energy data from a CSV file.
-    
+
     Steps:
-    1. Read CSV file using pandas
-    2. Parse specified datetime column to datetime objects
-    3. Set datetime column as DataFrame index
-    4. Extract specified value column
-    5. Handle datetime parsing errors by coercing invalid dates to NaT
-    6. Drop rows with NaT in datetime index
-    7. Sort DataFrame by datetime index
-    
+    1. Serve from the Parquet cache if one exists for this exact source file
+    2. Otherwise stream the CSV in chunks with explicit dtypes
+    3. Parse the datetime column with a fixed format, coercing invalid dates to NaT
+    4. Drop rows with NaT in datetime index
+    5. Sort DataFrame by datetime index (skipped if already in order)
+    6. Write the sorted, typed result to the Parquet cache
+    7. Restrict to the requested time range
+
+    The cache is keyed by the source file's path, modification time and size, so
+    editing or replacing the CSV invalidates it. Cached loads read only the needed
+    columns and push the start/end filter down into the Parquet reader.
+
     Args:
         file_path: Path to the CSV file
         datetime_col: Name of the datetime column in the CSV
         value_col: Name of the value column to extract
-    
+        datetime_format: strftime format of the datetime column (e.g. '%Y-%m-%d %H:%M:%S').
+            Parsing with a fixed format is much faster than inference.
+        cache_dir: Directory for the Parquet cache (default: no caching)
+        start: Earliest timestamp to return, inclusive
+        end: Latest timestamp to return, inclusive
+        chunksize: Number of CSV rows parsed per chunk
+
     Returns:
         pd.DataFrame: Preprocessed DataFrame with datetime index and single value column
-    
+
     Raises:
         FileNotFoundError: If specified file_path doesn't exist
         KeyError: If specified datetime_col or value_col doesn't exist in CSV
+        ImportError: If cache_dir is given but pyarrow is not installed
         ValueError: For general data parsing issues
-    
+
     Example:
-        df = load_data('data/raw/energy_data.csv', 'timestamp', 'consumption')
+        df = load_data('data/raw/energy_data.csv', 'timestamp', 'consumption',
+                       datetime_format='%Y-%m-%d %H:%M:%S', cache_dir='data/cache')
     """
-    try:
-        # Read CSV with datetime parsing for specified column
-        df = pd.read_csv(
-            file_path,
-            parse_dates=[datetime_col],
-            infer_datetime_format=True,
-            usecols=[datetime_col, value_col]
-        )
-    except FileNotFoundError as e:
-        raise FileNotFoundError(f"Data file not found at {file_path}") from e
-    except ValueError as e:
-        # Handle missing columns
-        raise KeyError(f"One or more specified columns missing in {file_path}") from e
-    
-    # Verify required columns exist
-    if datetime_col not in df.columns:
-        raise KeyError(f"Datetime column '{datetime_col}' not found in DataFrame")
-    if value_col not in df.columns:
-        raise KeyError(f"Value column '{value_col}' not found in DataFrame")
-    
-    # Set datetime index and handle invalid dates
-    df[datetime_col] = pd.to_datetime(df[datetime_col], errors='coerce')
-    df = df.dropna(subset=[datetime_col])
-    df.set_index(datetime_col, inplace=True)
-    
-    # Extract value column and sort
-    result_df = df[[value_col]].copy()
-    result_df.sort_index(inplace=True)
-    
-    return result_df
\ No newline at end of file
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Data file not found at {file_path}")
+    if cache_dir is not None and pyarrow is None:
+        raise ImportError("The Parquet cache requires pyarrow; install it or pass cache_dir=None")
+
+    start_ts = pd.Timestamp(start) if start is not None else None
+    end_ts = pd.Timestamp(end) if end is not None else None
+
+    if cache_dir is not None:
+        cache_path = _cache_path(file_path, datetime_col, value_col, datetime_format, cache_dir)
+        if os.path.exists(cache_path):
+            filters = []
+            if start_ts is not None:
+                filters.append((datetime_col, '>=', start_ts))
+            if end_ts is not None:
+                filters.append((datetime_col, '<=', end_ts))
+            df = pd.read_parquet(
+                cache_path,
+                engine='pyarrow',
+                columns=[datetime_col, value_col],
+                filters=filters or None
+            )
+            return df.set_index(datetime_col)
+
+    df = _read_csv_chunked(file_path, datetime_col, value_col, datetime_format, chunksize)
+
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        df.reset_index().to_parquet(tmp_path, engine='pyarrow', index=False)
+        os.replace(tmp_path, cache_path)
+
+    # Restrict to the requested time range
+    if start_ts is not None or end_ts is not None:
+        df = df.loc[start_ts:end_ts]
+
+    return df
@@ -1,87 +1,171 @@
 import numpy as np
-from sklearn.metrics import mean_absolute_error, mean_squared_error
-import matplotlib.pyplot as plt
 import tensorflow as tf
+from typing import Optional, Tuple
 
-def evaluate_model(model: tf.keras.Model, X_test: np.ndarray, y_test: np.ndarray, scaler: object) -> dict:
+# Default batch size for streaming predictions over the test set
+DEFAULT_EVAL_BATCH_SIZE = 1024
+# Plots with more points than this are downsampled with LTTB
+DEFAULT_MAX_PLOT_POINTS = 2000
+
+def lttb_downsample(x: np.ndarray, y: np.ndarray, n_out: int) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Evaluate model performance, inverse scale predictions and actuals, calculate metrics, and create a comparison plot.
+    Downsample a line with Largest-Triangle-Three-Buckets, preserving its visual shape.
+
+    Args:
+        x: Monotonic x coordinates of shape (n,)
+        y: Values of shape (n,)
+        n_out: Number of points to keep (at least 3)
+
+    Returns:
+        Tuple of (x, y) arrays with n_out points, including the first and last point
+
+    Raises:
+        ValueError: If x and y lengths differ or n_out < 3
+    """
+    n = len(x)
+    if len(y) != n:
+        raise ValueError(f"x and y must have the same length, got {n} and {len(y)}")
+    if n_out >= n:
+        return x, y
+    if n_out < 3:
+        raise ValueError("n_out must be at least 3")
+
+    # Interior points are split into n_out - 2 buckets; one point is kept per bucket
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point) is the third triangle vertex
+        next_start, next_stop = stop, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_stop].mean()
+        avg_y = y[next_start:next_stop].mean()
+        area = np.abs(
+            (x[prev] - avg_x) * (y[start:stop] - y[prev])
+            - (x[prev] - x[start:stop]) * (avg_y - y[prev])
+        )
+        prev = start + int(np.argmax(area))
+        selected[i + 1] = prev
+    return x[selected], y[selected]
+
+def _inverse_scale(values: np.ndarray, scaler: object) -> np.ndarray:
+    """Inverse-transform a (batch, horizon) block with a scaler fitted on one feature."""
+    try:
+        return scaler.inverse_transform(values.reshape(-1, 1)).reshape(values.shape)
+    except Exception as e:
+        raise RuntimeError(f"Inverse transform failed: {str(e)}")
+
+def evaluate_model(model: tf.keras.Model, X_test: np.ndarray, y_test: np.ndarray, scaler: object,
+                   batch_size: int = DEFAULT_EVAL_BATCH_SIZE,
+                   plot: bool = True,
+                   max_plot_points: Optional[int] = DEFAULT_MAX_PLOT_POINTS) -> dict:
+    """
+    Evaluate model performance on the original scale, overall and per forecast step.
+
+    The test set is streamed through the model in batches. Each batch is inverse
+    scaled on its own and folded into running sums of absolute and squared errors,
+    so no full-size prediction or inverse-scaled copy is ever held in memory.
 
     Args:
         model: Trained Keras model for prediction.
-        X_test: Test input features as numpy array.
-        y_test: Test target values as numpy array.
-        scaler: Scaler object with inverse_transform method used during preprocessing.
+        X_test: Test input features of shape (n_samples, sequence_length, 1); may be
+            a strided view from create_sequences.
+        y_test: Test targets of shape (n_samples, forecast_horizon) or
+            (n_samples, forecast_horizon, 1).
+        scaler: Scaler fitted on the single value column, with an inverse_transform method.
+        batch_size: Number of test windows predicted per batch.
+        plot: Build an actual-vs-predicted figure of the one-step-ahead forecasts.
+        max_plot_points: Downsample the plotted lines to this many points with LTTB
+            (None plots every point).
 
     Returns:
         Dictionary containing:
             'mae': Mean Absolute Error
             'rmse': Root Mean Squared Error
-            'figure': Matplotlib figure object of the time-series comparison plot
+            'mae_per_horizon': MAE for each forecast step, shape (forecast_horizon,)
+            'rmse_per_horizon': RMSE for each forecast step, shape (forecast_horizon,)
+            'figure': Matplotlib figure of the comparison plot, or None if plot=False
 
     Raises:
         ValueError: If inputs are empty or incompatible.
         AttributeError: If scaler lacks inverse_transform method.
-        RuntimeError: If inverse transformation fails.
+        RuntimeError: If the model returns no predictions or inverse transformation fails.
     """
     # Validate inputs
     if X_test.size == 0 or y_test.size == 0:
         raise ValueError("X_test and y_test must not be empty.")
     if not hasattr(scaler, 'inverse_transform'):
         raise AttributeError("Scaler must have an inverse_transform method.")
-    
-    # Generate predictions
-    predictions = model.predict(X_test)
-    if predictions.size == 0:
-        raise RuntimeError("Model returned empty predictions.")
-    
-    # Check feature dimension compatibility
-    if predictions.shape[-1] != y_test.shape[-1]:
-        raise ValueError(
-            f"Last dimension mismatch: predictions ({predictions.shape[-1]}) vs y_test ({y_test.shape[-1]})"
-        )
-    
-    # Reshape to 2D for inverse transform
-    original_pred_shape = predictions.shape
-    original_y_shape = y_test.shape
-    predictions_2d = predictions.reshape(-1, original_pred_shape[-1])
-    y_test_2d = y_test.reshape(-1, original_y_shape[-1])
-    
-    # Apply inverse transform
-    try:
-        predictions_inv = scaler.inverse_transform(predictions_2d).reshape(original_pred_shape)
-        actuals_inv = scaler.inverse_transform(y_test_2d).reshape(original_y_shape)
-    except Exception as e:
-        raise RuntimeError(f"Inverse transform failed: {str(e)}")
-    
+    if len(X_test) != len(y_test):
+        raise ValueError(f"X_test and y_test have different sample counts: {len(X_test)} vs {len(y_test)}")
+    if batch_size <= 0:
+        raise ValueError("batch_size must be a positive integer")
+
+    n_samples = len(y_test)
+    targets = y_test.reshape(n_samples, -1)
+    horizon = targets.shape[1]
+
+    abs_sum = np.zeros(horizon, dtype=np.float64)
+    sq_sum = np.zeros(horizon, dtype=np.float64)
+    if plot:
+        plot_actuals = np.empty(n_samples, dtype=np.float64)
+        plot_preds = np.empty(n_samples, dtype=np.float64)
+
+    for start in range(0, n_samples, batch_size):
+        stop = min(start + batch_size, n_samples)
+        predictions = np.asarray(model.predict_on_batch(np.ascontiguousarray(X_test[start:stop])))
+        if predictions.size == 0:
+            raise RuntimeError("Model returned empty predictions.")
+        predictions = predictions.reshape(stop - start, -1)
+        # Check forecast dimension compatibility
+        if predictions.shape[1] != horizon:
+            raise ValueError(
+                f"Forecast horizon mismatch: predictions ({predictions.shape[1]}) vs y_test ({horizon})"
+            )
+
+        predictions_inv = _inverse_scale(predictions, scaler)
+        actuals_inv = _inverse_scale(targets[start:stop], scaler)
+        errors = predictions_inv - actuals_inv
+        abs_sum += np.abs(errors).sum(axis=0)
+        sq_sum += np.square(errors).sum(axis=0)
+
+        if plot:
+            plot_actuals[start:stop] = actuals_inv[:, 0]
+            plot_preds[start:stop] = predictions_inv[:, 0]
+
     # Calculate metrics
-    mae = mean_absolute_error(actuals_inv, predictions_inv)
-    rmse = np.sqrt(mean_squared_error(actuals_inv, predictions_inv))
-    
-    # Prepare data for plotting
-    plot_actuals = actuals_inv.reshape(-1, actuals_inv.shape[-1])
-    plot_preds = predictions_inv.reshape(-1, predictions_inv.shape[-1])
-    
-    # If multiple features, use first feature for plotting
-    if plot_actuals.shape[1] > 1:
-        plot_actuals = plot_actuals[:, 0]
-        plot_preds = plot_preds[:, 0]
-    else:
-        plot_actuals = plot_actuals.squeeze()
-        plot_preds = plot_preds.squeeze()
-    
-    # Create plot
-    fig, ax = plt.subplots(figsize=(12, 6))
-    ax.plot(plot_actuals, label='Actual', alpha=0.7)
-    ax.plot(plot_preds, label='Predicted', alpha=0.7, linestyle='--')
-    ax.set_title("Actual vs Predicted Values")
-    ax.set_xlabel("Time Step")
-    ax.set_ylabel("Value")
-    ax.legend()
-    plt.tight_layout()
-    
+    mae_per_horizon = abs_sum / n_samples
+    rmse_per_horizon = np.sqrt(sq_sum / n_samples)
+    mae = float(abs_sum.sum() / (n_samples * horizon))
+    rmse = float(np.sqrt(sq_sum.sum() / (n_samples * horizon)))
+
+    fig = None
+    if plot:
+        import matplotlib.pyplot as plt
+
+        steps = np.arange(n_samples)
+        actual_x, actual_y = steps, plot_actuals
+        pred_x, pred_y = steps, plot_preds
+        if max_plot_points is not None and n_samples > max_plot_points:
+            actual_x, actual_y = lttb_downsample(steps, plot_actuals, max_plot_points)
+            pred_x, pred_y = lttb_downsample(steps, plot_preds, max_plot_points)
+
+        # Create plot
+        fig, ax = plt.subplots(figsize=(12, 6))
+        ax.plot(actual_x, actual_y, label='Actual', alpha=0.7)
+        ax.plot(pred_x, pred_y, label='Predicted (t+1)', alpha=0.7, linestyle='--')
+        ax.set_title("Actual vs Predicted Values")
+        ax.set_xlabel("Time Step")
+        ax.set_ylabel("Value")
+        ax.legend()
+        plt.tight_layout()
+
     return {
         'mae': mae,
         'rmse': rmse,
+        'mae_per_horizon': mae_per_horizon,
+        'rmse_per_horizon': rmse_per_horizon,
         'figure': fig
-    }
\ No newline at end of file
+    }
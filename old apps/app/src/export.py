@@ -0,0 +1,131 @@
+import numpy as np
+import tensorflow as tf
+from typing import Any, Tuple
+
+from src.lite_forecaster import ARTIFACT_VERSION
+
+# Largest GRU layer exported to the pure-NumPy artifact by export_model(format='auto')
+MAX_NUMPY_UNITS = 256
+
+def _scaler_params(scaler: Any) -> Tuple[float, float]:
+    """Return (center, scale) of a single-feature RobustScaler or StandardScaler."""
+    center = getattr(scaler, 'center_', getattr(scaler, 'mean_', None))
+    scale = getattr(scaler, 'scale_', None)
+    if not hasattr(scaler, 'inverse_transform'):
+        raise ValueError("scaler must be a fitted RobustScaler or StandardScaler")
+    center = 0.0 if center is None else np.ravel(center)
+    scale = 1.0 if scale is None else np.ravel(scale)
+    if np.size(center) > 1 or np.size(scale) > 1:
+        raise ValueError("scaler must be fitted on a single feature")
+    return float(np.squeeze(center)), float(np.squeeze(scale))
+
+def export_numpy_artifact(model: tf.keras.Model, scaler: Any, path: str) -> None:
+    """
+    Freeze a trained build_gru_model model and its scaler into a NumPy .npz artifact.
+
+    The artifact is loaded with LiteGRUForecaster.load, which needs only NumPy.
+
+    Args:
+        model: Trained Keras model made of GRU, Dropout and a final Dense layer
+        scaler: Fitted RobustScaler used to scale the training data
+        path: Output .npz path
+
+    Raises:
+        ValueError: If the model contains layers or settings the NumPy forward
+            pass doesn't implement, or the scaler is unsupported
+    """
+    center, scale = _scaler_params(scaler)
+    arrays = {
+        'format_version': np.array(ARTIFACT_VERSION),
+        'sequence_length': np.array(model.input_shape[1]),
+        'scaler_center': np.array(center),
+        'scaler_scale': np.array(scale),
+    }
+
+    gru_layers = []
+    dense = None
+    for layer in model.layers:
+        if isinstance(layer, tf.keras.layers.GRU):
+            config = layer.get_config()
+            if dense is not None or not config['reset_after'] or config['activation'] != 'tanh' \
+                    or config['recurrent_activation'] != 'sigmoid':
+                raise ValueError(f"Unsupported GRU configuration in layer {layer.name}")
+            gru_layers.append(layer)
+        elif isinstance(layer, tf.keras.layers.Dropout):
+            continue
+        elif isinstance(layer, tf.keras.layers.Dense) and dense is None:
+            dense = layer
+        else:
+            raise ValueError(f"Unsupported layer for NumPy export: {layer.name}")
+    if not gru_layers or dense is None:
+        raise ValueError("Model must contain GRU layers followed by a Dense output layer")
+
+    for i, layer in enumerate(gru_layers):
+        kernel, recurrent_kernel, bias = layer.get_weights()
+        arrays[f'gru_{i}_kernel'] = kernel.astype(np.float32)
+        arrays[f'gru_{i}_recurrent_kernel'] = recurrent_kernel.astype(np.float32)
+        arrays[f'gru_{i}_bias'] = bias.astype(np.float32)
+    arrays['num_gru_layers'] = np.array(len(gru_layers))
+    dense_kernel, dense_bias = dense.get_weights()
+    arrays['dense_kernel'] = dense_kernel.astype(np.float32)
+    arrays['dense_bias'] = dense_bias.astype(np.float32)
+    arrays['output_activation'] = np.array(dense.get_config()['activation'])
+
+    np.savez(path, **arrays)
+
+class _ScaledForecaster(tf.Module):
+    def __init__(self, model: tf.keras.Model, center: float, scale: float):
+        super().__init__()
+        self.model = model
+        self.center = tf.constant(center, dtype=tf.float32)
+        self.scale = tf.constant(scale, dtype=tf.float32)
+
+    def forecast(self, values: tf.Tensor) -> tf.Tensor:
+        scaled = (values - self.center) / self.scale
+        predictions = self.model(scaled[..., None], training=False)
+        return predictions * self.scale + self.center
+
+def export_saved_model(model: tf.keras.Model, scaler: Any, path: str) -> None:
+    """
+    Export the model with the scaler folded into a SavedModel serving signature.
+
+    The 'serving_default' signature takes raw values of shape (batch, sequence_length)
+    and returns forecasts in original units.
+
+    Args:
+        model: Trained Keras model
+        scaler: Fitted RobustScaler used to scale the training data
+        path: Output SavedModel directory
+    """
+    center, scale = _scaler_params(scaler)
+    module = _ScaledForecaster(model, center, scale)
+    signature = tf.function(
+        module.forecast,
+        input_signature=[tf.TensorSpec([None, model.input_shape[1]], tf.float32, name='values')]
+    )
+    tf.saved_model.save(module, path, signatures={'serving_default': signature})
+
+def export_model(model: tf.keras.Model, scaler: Any, path: str, format: str = 'auto') -> str:
+    """
+    Export a trained forecaster for serving.
+
+    Args:
+        model: Trained Keras model
+        scaler: Fitted RobustScaler used to scale the training data
+        path: Output path (.npz file for 'numpy', directory for 'saved_model')
+        format: 'numpy', 'saved_model', or 'auto' to pick the NumPy artifact when
+            every GRU layer has at most MAX_NUMPY_UNITS units
+
+    Returns:
+        str: The format that was written
+    """
+    if format == 'auto':
+        units = [layer.units for layer in model.layers if isinstance(layer, tf.keras.layers.GRU)]
+        format = 'numpy' if units and max(units) <= MAX_NUMPY_UNITS else 'saved_model'
+    if format == 'numpy':
+        export_numpy_artifact(model, scaler, path)
+    elif format == 'saved_model':
+        export_saved_model(model, scaler, path)
+    else:
+        raise ValueError(f"Unknown export format: {format}")
+    return format
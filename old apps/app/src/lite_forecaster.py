@@ -0,0 +1,126 @@
+import numpy as np
+from typing import Dict
+
+# Version of the .npz layout written by src.export.export_numpy_artifact
+ARTIFACT_VERSION = 1
+
+_ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0.0),
+    'sigmoid': lambda x: 1.0 / (1.0 + np.exp(-x)),
+    'tanh': np.tanh,
+}
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-x))
+
+def _gru_forward(inputs: np.ndarray, kernel: np.ndarray, recurrent_kernel: np.ndarray,
+                 bias: np.ndarray, return_sequences: bool) -> np.ndarray:
+    """
+    Run one Keras GRU layer (reset_after=True, tanh/sigmoid) over a batch.
+
+    Input projections for every timestep are computed in one matmul; only the
+    recurrent part is stepped in time.
+    """
+    batch, timesteps, _ = inputs.shape
+    units = recurrent_kernel.shape[0]
+    input_bias, recurrent_bias = bias[0], bias[1]
+    projected = inputs @ kernel + input_bias
+    h = np.zeros((batch, units), dtype=inputs.dtype)
+    outputs = np.empty((batch, timesteps, units), dtype=inputs.dtype) if return_sequences else None
+    for t in range(timesteps):
+        x_z, x_r, x_h = np.split(projected[:, t], 3, axis=-1)
+        h_z, h_r, h_h = np.split(h @ recurrent_kernel + recurrent_bias, 3, axis=-1)
+        z = _sigmoid(x_z + h_z)
+        r = _sigmoid(x_r + h_r)
+        candidate = np.tanh(x_h + r * h_h)
+        h = z * h + (1.0 - z) * candidate
+        if return_sequences:
+            outputs[:, t] = h
+    return outputs if return_sequences else h
+
+class LiteGRUForecaster:
+    """
+    TensorFlow-free forecaster loaded from an artifact written by export_numpy_artifact.
+
+    Reproduces the stacked GRU + Dense model from build_gru_model in pure NumPy, with
+    the fitted scaler folded in, so forecasting workers only import NumPy and start in
+    milliseconds. Intended for the small unit counts used here; larger models should be
+    served from the SavedModel export.
+
+    Args:
+        arrays: Mapping of artifact arrays (see load)
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        version = int(arrays['format_version'])
+        if version != ARTIFACT_VERSION:
+            raise ValueError(f"Unsupported artifact version {version} (expected {ARTIFACT_VERSION})")
+        self.sequence_length = int(arrays['sequence_length'])
+        self.center = float(arrays['scaler_center'])
+        self.scale = float(arrays['scaler_scale'])
+        activation = str(arrays['output_activation'])
+        if activation not in _ACTIVATIONS:
+            raise ValueError(f"Unsupported output activation: {activation}")
+        self._output_activation = _ACTIVATIONS[activation]
+        self._layers = [
+            (arrays[f'gru_{i}_kernel'], arrays[f'gru_{i}_recurrent_kernel'], arrays[f'gru_{i}_bias'])
+            for i in range(int(arrays['num_gru_layers']))
+        ]
+        self._dense_kernel = arrays['dense_kernel']
+        self._dense_bias = arrays['dense_bias']
+
+    @classmethod
+    def load(cls, path: str) -> 'LiteGRUForecaster':
+        """
+        Load an exported .npz artifact.
+
+        Args:
+            path: Path written by export_numpy_artifact
+
+        Returns:
+            LiteGRUForecaster ready for prediction
+        """
+        with np.load(path, allow_pickle=False) as data:
+            return cls({key: data[key] for key in data.files})
+
+    def predict_scaled(self, sequences: np.ndarray) -> np.ndarray:
+        """
+        Forecast from already scaled input windows.
+
+        Args:
+            sequences: Array of shape (batch, sequence_length, 1)
+
+        Returns:
+            Scaled forecasts of shape (batch, forecast_horizon)
+        """
+        outputs = np.asarray(sequences, dtype=np.float32)
+        last = len(self._layers) - 1
+        for i, (kernel, recurrent_kernel, bias) in enumerate(self._layers):
+            outputs = _gru_forward(outputs, kernel, recurrent_kernel, bias, return_sequences=i < last)
+        return self._output_activation(outputs @ self._dense_kernel + self._dense_bias)
+
+    def predict(self, values: np.ndarray) -> np.ndarray:
+        """
+        Forecast in original units from raw (unscaled) history.
+
+        Args:
+            values: Raw history of shape (timesteps,) or (batch, timesteps); only the
+                last sequence_length values of each row are used
+
+        Returns:
+            Forecasts of shape (forecast_horizon,) or (batch, forecast_horizon)
+
+        Raises:
+            ValueError: If fewer than sequence_length values are given
+        """
+        values = np.asarray(values, dtype=np.float32)
+        single = values.ndim == 1
+        if single:
+            values = values[None]
+        if values.shape[1] < self.sequence_length:
+            raise ValueError(f"Need at least {self.sequence_length} values, got {values.shape[1]}")
+        window = values[:, -self.sequence_length:]
+        scaled = (window - self.center) / self.scale
+        forecast = self.predict_scaled(scaled[..., None]) * self.scale + self.center
+        return forecast[0] if single else forecast
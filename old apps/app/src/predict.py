@@ -3,6 +3,19 @@ import numpy as np
 import pandas as pd
 from typing import Any
 
+def fit_to_length(scaled_data: np.ndarray, sequence_length: int) -> np.ndarray:
+    """
+    Pad or truncate a (timesteps, 1) array to exactly sequence_length rows.
+    
+    Keeps the most recent rows when too long and left-pads with zeros when too short.
+    """
+    if len(scaled_data) >= sequence_length:
+        # Take the most recent sequence
+        return scaled_data[len(scaled_data) - sequence_length:]
+    # Pad beginning with zeros
+    padding = np.zeros((sequence_length - len(scaled_data), 1))
+    return np.concatenate([padding, scaled_data])
+
 def predict(new_data: pd.Series, 
             anomaly_detector: Any, 
             scaler: Any, 
@@ -39,13 +52,7 @@ def predict(new_data: pd.Series,
     scaled_data = scaler.transform(cleaned_values)
     
     # Step 3: Pad/truncate to sequence_length
-    if len(scaled_data) > sequence_length:
-        # Take the most recent sequence
-        input_sequence = scaled_data[-sequence_length:]
-    else:
-        # Pad beginning with zeros
-        padding = np.zeros((sequence_length - len(scaled_data), 1))
-        input_sequence = np.concatenate([padding, scaled_data])
+    input_sequence = fit_to_length(scaled_data, sequence_length)
     
     # Step 4: Create model input (add batch dimension)
     model_input = input_sequence.reshape(1, sequence_length, 1)
@@ -55,9 +55,11 @@ def preprocess_data(data: pd.Series, config: dict) -> Tuple[pd.Series, Any]:
     return scaled_series, scaler
 
 import numpy as np
-from typing import Tuple
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Iterator, Optional, Tuple
 
-def create_sequences(data: np.ndarray, sequence_length: int, forecast_horizon: int) -> Tuple[np.ndarray, np.ndarray]:
+def create_sequences(data: np.ndarray, sequence_length: int, forecast_horizon: int,
+                     dtype: Optional[np.dtype] = None, copy: bool = True) -> Tuple[np.ndarray, np.ndarray]:
     """
     Generate input-output sequences using sliding window approach.
     
@@ -65,10 +67,17 @@ def create_sequences(data: np.ndarray, sequence_length: int, forecast_horizon: i
     output sequences of fixed length (forecast_horizon) by sliding a window over the input data.
     The temporal order of the data is preserved in the generated sequences.
     
+    With copy=False X and y are read-only strided views over data, so no window is copied
+    and memory stays O(timesteps) rather than O(num_sequences * sequence_length). Index them
+    (e.g. X[batch_indices]) to materialize only the windows a batch needs.
+    
     Parameters:
         data (np.ndarray): Input time series data as a 2D numpy array (timesteps, features)
         sequence_length (int): Number of timesteps in each input sequence
         forecast_horizon (int): Number of future timesteps to predict (output sequence length)
+        dtype (np.dtype, optional): Convert data to this dtype (e.g. np.float32) once before windowing
+        copy (bool): Return writable, materialized arrays; False returns read-only views
+            (default=True)
         
     Returns:
         Tuple[np.ndarray, np.ndarray]: 
@@ -88,18 +97,47 @@ def create_sequences(data: np.ndarray, sequence_length: int, forecast_horizon: i
     if sequence_length <= 0 or forecast_horizon <= 0:
         raise ValueError("Sequence length and forecast horizon must be positive integers")
     
+    if dtype is not None:
+        data = data.astype(dtype, copy=False)
+    
     num_samples = len(data) - sequence_length - forecast_horizon + 1
-    X = np.zeros((num_samples, sequence_length, data.shape[1]))
-    y = np.zeros((num_samples, forecast_horizon, data.shape[1]))
-    
-    for i in range(num_samples):
-        start_idx = i
-        end_idx = i + sequence_length
-        X[i] = data[start_idx:end_idx]
-        y[i] = data[end_idx:end_idx + forecast_horizon]
-        
+    # sliding_window_view puts the window axis last: (windows, features, length)
+    X = sliding_window_view(data, sequence_length, axis=0)[:num_samples].transpose(0, 2, 1)
+    y = sliding_window_view(data[sequence_length:], forecast_horizon, axis=0)[:num_samples].transpose(0, 2, 1)
+    
+    if copy:
+        return np.ascontiguousarray(X), np.ascontiguousarray(y)
     return X, y
 
+def iter_sequence_batches(data: np.ndarray, sequence_length: int, forecast_horizon: int,
+                          batch_size: int, shuffle: bool = False, seed: Optional[int] = None,
+                          dtype: Optional[np.dtype] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Lazily yield (X, y) batches of sliding windows, materializing one batch at a time.
+    
+    Parameters:
+        data (np.ndarray): Input time series data as a 2D numpy array (timesteps, features)
+        sequence_length (int): Number of timesteps in each input sequence
+        forecast_horizon (int): Number of future timesteps to predict
+        batch_size (int): Number of sequences per batch
+        shuffle (bool): Visit windows in random order (default=False keeps temporal order)
+        seed (int, optional): Seed for the shuffle
+        dtype (np.dtype, optional): Convert data to this dtype once before windowing
+        
+    Yields:
+        Tuple[np.ndarray, np.ndarray]: Contiguous batches of shape
+            (batch, sequence_length, features) and (batch, forecast_horizon, features)
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size must be a positive integer")
+    X, y = create_sequences(data, sequence_length, forecast_horizon, dtype=dtype, copy=False)
+    order = np.arange(len(X))
+    if shuffle:
+        np.random.default_rng(seed).shuffle(order)
+    for start in range(0, len(order), batch_size):
+        batch = order[start:start + batch_size]
+        yield X[batch], y[batch]
+
 import numpy as np
 from typing import Dict, Tuple
 
@@ -167,4 +205,47 @@ def temporal_split(X: np.ndarray, y: np.ndarray, split_ratios: Tuple[float, floa
         'y_train': y_train,
         'y_val': y_val,
         'y_test': y_test
-    }
\ No newline at end of file
+    }
+
+
+def temporal_split_series(data: np.ndarray, sequence_length: int, forecast_horizon: int,
+                          split_ratios: Tuple[float, float, float]) -> Dict[str, np.ndarray]:
+    """
+    Split a series into overlapping train/validation/test segments for on-the-fly windowing.
+    
+    Windowing each returned segment yields exactly the windows temporal_split would
+    assign to that set from create_sequences(data, ...): each segment after the first
+    starts sequence_length + forecast_horizon - 1 steps early so its first window is complete.
+    Segments are views of data.
+    
+    Args:
+        data: Time series array of shape (timesteps, ...) in temporal order.
+        sequence_length: Number of timesteps in each input sequence
+        forecast_horizon: Number of future timesteps to predict
+        split_ratios: Tuple of three floats (train_ratio, val_ratio, test_ratio) that sum to 1.0.
+    
+    Returns:
+        Dictionary containing 'train', 'val' and 'test' series segments
+    
+    Raises:
+        ValueError: If split_ratios is invalid or data is shorter than one window
+    """
+    if len(split_ratios) != 3:
+        raise ValueError("split_ratios must contain exactly three elements")
+    if not np.isclose(sum(split_ratios), 1.0, atol=1e-7):
+        raise ValueError(f"split_ratios must sum to 1.0, got {sum(split_ratios)}")
+    
+    window_length = sequence_length + forecast_horizon
+    n_windows = len(data) - window_length + 1
+    if n_windows <= 0:
+        raise ValueError(f"Insufficient data length. Requires at least {window_length} timesteps, got {len(data)}")
+    
+    train_size = int(split_ratios[0] * n_windows)
+    val_size = int(split_ratios[1] * n_windows)
+    
+    # Window i covers data[i:i + window_length]
+    return {
+        'train': data[:train_size + window_length - 1],
+        'val': data[train_size:train_size + val_size + window_length - 1],
+        'test': data[train_size + val_size:]
+    }
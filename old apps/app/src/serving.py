@@ -0,0 +1,156 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+
+from src.predict import fit_to_length
+
+class BatchingForecaster:
+    """
+    Micro-batching forecast server wrapping a trained model.
+    
+    Concurrent callers submit one series each; a worker thread coalesces queued
+    requests into a single batched forward pass. A batch is dispatched as soon as
+    it holds max_batch_size requests or max_wait_ms has passed since its first
+    request arrived, so per-request latency stays bounded as QPS grows.
+    
+    Per request the steps match predict(): anomaly removal, scaling, pad/truncate,
+    forecast and inverse scaling. Each request is validated and cleaned on its
+    own, so a malformed series fails only its own future. Scaling and inverse
+    scaling run once per batch on the concatenated values, and the model is
+    called directly through a traced function instead of Keras' per-call
+    predict() loop; an error there fails the whole batch.
+    
+    Args:
+        model: Trained TensorFlow Keras forecasting model
+        scaler: Scaler object with transform/inverse_transform methods
+        sequence_length: Required input sequence length for the model
+        anomaly_detector: Optional object with a remove_anomalies method
+        max_batch_size: Largest number of requests per forward pass
+        max_wait_ms: Longest time the first request of a batch waits for company
+    """
+    
+    def __init__(self, model: tf.keras.Model, scaler: Any, sequence_length: int,
+                 anomaly_detector: Optional[Any] = None, max_batch_size: int = 64,
+                 max_wait_ms: float = 5.0):
+        self.scaler = scaler
+        self.sequence_length = sequence_length
+        self.anomaly_detector = anomaly_detector
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._forward = tf.function(
+            lambda x: model(x, training=False),
+            input_signature=[tf.TensorSpec([None, sequence_length, 1], tf.float32)]
+        )
+        self._requests: "queue.Queue[Optional[Tuple[pd.Series, Future]]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._serve, name="forecast-batcher", daemon=True)
+        self._thread.start()
+    
+    def submit(self, new_data: pd.Series) -> Future:
+        """
+        Queue a forecast request.
+        
+        Args:
+            new_data: Input time series data as pandas Series
+        
+        Returns:
+            Future: Resolves to the forecasted values as a 1D numpy array
+        """
+        future: Future = Future()
+        self._requests.put((new_data, future))
+        return future
+    
+    def forecast(self, new_data: pd.Series, timeout: Optional[float] = None) -> np.ndarray:
+        """Submit a request and block until its forecast is ready."""
+        return self.submit(new_data).result(timeout)
+    
+    def _collect(self) -> Optional[List[Tuple[pd.Series, Future]]]:
+        """Block for the first request, then gather more until the batch is full or the wait expires."""
+        first = self._requests.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                # Leave the shutdown marker for the next collection
+                self._requests.put(None)
+                break
+            batch.append(item)
+        return batch
+    
+    def _prepare(self, new_data: pd.Series) -> np.ndarray:
+        """
+        Validate one request and remove its anomalies.
+        
+        Returns:
+            np.ndarray: Cleaned values of shape (timesteps, 1)
+        
+        Raises:
+            ValueError: If the series is empty or not finite after cleaning
+        """
+        if self.anomaly_detector is not None:
+            new_data = self.anomaly_detector.remove_anomalies(new_data)
+        values = np.asarray(new_data, dtype=np.float64)
+        if values.ndim != 1 or len(values) == 0:
+            raise ValueError("Input must be a non-empty 1D series")
+        if not np.isfinite(values).all():
+            raise ValueError("Input contains NaN or infinite values")
+        return values.reshape(-1, 1)
+    
+    def _run_batch(self, values: List[np.ndarray]) -> List[np.ndarray]:
+        """Run the shared scaling, one forward pass and inverse scaling for prepared requests."""
+        # Scale every request with a single transform call
+        scaled = self.scaler.transform(np.concatenate(values))
+        splits = np.cumsum([len(v) for v in values])[:-1]
+        inputs = np.stack([
+            fit_to_length(part, self.sequence_length) for part in np.split(scaled, splits)
+        ]).astype(np.float32)
+        
+        predictions = self._forward(tf.constant(inputs)).numpy()
+        horizon = predictions.reshape(len(values), -1).shape[1]
+        restored = self.scaler.inverse_transform(predictions.reshape(-1, 1))
+        return list(restored.reshape(len(values), horizon))
+    
+    def _serve(self) -> None:
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            # A malformed request fails only its own future
+            values, futures = [], []
+            for data, future in batch:
+                try:
+                    values.append(self._prepare(data))
+                except Exception as exc:
+                    future.set_exception(exc)
+                    continue
+                futures.append(future)
+            if not futures:
+                continue
+            try:
+                results = self._run_batch(values)
+            except Exception as exc:
+                # Scaler or model errors affect the whole batch
+                for future in futures:
+                    future.set_exception(exc)
+                continue
+            for future, result in zip(futures, results):
+                future.set_result(result)
+    
+    def close(self) -> None:
+        """Stop the worker after the queued requests have been served."""
+        self._requests.put(None)
+        self._thread.join()
@@ -0,0 +1,98 @@
+import hashlib
+import json
+import os
+import shutil
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import joblib
+import pandas as pd
+
+def file_fingerprint(path: str) -> Dict[str, Any]:
+    """
+    Identify a source file by absolute path, modification time and size.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        Dict[str, Any]: Fingerprint suitable for StageCache.key
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+    """
+    stat = os.stat(path)
+    return {'path': os.path.abspath(path), 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+class StageCache:
+    """
+    On-disk cache of intermediate pipeline stage results.
+
+    Each stage's key hashes its own configuration section together with the key
+    of the stage it consumes, so changing one section invalidates that stage and
+    everything downstream while upstream results are reused. Each entry is a
+    directory written atomically; an interrupted write is never read back.
+
+    Args:
+        cache_dir: Root directory for cached stage artifacts
+        enabled: When False every stage is recomputed and nothing is written
+    """
+
+    def __init__(self, cache_dir: str, enabled: bool = True):
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        """Hash JSON-serializable key parts (config sections, upstream keys, fingerprints)."""
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+    def run(self, stage: str, key: str, compute: Callable[[], Any],
+            save: Callable[[Any, str], None], load: Callable[[str], Any]) -> Tuple[Any, bool]:
+        """
+        Return a stage's result from the cache, computing and storing it on a miss.
+
+        Args:
+            stage: Stage name, used in the entry's directory name
+            key: Stage key from StageCache.key
+            compute: Zero-argument callable producing the stage result
+            save: Writes a result into the given (empty) directory
+            load: Reads a result back from the given directory
+
+        Returns:
+            Tuple of (result, hit) where hit is True if the cache was used
+        """
+        entry = os.path.join(self.cache_dir, f"{stage}-{key}")
+        if self.enabled and os.path.isdir(entry):
+            return load(entry), True
+
+        result = compute()
+        if self.enabled:
+            tmp_entry = entry + ".tmp"
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+            os.makedirs(tmp_entry)
+            save(result, tmp_entry)
+            if os.path.isdir(entry):
+                shutil.rmtree(tmp_entry)
+            else:
+                os.replace(tmp_entry, entry)
+        return result, False
+
+def save_series(series: pd.Series, directory: str, name: str = 'series') -> None:
+    """Write a Series (with its index) to Parquet."""
+    series.to_frame(name=series.name or 'value').to_parquet(os.path.join(directory, f"{name}.parquet"))
+
+def load_series(directory: str, name: str = 'series') -> pd.Series:
+    """Read a Series written by save_series."""
+    frame = pd.read_parquet(os.path.join(directory, f"{name}.parquet"))
+    return frame.iloc[:, 0]
+
+def save_series_and_scaler(result: Tuple[pd.Series, Optional[Any]], directory: str) -> None:
+    """Write a (scaled series, fitted scaler) pair."""
+    series, scaler = result
+    save_series(series, directory)
+    joblib.dump(scaler, os.path.join(directory, 'scaler.joblib'))
+
+def load_series_and_scaler(directory: str) -> Tuple[pd.Series, Optional[Any]]:
+    """Read a pair written by save_series_and_scaler."""
+    return load_series(directory), joblib.load(os.path.join(directory, 'scaler.joblib'))
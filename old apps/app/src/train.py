@@ -1,22 +1,94 @@
+import numpy as np
 import tensorflow as tf
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, Optional, Union
+
+def make_window_dataset(series: np.ndarray,
+                        sequence_length: int,
+                        forecast_horizon: int,
+                        batch_size: int,
+                        shuffle: bool = False,
+                        seed: Optional[int] = None,
+                        cache: bool = False) -> tf.data.Dataset:
+    """
+    Build a batched dataset of (input window, target window) pairs from a 1-D series.
+    
+    Windows are never materialized up front: the pipeline shuffles and batches
+    window start indices, then gathers each batch's windows from the series in a
+    parallel, deterministic map. Memory stays at the size of the raw series and
+    window assembly overlaps with training through prefetch(AUTOTUNE).
+    
+    Args:
+        series: Scaled time series of shape (timesteps,) or (timesteps, 1)
+        sequence_length: Number of input timesteps per window
+        forecast_horizon: Number of target timesteps per window
+        batch_size: Number of windows per batch
+        shuffle: Reshuffle window order every epoch (whole-series shuffle of indices)
+        seed: Seed for the shuffle
+        cache: Cache the assembled batches after the first pass (only allowed
+            without shuffle; trades memory for CPU on repeated epochs)
+    
+    Returns:
+        tf.data.Dataset yielding X of shape (batch, sequence_length, 1) and
+        y of shape (batch, forecast_horizon)
+    
+    Raises:
+        ValueError: If the series is too short or cache is combined with shuffle
+    """
+    values = np.asarray(series, dtype=np.float32).reshape(-1)
+    window_length = sequence_length + forecast_horizon
+    num_windows = len(values) - window_length + 1
+    if num_windows <= 0:
+        raise ValueError(f"Series too short: need at least {window_length} timesteps, got {len(values)}")
+    if cache and shuffle:
+        raise ValueError("cache=True would freeze the first epoch's shuffle order")
+    
+    values = tf.constant(values)
+    offsets = tf.range(window_length, dtype=tf.int64)
+    
+    def gather_windows(starts: tf.Tensor) -> Tuple[tf.Tensor, tf.Tensor]:
+        windows = tf.gather(values, starts[:, None] + offsets[None, :])
+        return windows[:, :sequence_length, None], windows[:, sequence_length:]
+    
+    dataset = tf.data.Dataset.range(num_windows)
+    if shuffle:
+        # Shuffling int64 indices is cheap, so the buffer can cover every window
+        dataset = dataset.shuffle(num_windows, seed=seed, reshuffle_each_iteration=True)
+    dataset = dataset.batch(batch_size)
+    dataset = dataset.map(gather_windows, num_parallel_calls=tf.data.AUTOTUNE, deterministic=True)
+    if cache:
+        dataset = dataset.cache()
+    
+    options = tf.data.Options()
+    options.deterministic = True
+    return dataset.with_options(options).prefetch(tf.data.AUTOTUNE)
 
 def train_model(model: tf.keras.Model, 
-                train_data: Tuple[tf.Tensor, tf.Tensor], 
-                val_data: Tuple[tf.Tensor, tf.Tensor], 
-                config: Dict[str, Any]) -> tf.keras.callbacks.History:
+                train_data: Union[np.ndarray, Tuple[tf.Tensor, tf.Tensor]], 
+                val_data: Union[np.ndarray, Tuple[tf.Tensor, tf.Tensor]], 
+                config: Dict[str, Any],
+                sequence_length: Optional[int] = None,
+                forecast_horizon: Optional[int] = None) -> tf.keras.callbacks.History:
     """
     Compiles and trains a GRU model using TensorFlow Dataset pipeline.
     
+    When sequence_length and forecast_horizon are given, train_data and val_data
+    are 1-D scaled series and windows are built on the fly by make_window_dataset.
+    Otherwise they are (features, labels) pairs of already windowed arrays.
+    
     Args:
         model: Compiled or uncompiled Keras model
-        train_data: Tuple of (train_features, train_labels) as tensors
-        val_data: Tuple of (val_features, val_labels) as tensors
+        train_data: Training series, or tuple of (train_features, train_labels)
+        val_data: Validation series, or tuple of (val_features, val_labels)
         config: Configuration dictionary containing:
             - 'batch_size': Batch size for training
             - 'epochs': Number of training epochs
             - 'patience': EarlyStopping patience
             - 'model_save_path': Path to save best model weights
+            - 'seed' (optional): Seed for the per-epoch shuffle
+            - 'cache_validation' (optional): Cache validation batches after the
+              first epoch (default=False)
+        sequence_length: Input window length when training from series
+        forecast_horizon: Target window length when training from series
     
     Returns:
         Training history object
@@ -29,23 +101,37 @@ def train_model(model: tf.keras.Model,
     if not required_keys.issubset(config.keys()):
         raise ValueError(f"Config missing required keys: {required_keys - set(config.keys())}")
     
-    # Unpack and validate data
-    X_train, y_train = train_data
-    X_val, y_val = val_data
+    if (sequence_length is None) != (forecast_horizon is None):
+        raise ValueError("sequence_length and forecast_horizon must be given together")
     
-    if X_train.shape[0] == 0 or X_val.shape[0] == 0:
-        raise ValueError("Training or validation data is empty")
-    
-    # Create TensorFlow Datasets
-    train_dataset = tf.data.Dataset.from_tensor_slices((X_train, y_train))
-    val_dataset = tf.data.Dataset.from_tensor_slices((X_val, y_val))
-    
-    # Shuffle and batch datasets
-    train_dataset = train_dataset.shuffle(buffer_size=1024).batch(config['batch_size'])
-    val_dataset = val_dataset.batch(config['batch_size'])
+    if sequence_length is not None:
+        # Window the raw series on the fly
+        train_dataset = make_window_dataset(
+            train_data, sequence_length, forecast_horizon, config['batch_size'],
+            shuffle=True, seed=config.get('seed')
+        )
+        val_dataset = make_window_dataset(
+            val_data, sequence_length, forecast_horizon, config['batch_size'],
+            cache=config.get('cache_validation', False)
+        )
+    else:
+        # Unpack and validate data
+        X_train, y_train = train_data
+        X_val, y_val = val_data
+        
+        if X_train.shape[0] == 0 or X_val.shape[0] == 0:
+            raise ValueError("Training or validation data is empty")
+        
+        # Create TensorFlow Datasets
+        train_dataset = tf.data.Dataset.from_tensor_slices((X_train, y_train))
+        val_dataset = tf.data.Dataset.from_tensor_slices((X_val, y_val))
+        
+        # Shuffle, batch and prefetch datasets
+        train_dataset = train_dataset.shuffle(buffer_size=1024).batch(config['batch_size']).prefetch(tf.data.AUTOTUNE)
+        val_dataset = val_dataset.batch(config['batch_size']).prefetch(tf.data.AUTOTUNE)
     
     # Compile model (if not already compiled)
-    if not model.optimizer:
+    if not getattr(model, 'optimizer', None):
         model.compile(
             optimizer=tf.keras.optimizers.Adam(),
             loss=tf.keras.losses.Huber(),
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+from src.anomaly_detection import StreamingAnomalyDetector
+
+def test_streaming_detector_nan_batch():
+    """
+    Test that NaN gaps in a micro-batch never reach the sliding window:
+    1. A batch with gaps but no anomalies comes back fully interpolated
+    2. Window statistics stay finite after the next refit
+    3. A later spike is still flagged
+    """
+    rng = np.random.default_rng(0)
+    detector = StreamingAnomalyDetector(window=200, refit_every=10)
+    detector.fit(pd.Series(rng.normal(10.0, 1.0, 200)))
+
+    batch = pd.Series(rng.normal(10.0, 1.0, 12))
+    batch.iloc[[0, 5, 6, 11]] = np.nan
+    cleaned = detector.update(batch)
+    assert not cleaned.isna().any()
+    assert np.isfinite(detector._median) and np.isfinite(detector._scale)
+
+    assert detector.score(np.array([1000.0, np.nan])).tolist() == [True, False]
+    spike = detector.update(pd.Series([10.0, 1000.0, 10.0]))
+    assert abs(spike.iloc[1] - 10.0) < 1.0
+
+def test_streaming_detector_chunk_boundary():
+    """
+    Test that a run of anomalies at the start of a micro-batch is interpolated
+    between the previous batch's last value and the first clean point
+    """
+    rng = np.random.default_rng(0)
+    detector = StreamingAnomalyDetector(window=200, refit_every=1000)
+    detector.fit(pd.Series(rng.normal(10.0, 1.0, 200)))
+
+    detector.update(pd.Series([10.0, 9.0]))
+    index = pd.date_range('2024-01-01', periods=4, freq='min')
+    cleaned = detector.update(pd.Series([1000.0, np.nan, -1000.0, 11.0], index=index))
+    assert cleaned.index.equals(index)
+    np.testing.assert_allclose(cleaned.to_numpy(), [9.5, 10.0, 10.5, 11.0])
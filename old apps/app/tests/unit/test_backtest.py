@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.backtest import make_folds, run_backtest
+
+SEQUENCE_LENGTH = 8
+FORECAST_HORIZON = 2
+MIN_TRAIN_SIZE = SEQUENCE_LENGTH + 2 * FORECAST_HORIZON
+
+def test_make_folds_rejects_training_range_without_validation_window():
+    """
+    Test that make_folds only accepts training ranges that can be split
+    into a training window and a validation window.
+    """
+    config = {'initial_train_size': MIN_TRAIN_SIZE - 1, 'test_size': FORECAST_HORIZON}
+    with pytest.raises(ValueError):
+        make_folds(100, SEQUENCE_LENGTH, FORECAST_HORIZON, config)
+    with pytest.raises(ValueError):
+        make_folds(100, SEQUENCE_LENGTH, FORECAST_HORIZON,
+                   {'initial_train_size': MIN_TRAIN_SIZE, 'test_size': 4, 'val_size': 1})
+
+def test_run_backtest_minimum_config():
+    """
+    Run a rolling backtest with the smallest accepted training range,
+    val_size and test_size: every fold must train, validate and be scored.
+    """
+    pytest.importorskip("tensorflow")
+    from sklearn.preprocessing import MinMaxScaler
+
+    values = np.sin(np.arange(40) / 4.0)
+    scaler = MinMaxScaler().fit(values.reshape(-1, 1))
+    series = pd.Series(scaler.transform(values.reshape(-1, 1)).reshape(-1))
+    config = {
+        'sequence': {'sequence_length': SEQUENCE_LENGTH, 'forecast_horizon': FORECAST_HORIZON},
+        'model': {'gru_units': [4, 4, 4], 'dropout_rate': 0.0, 'output_units': FORECAST_HORIZON,
+                  'output_activation': 'linear'},
+        'training': {'batch_size': 4, 'epochs': 1, 'patience': 1, 'model_save_path': ''},
+        'backtest': {'initial_train_size': MIN_TRAIN_SIZE, 'test_size': FORECAST_HORIZON,
+                     'val_size': FORECAST_HORIZON, 'window': 'rolling', 'max_folds': 3},
+    }
+    table = run_backtest(series, scaler, config)
+    assert len(table) == 3
+    assert table['mae'].notna().all()
@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def test_main_parallel_backtest(tmp_path):
+    """
+    Run main.py end to end with backtest.n_workers=2.
+    Spawned fold workers re-import main.py as __mp_main__, so this catches
+    module-level code in main.py that only works in the parent process.
+    """
+    pytest.importorskip("tensorflow")
+    timestamps = pd.date_range("2024-01-01", periods=600, freq="h")
+    values = 10 + np.sin(np.arange(600) / 24 * 2 * np.pi)
+    pd.DataFrame({"ts": timestamps, "kwh": values}).to_csv(tmp_path / "data.csv", index=False)
+    config = {
+        "logging": {"level": "INFO"},
+        "cache": {"dir": str(tmp_path / "cache")},
+        "data": {"path": str(tmp_path / "data.csv"), "datetime_col": "ts", "value_col": "kwh"},
+        "preprocessing": {},
+        "anomaly_detection": {"contamination": 0.01, "random_state": 0},
+        "sequence": {"sequence_length": 24, "forecast_horizon": 4},
+        "split": {"split_ratios": [0.7, 0.15, 0.15]},
+        "model": {"gru_units": [8, 8, 8], "dropout_rate": 0.0, "output_units": 4,
+                  "output_activation": "linear"},
+        "training": {"batch_size": 32, "epochs": 1, "patience": 1,
+                     "model_save_path": str(tmp_path / "model.weights.h5")},
+        "backtest": {"initial_train_size": 300, "test_size": 60, "max_folds": 2, "n_workers": 2,
+                     "results_path": str(tmp_path / "backtest.csv")},
+    }
+    (tmp_path / "config.yaml").write_text(yaml.safe_dump(config))
+
+    env = dict(os.environ, PYTHONPATH=APP_DIR)
+    result = subprocess.run([sys.executable, os.path.join(APP_DIR, "main.py")], cwd=tmp_path,
+                            env=env, capture_output=True, text=True, timeout=600)
+    assert result.returncode == 0, result.stderr[-2000:]
+    assert len(pd.read_csv(tmp_path / "backtest.csv")) == 2
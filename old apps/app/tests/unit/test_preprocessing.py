@@ -0,0 +1,19 @@
+import numpy as np
+from src.preprocessing import create_sequences
+
+def test_create_sequences_copy():
+    """
+    Test that create_sequences returns writable copies by default and
+    read-only views over the input with copy=False
+    """
+    data = np.arange(10, dtype=np.float32).reshape(-1, 1)
+    X, y = create_sequences(data, 3, 2)
+    assert X.shape == (6, 3, 1) and y.shape == (6, 2, 1)
+    assert X[1, :, 0].tolist() == [1.0, 2.0, 3.0] and y[1, :, 0].tolist() == [4.0, 5.0]
+    X[0, 0, 0] = -1.0
+    assert data[0, 0] == 0.0
+
+    X_view, y_view = create_sequences(data, 3, 2, copy=False)
+    assert np.shares_memory(X_view, data) and not X_view.flags.writeable
+    np.testing.assert_array_equal(X_view[1:], X[1:])
+    np.testing.assert_array_equal(y_view, y)
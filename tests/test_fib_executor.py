@@ -0,0 +1,75 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from fib_executor import ComputeExecutor, ExecutorOverloadedError
+
+
+def _record_call(path, value, delay):
+    """Append one line to path, then return value after delay seconds."""
+    with open(path, "a") as f:
+        f.write(f"{os.getpid()}\n")
+    time.sleep(delay)
+    return value
+
+
+def _calls(path):
+    with open(path) as f:
+        return f.read().split()
+
+
+def test_identical_keys_share_one_computation(tmp_path):
+    path = tmp_path / "calls"
+    path.touch()
+    executor = ComputeExecutor(threshold=1, max_workers=2)
+
+    async def main():
+        runs = [executor.run("key", 10, _record_call, str(path), "value", 0.3) for _ in range(5)]
+        return await asyncio.gather(*runs)
+
+    try:
+        assert asyncio.run(main()) == ["value"] * 5
+    finally:
+        executor.shutdown()
+    calls = _calls(path)
+    assert len(calls) == 1
+    assert calls[0] != str(os.getpid())
+    assert executor.pending == 0
+
+
+def test_full_queue_rejects_new_keys(tmp_path):
+    path = tmp_path / "calls"
+    path.touch()
+    executor = ComputeExecutor(threshold=1, max_pending=1, max_workers=1)
+
+    async def main():
+        first = asyncio.ensure_future(executor.run("a", 10, _record_call, str(path), "a", 0.3))
+        await asyncio.sleep(0)
+        assert executor.pending == 1
+        with pytest.raises(ExecutorOverloadedError):
+            await executor.run("b", 10, _record_call, str(path), "b", 0.0)
+        # The key already in flight is still served
+        shared = await executor.run("a", 10, _record_call, str(path), "a", 0.0)
+        return await first, shared
+
+    try:
+        assert asyncio.run(main()) == ("a", "a")
+    finally:
+        executor.shutdown()
+    assert len(_calls(path)) == 1
+
+
+def test_small_requests_run_inline(tmp_path):
+    path = tmp_path / "calls"
+    path.touch()
+    executor = ComputeExecutor(threshold=100, max_pending=0)
+
+    async def main():
+        return await executor.run("key", 99, _record_call, str(path), "value", 0.0)
+
+    assert asyncio.run(main()) == "value"
+    assert _calls(path) == [str(os.getpid())]
+    assert executor.pending == 0
+    executor.shutdown()
@@ -0,0 +1,135 @@
+import threading
+import time
+
+import pytest
+
+from hedging import HedgePolicy
+
+
+def _policy(**kwargs):
+    """A policy that hedges after 20 ms once it has one latency sample."""
+    options = dict(min_samples=1, min_delay=0.0, budget=1.0)
+    options.update(kwargs)
+    policy = HedgePolicy(**options)
+    policy.record_latency("model", 0.02)
+    return policy
+
+
+def test_hedge_wins_and_loser_is_cancelled():
+    policy = _policy()
+    primary_cancelled = threading.Event()
+
+    def attempt(index, cancel):
+        if index == 0:
+            if cancel.wait(2.0):
+                primary_cancelled.set()
+            return "primary"
+        return "hedge"
+
+    assert policy.run("model", attempt) == "hedge"
+    assert primary_cancelled.wait(1.0)
+
+
+def test_cancel_callbacks_run_for_the_loser():
+    policy = _policy()
+    aborted = threading.Event()
+
+    def attempt(index, cancel):
+        if index == 0:
+            cancel.add_callback(aborted.set)
+            aborted.wait(2.0)
+            return ""
+        return "hedge"
+
+    started = time.monotonic()
+    assert policy.run("model", attempt) == "hedge"
+    assert aborted.wait(1.0)
+    assert time.monotonic() - started < 1.0
+
+
+def test_no_hedge_below_min_samples():
+    policy = HedgePolicy(min_samples=5, min_delay=0.0, budget=1.0)
+    for _ in range(4):
+        policy.record_latency("model", 0.001)
+    calls = []
+
+    def attempt(index, cancel):
+        calls.append(index)
+        time.sleep(0.05)
+        return index
+
+    assert policy.run("model", attempt) == 0
+    assert calls == [0]
+
+
+def test_failed_primary_does_not_mask_hedge():
+    policy = _policy()
+
+    def attempt(index, cancel):
+        if index == 0:
+            time.sleep(0.05)
+            raise RuntimeError("primary failed")
+        time.sleep(0.1)
+        return "hedge"
+
+    assert policy.run("model", attempt) == "hedge"
+
+
+def test_failed_hedge_does_not_mask_primary():
+    policy = _policy()
+
+    def attempt(index, cancel):
+        if index == 1:
+            raise RuntimeError("hedge failed")
+        time.sleep(0.1)
+        return "primary"
+
+    assert policy.run("model", attempt) == "primary"
+
+
+def test_all_attempts_failing_raises():
+    policy = _policy()
+
+    def attempt(index, cancel):
+        time.sleep(0.05)
+        raise RuntimeError(f"attempt {index} failed")
+
+    with pytest.raises(RuntimeError):
+        policy.run("model", attempt)
+
+
+def test_cancelled_loser_records_lower_bound():
+    policy = _policy()
+
+    def attempt(index, cancel):
+        if index == 0:
+            cancel.wait(2.0)
+            return ""
+        time.sleep(0.05)
+        return "hedge"
+
+    policy.run("model", attempt)
+    # The seed sample, the winner and the censored primary (>= delay + hedge time)
+    samples = sorted(policy._latencies["model"])
+    assert len(samples) == 3
+    assert samples[-1] >= 0.07
+
+
+def test_saturated_pool_runs_unhedged_in_caller():
+    policy = _policy(max_workers=1)
+    release = threading.Event()
+    blocker = threading.Thread(target=policy.run, args=("model", lambda i, c: release.wait(2.0)))
+    blocker.start()
+    time.sleep(0.1)
+    threads = []
+
+    def attempt(index, cancel):
+        threads.append((index, threading.current_thread()))
+        return "inline"
+
+    try:
+        assert policy.run("model", attempt) == "inline"
+        assert threads == [(0, threading.current_thread())]
+    finally:
+        release.set()
+        blocker.join()